@@ -0,0 +1,87 @@
+"""
+Cost of instrumentation per public call: a Transport whose session returns a canned response, called through
+http_exception_handler with no instrumentation active, with the no-op Instrumentation base class and with Metrics.
+
+No network is involved; this measures only the CPU overhead added to the request path.
+
+    $ python benchmarks/bench_instrumentation.py --requests 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import timedelta
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from independentreserve import (
+    Instrumentation,
+    Metrics,
+    Transport,
+    set_instrumentation,
+)
+from independentreserve.exceptions import http_exception_handler
+
+URL = "https://api.independentreserve.com/Public/GetMarketSummary"
+BODY = json.dumps(
+    {
+        "DayHighestPrice": 16100.0,
+        "DayLowestPrice": 15700.0,
+        "LastPrice": 15969.0,
+        "PrimaryCurrencyCode": "Xbt",
+        "SecondaryCurrencyCode": "Aud",
+        "CreatedTimestampUtc": "2019-10-14T05:36:03.1134867Z",
+    }
+).encode("utf-8")
+
+
+class CannedSession(object):
+    def request(self, method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = BODY
+        response.elapsed = timedelta(microseconds=150)
+        return response
+
+    def close(self):
+        pass
+
+
+def _bench(call, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        call()
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100000)
+    args = parser.parse_args()
+
+    transport = Transport(session=CannedSession(), retry_policy=None)
+
+    @http_exception_handler
+    def get_market_summary():
+        return transport.get(URL)
+
+    print("{0:<16} {1:>12} {2:>12}".format("instrumentation", "calls/s", "us/call"))
+    for name, instrumentation in (
+        ("none", None),
+        ("no-op hooks", Instrumentation()),
+        ("Metrics", Metrics()),
+    ):
+        set_instrumentation(instrumentation)
+        rate = _bench(get_market_summary, args.requests)
+        print("{0:<16} {1:>12.0f} {2:>12.2f}".format(name, rate, 1e6 / rate))
+    set_instrumentation(None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Memory and parse time of an order book as decoded JSON dicts against OrderBookSnapshot, and of a page of orders as
+dicts against OrderSummary models.
+
+No network is involved; responses are synthesised and decoded with json.loads as the clients do.
+
+    $ python benchmarks/bench_models.py --levels 5000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from independentreserve import OrderBookSnapshot, PageOf, OrderSummary
+
+
+def order_book(levels):
+    def side(order_type, start, step):
+        return [
+            {
+                "OrderType": order_type,
+                "Price": round(start + step * i, 2),
+                "Volume": round(random.uniform(0.001, 5), 8),
+            }
+            for i in range(levels)
+        ]
+
+    return json.dumps(
+        {
+            "BuyOrders": side("LimitBid", 9000.0, -0.01),
+            "SellOrders": side("LimitOffer", 9000.01, 0.01),
+            "CreatedTimestampUtc": "2019-10-14T04:08:07.4430000Z",
+            "PrimaryCurrencyCode": "Xbt",
+            "SecondaryCurrencyCode": "Aud",
+        }
+    )
+
+
+def orders_page(size):
+    return json.dumps(
+        {
+            "PageSize": size,
+            "TotalItems": size,
+            "TotalPages": 1,
+            "Data": [
+                {
+                    "AvgPrice": 9000.12,
+                    "CreatedTimestampUtc": "2019-10-14T04:08:07.4430000Z",
+                    "FeePercent": 0.005,
+                    "OrderGuid": "719c495c-a39e-4884-93ac-280b372450%02d" % (i % 100),
+                    "OrderType": "LimitBid",
+                    "Outstanding": 0.0,
+                    "Price": 9000.12,
+                    "PrimaryCurrencyCode": "Xbt",
+                    "SecondaryCurrencyCode": "Aud",
+                    "Status": "Filled",
+                    "Value": 3222.04,
+                    "Volume": 0.358,
+                }
+                for i in range(size)
+            ],
+        }
+    )
+
+
+def _measure(parse, text, repeat):
+    tracemalloc.start()
+    kept = parse(text)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(text)
+    return size, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--levels", type=int, default=5000)
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    book = order_book(args.levels)
+    page = orders_page(args.orders)
+    convert_page = PageOf(OrderSummary)
+    cases = (
+        ("book dicts", json.loads, book),
+        (
+            "book model",
+            lambda text: OrderBookSnapshot.from_json(json.loads(text)),
+            book,
+        ),
+        ("orders dicts", json.loads, page),
+        ("orders model", lambda text: convert_page(json.loads(text)), page),
+    )
+
+    print("{0:<14} {1:>12} {2:>10}".format("", "bytes", "ms/parse"))
+    for name, parse, text in cases:
+        size, seconds = _measure(parse, text, args.repeat)
+        print("{0:<14} {1:>12} {2:>10.3f}".format(name, size, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Compares unpooled requests.get against the pooled keep-alive Transport.
+
+Runs a local stand-in for the public API so the numbers measure client overhead (connection setup, pooling)
+rather than internet latency.
+
+    $ python benchmarks/bench_pooling.py --requests 2000 --threads 8
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from independentreserve import PublicMethods, Transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = json.dumps(["Xbt", "Eth", "Bch"]).encode("utf-8")
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _run(call, total, threads):
+    latencies = []
+
+    def timed(_):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(timed, range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "req/s": total / elapsed,
+        "p50 ms": statistics.median(latencies) * 1000,
+        "p99 ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def _report(name, result):
+    print(
+        "{0:<10} {1:>10.0f} req/s   p50 {2:>7.3f} ms   p99 {3:>7.3f} ms".format(
+            name, result["req/s"], result["p50 ms"], result["p99 ms"]
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    server = _serve()
+    url = "http://127.0.0.1:{0}".format(server.server_address[1])
+
+    unpooled = _run(
+        lambda: requests.get(url + "/Public/GetValidPrimaryCurrencyCodes").json(),
+        args.requests,
+        args.threads,
+    )
+    _report("unpooled", unpooled)
+
+    with Transport(pool_maxsize=args.threads) as transport:
+        PublicMethods(api_url=url, transport=transport)
+        pooled = _run(
+            PublicMethods.get_valid_primary_currency_codes,
+            args.requests,
+            args.threads,
+        )
+    _report("pooled", pooled)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
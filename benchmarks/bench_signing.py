@@ -0,0 +1,90 @@
+"""
+Signed private requests/sec: the per-call HMAC and OrderedDict + json.dumps request building previously used by
+PrivateMethods against the pre-keyed Signer and single pass builder, for a cancel and a limit order placement.
+
+No network is involved; this measures only the CPU cost of turning a call into a signed JSON body.
+
+    $ python benchmarks/bench_signing.py --requests 200000
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from independentreserve import PrivateMethods
+
+URL = "https://api.independentreserve.com"
+KEY = "6f8a8e54-2c33-4c7d-9e5b-2f4b1c2d3e4f"
+SECRET = "0d5a1c7b3e2f4a6b8c9d0e1f2a3b4c5d"
+
+CANCEL = ("/Private/CancelOrder", [("orderGuid", "719c495c-a39e-4884-93ac-280b37245037")])
+PLACE = (
+    "/Private/PlaceLimitOrder",
+    [
+        ("primaryCurrencyCode", "Xbt"),
+        ("secondaryCurrencyCode", "Aud"),
+        ("orderType", "LimitBid"),
+        ("price", 12345.67),
+        ("volume", 0.358),
+    ],
+)
+
+
+def legacy_build(url, nonce, parameters):
+    message = [url, "apiKey=" + KEY, "nonce=" + str(nonce)]
+    message.extend(name + "=" + str(value) for name, value in parameters)
+    signature = (
+        hmac.new(
+            SECRET.encode("utf-8"),
+            msg=",".join(message).encode("utf-8"),
+            digestmod=hashlib.sha256,
+        )
+        .hexdigest()
+        .upper()
+    )
+    data = OrderedDict([("apiKey", KEY), ("nonce", nonce), ("signature", str(signature))])
+    data.update(parameters)
+    return json.dumps(data, sort_keys=False)
+
+
+def _bench(build, endpoint, requests):
+    path, parameters = endpoint
+    url = URL + path
+    nonce = 1571026087443000
+    start = time.perf_counter()
+    for i in range(requests):
+        build(url, nonce + i, parameters)
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200000)
+    args = parser.parse_args()
+
+    client = PrivateMethods(KEY, SECRET, URL)
+    assert client._build_request(URL + PLACE[0], 1, PLACE[1]) == legacy_build(
+        URL + PLACE[0], 1, PLACE[1]
+    )
+
+    print("{0:<18} {1:>12} {2:>12} {3:>8}".format("endpoint", "legacy/s", "signer/s", "speedup"))
+    for name, endpoint in (("CancelOrder", CANCEL), ("PlaceLimitOrder", PLACE)):
+        legacy = _bench(legacy_build, endpoint, args.requests)
+        current = _bench(client._build_request, endpoint, args.requests)
+        print(
+            "{0:<18} {1:>12.0f} {2:>12.0f} {3:>7.2f}x".format(
+                name, legacy, current, current / legacy
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Offline benchmark suite: throughput and latency of the client against the local exchange simulator.
+
+Scenarios:
+
+public       get_order_book over the pooled Transport, from several threads.
+private      get_open_orders, signed and sent one after another.
+orders       place_limit_order followed by cancel_order (2 signed requests per operation).
+signing      building and signing a PlaceLimitOrder body, without sending it.
+pagination   iter_transactions over the account history, prefetching the next page. An operation is a walk over
+             every page.
+ws-decode    parse_event over messages generated by the simulator's feed.
+ws-feed      messages received by a WebsocketSubscriber in event mode from the simulator's feed at full speed;
+             latency is from the Time stamped by the feed (millisecond resolution) to the message leaving the queue.
+
+The simulator runs in a child process by default, so that serving requests does not compete with the client for the
+GIL; --in-process runs it in threads of the benchmark process instead.
+
+Save the results of a run and compare a later run against them to spot regressions:
+
+    $ python benchmarks/bench_suite.py --save baseline.json
+    $ python benchmarks/bench_suite.py --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator import API_KEY, API_SECRET, Simulator, _FeedGenerator
+
+from independentreserve import (
+    PrivateMethods,
+    PublicMethods,
+    Transport,
+    WebsocketSubscriber,
+    parse_event,
+)
+
+"""
+Seconds ws-feed waits for a websocket message before failing, e.g. when the subscriber cannot connect.
+"""
+FEED_TIMEOUT = 10.0
+
+
+class SimulatorProcess(object):
+    """
+    benchmarks/simulator.py running in a child process, with the attributes of Simulator used by the scenarios.
+    """
+
+    def __init__(self, seed, history):
+        self.seed = seed
+        self.history = history
+        self.api_key = API_KEY
+        self.api_secret = API_SECRET
+        self.url = None
+        self.ws_url = None
+        self._process = None
+
+    def __enter__(self):
+        command = [
+            sys.executable,
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "simulator.py"),
+            "--seed={0}".format(self.seed),
+            "--history={0}".format(self.history),
+            "--rate=0",
+            "--port=0",
+            "--websocket-port=0",
+        ]
+        self._process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, universal_newlines=True
+        )
+        # the simulator prints its REST url, websocket url, API key and secret, one per line
+        self.url, self.ws_url, self.api_key, self.api_secret = [
+            self._process.stdout.readline().split()[-1] for _ in range(4)
+        ]
+        return self
+
+    def __exit__(self, *exc_info):
+        self._process.terminate()
+        self._process.wait()
+        self._process.stdout.close()
+
+
+def _result(operations, elapsed, latencies=None):
+    """
+    :param latencies: Optional list of seconds per operation.
+    :return: dict of ops, ops/s, p50 ms and p99 ms
+    """
+    result = {"ops": operations, "ops/s": operations / elapsed}
+    if latencies:
+        latencies = sorted(latencies)
+        # nearest rank
+        result["p50 ms"] = latencies[math.ceil(len(latencies) * 0.5) - 1] * 1000
+        result["p99 ms"] = latencies[math.ceil(len(latencies) * 0.99) - 1] * 1000
+    return result
+
+
+def _measure(call, operations, threads=1):
+    latencies = []
+    lock = threading.Lock()
+
+    def timed(_):
+        start = time.perf_counter()
+        call()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    if threads == 1:
+        for i in range(operations):
+            timed(i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(timed, range(operations)))
+    return _result(operations, time.perf_counter() - start, latencies)
+
+
+def bench_public(simulator, args):
+    with Transport(pool_maxsize=args.threads) as transport:
+        PublicMethods(api_url=simulator.url, transport=transport)
+        return _measure(PublicMethods.get_order_book, args.requests, args.threads)
+
+
+def bench_private(simulator, args):
+    api = PrivateMethods(simulator.api_key, simulator.api_secret, simulator.url)
+    return _measure(api.get_open_orders, args.requests)
+
+
+def bench_orders(simulator, args):
+    api = PrivateMethods(simulator.api_key, simulator.api_secret, simulator.url)
+
+    def place_and_cancel():
+        order = api.place_limit_order(price=100, volume=0.001)
+        api.cancel_order(order["OrderGuid"])
+
+    return _measure(place_and_cancel, args.requests // 2)
+
+
+def bench_signing(simulator, args):
+    api = PrivateMethods(simulator.api_key, simulator.api_secret, simulator.url)
+    url = simulator.url + "/Private/PlaceLimitOrder"
+    parameters = [
+        ("primaryCurrencyCode", "Xbt"),
+        ("secondaryCurrencyCode", "Aud"),
+        ("orderType", "LimitBid"),
+        ("price", 12345.67),
+        ("volume", 0.358),
+    ]
+    operations = args.requests * 50
+    start = time.perf_counter()
+    for nonce in range(operations):
+        api._build_request(url, nonce, parameters)
+    return _result(operations, time.perf_counter() - start)
+
+
+def bench_pagination(simulator, args):
+    api = PrivateMethods(simulator.api_key, simulator.api_secret, simulator.url)
+    account_guid = next(
+        account["AccountGuid"]
+        for account in api.get_accounts()
+        if account["CurrencyCode"] == "Aud"
+    )
+    walks = max(1, args.requests // 100)
+    return _measure(
+        lambda: list(api.iter_transactions(account_guid, transaction_types=None)),
+        walks,
+    )
+
+
+def bench_ws_decode(simulator, args):
+    generator = _FeedGenerator(simulator.seed)
+    channels = ("ticker-xbt-aud", "orderbook-xbt")
+    messages = [
+        generator.message(channels[i % len(channels)]) for i in range(args.messages)
+    ]
+    start = time.perf_counter()
+    for message in messages:
+        parse_event(message)
+    return _result(len(messages), time.perf_counter() - start)
+
+
+async def _get(queue):
+    # wait_for only when the queue is empty, so the timeout costs nothing while messages are flowing
+    if not queue.empty():
+        return queue.get_nowait()
+    try:
+        return await asyncio.wait_for(queue.get(), FEED_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise RuntimeError(
+            "no websocket message within {0} seconds".format(FEED_TIMEOUT)
+        )
+
+
+def bench_ws_feed(simulator, args):
+    async def receive():
+        queue = asyncio.Queue()
+        subscriber = WebsocketSubscriber(
+            queue,
+            ["ticker-xbt-aud", "orderbook-xbt"],
+            url=simulator.ws_url,
+            mode="event",
+        )
+        task = asyncio.ensure_future(subscriber.run())
+        latencies = []
+        try:
+            event = await _get(queue)
+            start = time.perf_counter()
+            for _ in range(args.messages):
+                event = await _get(queue)
+                latencies.append(max(0.0, time.time() - event.time / 1000.0))
+            elapsed = time.perf_counter() - start
+        finally:
+            await subscriber.stop()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return _result(args.messages, elapsed, latencies)
+
+    return asyncio.run(receive())
+
+
+SCENARIOS = [
+    ("public", bench_public),
+    ("private", bench_private),
+    ("orders", bench_orders),
+    ("signing", bench_signing),
+    ("pagination", bench_pagination),
+    ("ws-decode", bench_ws_decode),
+    ("ws-feed", bench_ws_feed),
+]
+
+
+def _report(name, result, baseline=None):
+    line = "{0:<14} {1:>9} {2:>12.0f}".format(name, result["ops"], result["ops/s"])
+    for column in ("p50 ms", "p99 ms"):
+        line += (
+            " {0:>9.3f}".format(result[column])
+            if column in result
+            else " {0:>9}".format("-")
+        )
+    if baseline is not None and name in baseline:
+        change = result["ops/s"] / baseline[name]["ops/s"] - 1
+        line += " {0:>+8.1%}".format(change)
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--history", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Run the simulator in threads of this process.",
+    )
+    parser.add_argument(
+        "--only", action="append", help="Scenario to run; may be repeated."
+    )
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--compare", help="JSON file of a previous run to compare throughput against."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Throughput drop, as a fraction, reported as a regression by --compare.",
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    results = {}
+    failures = []
+    if args.in_process:
+        simulator = Simulator(seed=args.seed, history=args.history, rate=None)
+    else:
+        simulator = SimulatorProcess(args.seed, args.history)
+    with simulator:
+        header = "{0:<14} {1:>9} {2:>12} {3:>9} {4:>9}".format(
+            "scenario", "ops", "ops/s", "p50 ms", "p99 ms"
+        )
+        print(header + (" {0:>8}".format("change") if baseline else ""))
+        for name, bench in SCENARIOS:
+            if args.only and name not in args.only:
+                continue
+            try:
+                results[name] = bench(simulator, args)
+            except Exception as error:
+                failures.append(name)
+                print("{0:<14} failed: {1}".format(name, error))
+                continue
+            _report(name, results[name], baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    regressions = []
+    if baseline is not None:
+        regressions = [
+            name
+            for name, result in results.items()
+            if name in baseline
+            and result["ops/s"] < baseline[name]["ops/s"] * (1 - args.tolerance)
+        ]
+        if regressions:
+            print("Regressions: {0}".format(", ".join(regressions)))
+    if failures:
+        print("Failed: {0}".format(", ".join(failures)))
+    if regressions or failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Messages/sec through the websocket message pipeline for each delivery mode.
+
+"consumer" columns include the work a consumer has to do to get a usable object out of the queue item: raw modes
+still need a json.loads per message, "event" mode does not.
+
+    $ python benchmarks/bench_ws_decode.py --messages 200000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from independentreserve import WebsocketSubscriber
+
+TRADE = json.dumps(
+    {
+        "Channel": "ticker-xbt-aud",
+        "Nonce": 1,
+        "Data": {
+            "TradeGuid": "f7be5a3c-3a4a-4a4c-9b2e-5c1c2a3b4d5e",
+            "Pair": "xbt-aud",
+            "TradeDate": "2019-10-14T04:08:07.4434812Z",
+            "Price": 12345.67,
+            "Volume": 0.1,
+            "BidGuid": "b1f5a4d2-63a5-4f6e-b1ce-0a0d5f8bb7f6",
+            "OfferGuid": "c1f5a4d2-63a5-4f6e-b1ce-0a0d5f8bb7f6",
+            "Side": "Buy",
+        },
+        "Time": 1571026087443,
+        "Event": "Trade",
+    }
+)
+
+
+def _bench(mode, track_gaps, messages, consumer_decodes):
+    subscriber = WebsocketSubscriber(asyncio.Queue(), mode=mode, track_gaps=track_gaps)
+    process = subscriber._process
+    start = time.perf_counter()
+    for _ in range(messages):
+        item = process(TRADE)
+        if consumer_decodes:
+            json.loads(item)
+    return messages / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200000)
+    args = parser.parse_args()
+
+    print("{0:<8} {1:<11} {2:>14} {3:>14}".format("mode", "track_gaps", "pipeline/s", "consumer/s"))
+    for mode in ("bytes", "text", "event"):
+        for track_gaps in (False, True):
+            pipeline = _bench(mode, track_gaps, args.messages, False)
+            consumer = _bench(mode, track_gaps, args.messages, mode != "event")
+            print(
+                "{0:<8} {1:<11} {2:>14.0f} {3:>14.0f}".format(
+                    mode, str(track_gaps), pipeline, consumer
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
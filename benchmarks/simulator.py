@@ -0,0 +1,1109 @@
+"""
+Deterministic local stand-in for the Independent Reserve API, so benchmarks need no network.
+
+Simulator serves on 127.0.0.1:
+
+- every /Public/* route called by PublicMethods, from order books, recent trades and hourly history generated from a
+  seed;
+- every /Private/* route called by PrivateMethods, checking the API key, the HMAC signature and, as the exchange does,
+  that nonces strictly increase (unless a nonce_window is given). Requests act on one account with balances, orders,
+  trades and transactions, seeded with `history` filled orders so that the paged endpoints have pages to walk. Limit
+  orders that cross the book fill at once at their limit price, market orders at the best price; the book itself
+  never moves;
+- a websocket feed emitting Trade events on ticker-* channels and NewOrder / OrderChanged / OrderCanceled events on
+  orderbook-* channels, at a configurable rate.
+
+The same seed always produces the same market, account history and sequence of feed events.
+
+    >>> with Simulator(seed=1, history=2000) as simulator:
+    ...     ir.PublicMethods(api_url=simulator.url)
+    ...     api = ir.PrivateMethods(simulator.api_key, simulator.api_secret, simulator.url)
+    ...     subscriber = ir.WebsocketSubscriber(queue, ["ticker-xbt-aud"], url=simulator.ws_url)
+
+Run it on its own to point other tools at it:
+
+    $ python benchmarks/simulator.py --port 8080 --websocket-port 8081
+"""
+
+import argparse
+import asyncio
+import bisect
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import websockets
+
+# run from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from independentreserve.authentication import Signer
+from independentreserve.models import parse_timestamp
+
+API_KEY = "6f8a8e54-2c33-4c7d-9e5b-2f4b1c2d3e4f"
+API_SECRET = "0d5a1c7b3e2f4a6b8c9d0e1f2a3b4c5d"
+
+PRIMARY_CURRENCY_CODES = ["Xbt", "Eth", "Bch", "Ltc", "Xrp"]
+SECONDARY_CURRENCY_CODES = ["Aud", "Usd", "Nzd", "Sgd"]
+LIMIT_ORDER_TYPES = ["LimitBid", "LimitOffer"]
+MARKET_ORDER_TYPES = ["MarketBid", "MarketOffer"]
+TRANSACTION_TYPES = ["Brokerage", "Deposit", "Trade", "Withdrawal"]
+MINIMUM_VOLUMES = {"Xbt": 0.0001, "Eth": 0.001, "Bch": 0.001, "Ltc": 0.01, "Xrp": 1.0}
+
+"""
+Price of each primary currency in Aud, and the value of one Aud in each secondary currency.
+"""
+PRICES = {"Xbt": 12000.0, "Eth": 270.0, "Bch": 330.0, "Ltc": 80.0, "Xrp": 0.4}
+FX_RATES = {"Aud": 1.0, "Usd": 0.68, "Nzd": 1.07, "Sgd": 0.93}
+
+FEE_PERCENT = 0.005
+OPEN_STATUSES = ("Open", "PartiallyFilled")
+FILLED_STATUSES = ("Filled", "PartiallyFilledAndCancelled", "PartiallyFilledAndExpired")
+
+"""
+Creation time of the first order of the seeded account history.
+"""
+HISTORY_START = datetime(2019, 10, 14)
+
+
+def timestamp(value):
+    """
+    :param value: naive UTC datetime
+    :return: str formatted as the exchange does, with 7 fractional digits
+    """
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f0Z")
+
+
+class SimulatorError(Exception):
+    """
+    Rejection of a request, returned as {"Message": ...} with status_code.
+    """
+
+    def __init__(self, message, status_code=400):
+        super(SimulatorError, self).__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _code(value, valid, name):
+    for code in valid:
+        if code.lower() == str(value).lower():
+            return code
+    raise SimulatorError("Invalid {0} '{1}'".format(name, value))
+
+
+def _number(value, name):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise SimulatorError("Invalid {0} '{1}'".format(name, value))
+
+
+def _page(items, page_index, page_size):
+    """
+    :param items: Every item, in the order they are paged.
+    :return: dict shaped as the exchange's paged responses
+    """
+    page_index = int(_number(page_index, "page index"))
+    page_size = min(int(_number(page_size, "page size")), 50)
+    if page_index < 1 or page_size < 1:
+        raise SimulatorError("Page index and page size must be greater or equal to 1")
+    start = (page_index - 1) * page_size
+    return {
+        "PageSize": page_size,
+        "TotalItems": len(items),
+        "TotalPages": (len(items) + page_size - 1) // page_size,
+        "Data": items[start : start + page_size],
+    }
+
+
+class Exchange(object):
+    """
+    State of the simulated market and account. Safe to use from the threads of the HTTP server.
+
+    :param seed: Seed of every generated value.
+    :param api_key: API key accepted by private routes.
+    :param api_secret: Secret private requests must be signed with.
+    :param depth: Orders on each side of each order book.
+    :param history: Filled orders, with their trades and transactions, created in the account before it is served.
+    :param nonce_window: Number of the highest nonces used so far that a new nonce may be lower than, as long as it
+                         was not used before. The default 0 only accepts nonces greater than every previous one, as
+                         the exchange does; a window accepts requests that were signed in order but arrive reordered
+                         because they were sent concurrently, which the exchange would reject.
+    """
+
+    def __init__(
+        self,
+        seed=0,
+        api_key=API_KEY,
+        api_secret=API_SECRET,
+        depth=50,
+        history=200,
+        nonce_window=0,
+    ):
+        self.seed = seed
+        self.api_key = api_key
+        self.depth = depth
+        self.requests = 0
+        self.rejected = 0
+
+        self._signer = Signer(api_secret)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.nonce_window = nonce_window
+        # highest nonces accepted, ascending
+        self._nonces = []
+
+        self.books = {}
+        self.recent_trades = {}
+        for primary in PRIMARY_CURRENCY_CODES:
+            for secondary in SECONDARY_CURRENCY_CODES:
+                self._generate_market(primary, secondary)
+
+        self.accounts = {}
+        for code in PRIMARY_CURRENCY_CODES + SECONDARY_CURRENCY_CODES:
+            balance = 1000000.0 if code in SECONDARY_CURRENCY_CODES else 1000.0
+            self.accounts[code] = {
+                "AccountGuid": self._guid(),
+                "AccountStatus": "Active",
+                "AvailableBalance": balance,
+                "CurrencyCode": code,
+                "TotalBalance": balance,
+            }
+        self.orders = {}
+        self.order_guids = []
+        self.trades = []
+        self.transactions = dict(
+            (account["AccountGuid"], []) for account in self.accounts.values()
+        )
+        # creation time of each transaction, in the same (chronological) order
+        self._transaction_times = dict((guid, []) for guid in self.transactions)
+
+        created = HISTORY_START
+        for _ in range(history):
+            created += timedelta(seconds=self._random.randint(1, 600))
+            self._generate_order(created)
+
+        self._public_routes = {
+            "/Public/GetValidPrimaryCurrencyCodes": lambda query: PRIMARY_CURRENCY_CODES,
+            "/Public/GetValidSecondaryCurrencyCodes": lambda query: SECONDARY_CURRENCY_CODES,
+            "/Public/GetValidLimitOrderTypes": lambda query: LIMIT_ORDER_TYPES,
+            "/Public/GetValidMarketOrderTypes": lambda query: MARKET_ORDER_TYPES,
+            "/Public/GetValidOrderTypes": lambda query: LIMIT_ORDER_TYPES
+            + MARKET_ORDER_TYPES,
+            "/Public/GetValidTransactionTypes": lambda query: TRANSACTION_TYPES,
+            "/Public/GetMarketSummary": self.market_summary,
+            "/Public/GetOrderBook": self.order_book,
+            "/Public/GetAllOrders": self.all_orders,
+            "/Public/GetTradeHistorySummary": self.trade_history_summary,
+            "/Public/GetRecentTrades": self.recent_trades_page,
+            "/Public/GetFxRates": self.fx_rates,
+            "/Public/GetOrderMinimumVolumes": lambda query: MINIMUM_VOLUMES,
+        }
+        self._private_routes = {
+            "/Private/PlaceLimitOrder": self.place_limit_order,
+            "/Private/PlaceMarketOrder": self.place_market_order,
+            "/Private/CancelOrder": self.cancel_order,
+            "/Private/GetOpenOrders": self.open_orders,
+            "/Private/GetClosedOrders": self.closed_orders,
+            "/Private/GetClosedFilledOrders": self.closed_filled_orders,
+            "/Private/GetOrderDetails": self.order_details,
+            "/Private/GetAccounts": self.get_accounts,
+            "/Private/GetTransactions": self.get_transactions,
+            "/Private/GetDigitalCurrencyDepositAddress": self.deposit_address,
+            "/Private/GetDigitalCurrencyDepositAddresses": self.deposit_addresses,
+            "/Private/SynchDigitalCurrencyDepositAddressWithBlockchain": self.synch_deposit_address,
+            "/Private/WithdrawDigitalCurrency": self.withdraw_digital_currency,
+            "/Private/RequestFiatWithdrawal": self.request_fiat_withdrawal,
+            "/Private/GetTrades": self.get_trades,
+            "/Private/GetBrokerageFees": self.brokerage_fees,
+        }
+
+    def _guid(self):
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def _generate_market(self, primary, secondary):
+        mid = PRICES[primary] * FX_RATES[secondary]
+        tick = mid / 10000.0
+        bids, offers = [], []
+        for level in range(self.depth):
+            for side, sign, order_type in (
+                (bids, -1, "LimitBid"),
+                (offers, 1, "LimitOffer"),
+            ):
+                side.append(
+                    {
+                        "Guid": self._guid(),
+                        "OrderType": order_type,
+                        "Price": round(mid + sign * tick * (level + 1), 2),
+                        "Volume": round(self._random.uniform(0.01, 5.0), 8),
+                    }
+                )
+        self.books[(primary, secondary)] = (bids, offers)
+
+        created = HISTORY_START
+        trades = []
+        for _ in range(50):
+            created += timedelta(seconds=self._random.randint(1, 60))
+            trades.append(
+                {
+                    "PrimaryCurrencyAmount": round(self._random.uniform(0.001, 2.0), 8),
+                    "SecondaryCurrencyTradePrice": round(
+                        mid + self._random.uniform(-5, 5) * tick, 2
+                    ),
+                    "TradeTimestampUtc": timestamp(created),
+                }
+            )
+        trades.reverse()
+        self.recent_trades[(primary, secondary)] = trades
+
+    def _generate_order(self, created):
+        bid = self._random.random() < 0.5
+        primary, secondary = "Xbt", "Aud"
+        bids, offers = self.books[(primary, secondary)]
+        best = offers[0]["Price"] if bid else bids[0]["Price"]
+        order = self._new_order(
+            primary,
+            secondary,
+            "LimitBid" if bid else "LimitOffer",
+            round(self._random.uniform(0.001, 0.5), 8),
+            best,
+            created,
+        )
+        self._fill(order, best, created)
+
+    def _new_order(self, primary, secondary, order_type, volume, price, created):
+        order = {
+            "OrderGuid": self._guid(),
+            "CreatedTimestampUtc": timestamp(created),
+            "Type": order_type,
+            "VolumeOrdered": volume,
+            "VolumeFilled": 0.0,
+            "Price": price if order_type in LIMIT_ORDER_TYPES else None,
+            "AvgPrice": None,
+            "ReservedAmount": 0.0,
+            "Status": "Open",
+            "PrimaryCurrencyCode": primary,
+            "SecondaryCurrencyCode": secondary,
+        }
+        self.orders[order["OrderGuid"]] = order
+        self.order_guids.append(order["OrderGuid"])
+        return order
+
+    def _adjust(self, code, available, total, created, transaction_type=None):
+        account = self.accounts[code]
+        account["AvailableBalance"] = round(account["AvailableBalance"] + available, 8)
+        account["TotalBalance"] = round(account["TotalBalance"] + total, 8)
+        if transaction_type is None:
+            return
+        self._transaction_times[account["AccountGuid"]].append(created)
+        self.transactions[account["AccountGuid"]].append(
+            {
+                "Balance": account["TotalBalance"],
+                "BitcoinTransactionId": None,
+                "BitcoinTransactionOutputIndex": None,
+                "Comment": None,
+                "CreatedTimestampUtc": timestamp(created),
+                "Credit": round(total, 8) if total > 0 else None,
+                "CurrencyCode": code,
+                "Debit": round(-total, 8) if total < 0 else None,
+                "EthereumTransactionId": None,
+                "SettleTimestampUtc": timestamp(created),
+                "Status": "Confirmed",
+                "TransactionType": transaction_type,
+            }
+        )
+
+    def _fill(self, order, price, created):
+        volume = order["VolumeOrdered"]
+        value = round(volume * price, 8)
+        primary, secondary = (
+            order["PrimaryCurrencyCode"],
+            order["SecondaryCurrencyCode"],
+        )
+        if order["Type"].endswith("Bid"):
+            self._adjust(secondary, -value, -value, created, "Trade")
+            self._adjust(primary, volume, volume, created, "Trade")
+        else:
+            self._adjust(primary, -volume, -volume, created, "Trade")
+            self._adjust(secondary, value, value, created, "Trade")
+        order["VolumeFilled"] = volume
+        order["AvgPrice"] = price
+        order["Status"] = "Filled"
+        self.trades.append(
+            {
+                "TradeGuid": self._guid(),
+                "TradeTimestampUtc": timestamp(created),
+                "OrderGuid": order["OrderGuid"],
+                "OrderType": order["Type"],
+                "OrderTimestampUtc": order["CreatedTimestampUtc"],
+                "VolumeTraded": volume,
+                "Price": price,
+                "PrimaryCurrencyCode": primary,
+                "SecondaryCurrencyCode": secondary,
+            }
+        )
+
+    def _pair(
+        self, query, primary="primaryCurrencyCode", secondary="secondaryCurrencyCode"
+    ):
+        return (
+            _code(
+                query.get(primary, "Xbt"),
+                PRIMARY_CURRENCY_CODES,
+                "primary currency code",
+            ),
+            _code(
+                query.get(secondary, "Aud"),
+                SECONDARY_CURRENCY_CODES,
+                "secondary currency code",
+            ),
+        )
+
+    # Public routes, called with the decoded query string.
+
+    def market_summary(self, query):
+        pair = self._pair(query)
+        bids, offers = self.books[pair]
+        trades = self.recent_trades[pair]
+        prices = [trade["SecondaryCurrencyTradePrice"] for trade in trades]
+        volume = sum(trade["PrimaryCurrencyAmount"] for trade in trades)
+        value = sum(
+            trade["PrimaryCurrencyAmount"] * trade["SecondaryCurrencyTradePrice"]
+            for trade in trades
+        )
+        return {
+            "CreatedTimestampUtc": timestamp(datetime.utcnow()),
+            "CurrentHighestBidPrice": bids[0]["Price"],
+            "CurrentLowestOfferPrice": offers[0]["Price"],
+            "DayAvgPrice": round(value / volume, 2),
+            "DayHighestPrice": max(prices),
+            "DayLowestPrice": min(prices),
+            "DayVolumeXbt": round(volume, 8),
+            "DayVolumeXbtInSecondaryCurrrency": round(value, 8),
+            "LastPrice": prices[0],
+            "PrimaryCurrencyCode": pair[0],
+            "SecondaryCurrencyCode": pair[1],
+        }
+
+    def order_book(self, query):
+        pair = self._pair(query)
+        bids, offers = self.books[pair]
+
+        def levels(side):
+            return [
+                {
+                    "OrderType": order["OrderType"],
+                    "Price": order["Price"],
+                    "Volume": order["Volume"],
+                }
+                for order in side
+            ]
+
+        return {
+            "BuyOrders": levels(bids),
+            "CreatedTimestampUtc": timestamp(datetime.utcnow()),
+            "PrimaryCurrencyCode": pair[0],
+            "SecondaryCurrencyCode": pair[1],
+            "SellOrders": levels(offers),
+        }
+
+    def all_orders(self, query):
+        pair = self._pair(query)
+        bids, offers = self.books[pair]
+
+        def orders(side):
+            return [
+                {
+                    "Guid": order["Guid"],
+                    "Price": order["Price"],
+                    "Volume": order["Volume"],
+                }
+                for order in side
+            ]
+
+        return {
+            "BuyOrders": orders(bids),
+            "CreatedTimestampUtc": timestamp(datetime.utcnow()),
+            "PrimaryCurrencyCode": pair[0],
+            "SecondaryCurrencyCode": pair[1],
+            "SellOrders": orders(offers),
+        }
+
+    def trade_history_summary(self, query):
+        pair = self._pair(query)
+        hours = int(
+            _number(query.get("numberOfHoursInThePastToRetrieve", 240), "hours")
+        )
+        hours = max(1, min(hours, 240))
+        now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        mid = PRICES[pair[0]] * FX_RATES[pair[1]]
+        items = []
+        for hour in range(hours, 0, -1):
+            start = now - timedelta(hours=hour)
+            # seeded by the hour itself, so overlapping requests agree on past hours
+            generator = random.Random(
+                "{0}-{1}-{2}-{3}".format(self.seed, pair[0], pair[1], start.isoformat())
+            )
+            prices = [mid * (1 + generator.uniform(-0.01, 0.01)) for _ in range(4)]
+            trades = generator.randint(0, 200)
+            volume = round(generator.uniform(0, 20), 8) if trades else 0.0
+            items.append(
+                {
+                    "AverageSecondaryCurrencyPrice": round(sum(prices) / 4, 2),
+                    "ClosingSecondaryCurrencyPrice": round(prices[3], 2),
+                    "StartTimestampUtc": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "EndTimestampUtc": (start + timedelta(hours=1)).strftime(
+                        "%Y-%m-%dT%H:%M:%SZ"
+                    ),
+                    "HighestSecondaryCurrencyPrice": round(max(prices), 2),
+                    "LowestSecondaryCurrencyPrice": round(min(prices), 2),
+                    "NumberOfTrades": trades,
+                    "OpeningSecondaryCurrencyPrice": round(prices[0], 2),
+                    "PrimaryCurrencyVolume": volume,
+                    "SecondaryCurrencyVolume": round(volume * sum(prices) / 4, 8),
+                }
+            )
+        items.reverse()
+        return {
+            "CreatedTimestampUtc": timestamp(datetime.utcnow()),
+            "HistorySummaryItems": items,
+            "NumberOfHoursInThePastToRetrieve": hours,
+            "PrimaryCurrencyCode": pair[0],
+            "SecondaryCurrencyCode": pair[1],
+        }
+
+    def recent_trades_page(self, query):
+        pair = self._pair(query)
+        number = int(
+            _number(query.get("numberOfRecentTradesToRetrieve", 50), "number of trades")
+        )
+        return {
+            "CreatedTimestampUtc": timestamp(datetime.utcnow()),
+            "PrimaryCurrencyCode": pair[0],
+            "SecondaryCurrencyCode": pair[1],
+            "Trades": self.recent_trades[pair][: max(1, min(number, 50))],
+        }
+
+    def fx_rates(self, query):
+        return [
+            {
+                "CurrencyCodeA": a,
+                "CurrencyCodeB": b,
+                "Rate": round(FX_RATES[b] / FX_RATES[a], 8),
+            }
+            for a in SECONDARY_CURRENCY_CODES
+            for b in SECONDARY_CURRENCY_CODES
+            if a != b
+        ]
+
+    # Private routes, called with the authenticated parameters.
+
+    def _place(self, parameters, order_type, valid_types, price):
+        primary, secondary = self._pair(parameters)
+        order_type = _code(order_type, valid_types, "order type")
+        volume = _number(parameters.get("volume"), "volume")
+        if volume < MINIMUM_VOLUMES[primary]:
+            raise SimulatorError(
+                "Volume {0} is below the minimum order volume {1}".format(
+                    volume, MINIMUM_VOLUMES[primary]
+                )
+            )
+        if price is not None and price <= 0:
+            raise SimulatorError("Price must be greater than 0")
+
+        bid = order_type.endswith("Bid")
+        bids, offers = self.books[(primary, secondary)]
+        best = offers[0]["Price"] if bid else bids[0]["Price"]
+        fill_price = best if price is None else price
+        crosses = price is None or (price >= best if bid else price <= best)
+        amount = round(volume * fill_price, 8) if bid else volume
+        spent = secondary if bid else primary
+        if amount > self.accounts[spent]["AvailableBalance"]:
+            raise SimulatorError("Insufficient funds")
+
+        created = datetime.utcnow()
+        order = self._new_order(primary, secondary, order_type, volume, price, created)
+        if crosses:
+            self._fill(order, fill_price, created)
+        else:
+            order["ReservedAmount"] = amount
+            self._adjust(spent, -amount, 0.0, created)
+        return dict(order)
+
+    def place_limit_order(self, parameters):
+        return self._place(
+            parameters,
+            parameters.get("orderType"),
+            LIMIT_ORDER_TYPES,
+            _number(parameters.get("price"), "price"),
+        )
+
+    def place_market_order(self, parameters):
+        return self._place(
+            parameters, parameters.get("orderType"), MARKET_ORDER_TYPES, None
+        )
+
+    def _order(self, parameters):
+        order = self.orders.get(parameters.get("orderGuid"))
+        if order is None:
+            raise SimulatorError("Order not found")
+        return order
+
+    def cancel_order(self, parameters):
+        order = self._order(parameters)
+        if order["Status"] not in OPEN_STATUSES:
+            raise SimulatorError("Order is not open")
+        spent = (
+            order["SecondaryCurrencyCode"]
+            if order["Type"].endswith("Bid")
+            else order["PrimaryCurrencyCode"]
+        )
+        self._adjust(spent, order["ReservedAmount"], 0.0, datetime.utcnow())
+        order["ReservedAmount"] = 0.0
+        order["Status"] = "Cancelled"
+        return dict(order)
+
+    def order_details(self, parameters):
+        return dict(self._order(parameters))
+
+    def _orders_page(self, parameters, statuses):
+        primary, secondary = self._pair(parameters)
+        summaries = []
+        for guid in reversed(self.order_guids):
+            order = self.orders[guid]
+            if (
+                order["Status"] not in statuses
+                or order["PrimaryCurrencyCode"] != primary
+                or order["SecondaryCurrencyCode"] != secondary
+            ):
+                continue
+            summaries.append(
+                {
+                    "AvgPrice": order["AvgPrice"],
+                    "CreatedTimestampUtc": order["CreatedTimestampUtc"],
+                    "FeePercent": FEE_PERCENT,
+                    "OrderGuid": guid,
+                    "OrderType": order["Type"],
+                    "Outstanding": round(
+                        order["VolumeOrdered"] - order["VolumeFilled"], 8
+                    ),
+                    "Price": order["Price"],
+                    "PrimaryCurrencyCode": primary,
+                    "SecondaryCurrencyCode": secondary,
+                    "Status": order["Status"],
+                    "Value": (
+                        round(order["VolumeFilled"] * order["AvgPrice"], 8)
+                        if order["AvgPrice"] is not None
+                        else None
+                    ),
+                    "Volume": order["VolumeOrdered"],
+                }
+            )
+        return _page(
+            summaries, parameters.get("pageIndex", 1), parameters.get("pageSize", 50)
+        )
+
+    def open_orders(self, parameters):
+        return self._orders_page(parameters, OPEN_STATUSES)
+
+    def closed_orders(self, parameters):
+        return self._orders_page(parameters, FILLED_STATUSES + ("Cancelled", "Expired"))
+
+    def closed_filled_orders(self, parameters):
+        return self._orders_page(parameters, FILLED_STATUSES)
+
+    def get_accounts(self, parameters):
+        return [dict(account) for account in self.accounts.values()]
+
+    def get_transactions(self, parameters):
+        transactions = self.transactions.get(parameters.get("accountGuid"))
+        if transactions is None:
+            raise SimulatorError("Invalid account guid")
+        times = self._transaction_times[parameters["accountGuid"]]
+        start = parameters.get("fromTimestampUtc") or None
+        end = parameters.get("toTimestampUtc") or None
+        first = (
+            0 if start is None else bisect.bisect_left(times, parse_timestamp(start))
+        )
+        last = (
+            len(times)
+            if end is None
+            else bisect.bisect_right(times, parse_timestamp(end))
+        )
+        types = parameters.get("txTypes") or None
+        selected = [
+            transaction
+            for transaction in reversed(transactions[first:last])
+            if types is None or transaction["TransactionType"] in types
+        ]
+        return _page(
+            selected, parameters.get("pageIndex", 1), parameters.get("pageSize", 50)
+        )
+
+    def _address(self, primary):
+        return {
+            "DepositAddress": "sim{0}{1:030x}".format(
+                primary.lower(), self.seed + PRIMARY_CURRENCY_CODES.index(primary)
+            ),
+            "LastCheckedTimestampUtc": timestamp(HISTORY_START),
+            "NextUpdateTimestampUtc": timestamp(HISTORY_START + timedelta(minutes=10)),
+        }
+
+    def deposit_address(self, parameters):
+        primary = _code(
+            parameters.get("primaryCurrencyCode", "Xbt"),
+            PRIMARY_CURRENCY_CODES,
+            "primary currency code",
+        )
+        return self._address(primary)
+
+    def deposit_addresses(self, parameters):
+        return _page(
+            [self.deposit_address(parameters)],
+            parameters.get("pageIndex", 1),
+            parameters.get("pageSize", 50),
+        )
+
+    def synch_deposit_address(self, parameters):
+        for primary in PRIMARY_CURRENCY_CODES:
+            address = self._address(primary)
+            if address["DepositAddress"] == parameters.get("depositAddress"):
+                return address
+        raise SimulatorError("Invalid deposit address")
+
+    def _withdraw(self, code, amount):
+        if amount <= 0 or amount > self.accounts[code]["AvailableBalance"]:
+            raise SimulatorError("Invalid withdrawal amount")
+        self._adjust(code, -amount, -amount, datetime.utcnow(), "Withdrawal")
+
+    def withdraw_digital_currency(self, parameters):
+        self._withdraw("Xbt", _number(parameters.get("amount"), "amount"))
+        return None
+
+    def request_fiat_withdrawal(self, parameters):
+        code = _code(
+            parameters.get("secondaryCurrencyCode"),
+            SECONDARY_CURRENCY_CODES,
+            "secondary currency code",
+        )
+        amount = _number(parameters.get("withdrawalAmount"), "withdrawal amount")
+        self._withdraw(code, amount)
+        return {
+            "FiatWithdrawalRequestGuid": self._guid(),
+            "AccountGuid": self.accounts[code]["AccountGuid"],
+            "Status": "Pending",
+            "CreatedTimestampUtc": timestamp(datetime.utcnow()),
+            "TotalWithdrawalAmount": amount,
+            "FeeAmount": 0.0,
+            "Currency": code,
+        }
+
+    def get_trades(self, parameters):
+        return _page(
+            self.trades[::-1],
+            parameters.get("pageIndex", 1),
+            parameters.get("pageSize", 50),
+        )
+
+    def brokerage_fees(self, parameters):
+        return [
+            {"CurrencyCode": code, "Fee": FEE_PERCENT}
+            for code in PRIMARY_CURRENCY_CODES
+        ]
+
+    # Request handling
+
+    def public(self, path, query):
+        """
+        :param path: Path of the request.
+        :param query: dict of query string parameter to its first value.
+        :return: (status code, decoded response body)
+        """
+        route = self._public_routes.get(path)
+        if route is None:
+            return 404, {"Message": "No route {0}".format(path)}
+        with self._lock:
+            self.requests += 1
+            try:
+                return 200, route(query)
+            except SimulatorError as error:
+                self.rejected += 1
+                return error.status_code, {"Message": error.message}
+
+    def _authenticate(self, url, body):
+        """
+        Checks the API key, signature and nonce of a private request.
+
+        :param url: Full url the request was sent to, which the client signed.
+        :return: dict of the request parameters other than apiKey, nonce and signature
+        """
+        try:
+            # numbers are kept as sent, so the signed message can be rebuilt exactly as the client formatted it
+            data = json.loads(body, parse_float=str)
+            api_key, nonce, signature = (
+                data.pop("apiKey"),
+                data.pop("nonce"),
+                data.pop("signature"),
+            )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise SimulatorError("Invalid request body")
+        if api_key != self.api_key:
+            raise SimulatorError("Invalid API key")
+        message = [url, ",apiKey=", api_key, ",nonce=", str(nonce)]
+        for name, value in data.items():
+            message.append(
+                ","
+                + name
+                + "="
+                + (",".join(value) if isinstance(value, list) else str(value))
+            )
+        if not hmac.compare_digest(str(signature), self._signer("".join(message))):
+            raise SimulatorError("Invalid signature")
+        nonces = self._nonces
+        if (
+            not isinstance(nonce, int)
+            or (len(nonces) > self.nonce_window and nonce <= nonces[0])
+            or nonce in nonces
+        ):
+            raise SimulatorError("Invalid nonce")
+        bisect.insort(nonces, nonce)
+        if len(nonces) > self.nonce_window + 1:
+            del nonces[0]
+        return data
+
+    def private(self, url, path, body):
+        """
+        :param url: Full url the request was sent to.
+        :param path: Path of the request.
+        :param body: Raw request body.
+        :return: (status code, decoded response body)
+        """
+        route = self._private_routes.get(path)
+        if route is None:
+            return 404, {"Message": "No route {0}".format(path)}
+        with self._lock:
+            self.requests += 1
+            try:
+                return 200, route(self._authenticate(url, body))
+            except SimulatorError as error:
+                self.rejected += 1
+                return error.status_code, {"Message": error.message}
+
+
+class _FeedGenerator(object):
+    """
+    Endless, seeded sequence of websocket messages for the channels of one connection.
+    """
+
+    def __init__(self, seed):
+        self._random = random.Random(seed)
+        self._nonces = {}
+        self._orders = {}
+
+    def _guid(self):
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def message(self, channel):
+        nonce = self._nonces[channel] = self._nonces.get(channel, 0) + 1
+        parts = channel.split("-")
+        if parts[0] == "ticker" and len(parts) == 3:
+            event, data = "Trade", self._trade(parts[1], parts[2])
+        elif parts[0] == "orderbook" and len(parts) == 2:
+            event, data = self._order_book(channel, parts[1])
+        else:
+            event, data = "Heartbeat", {}
+        return json.dumps(
+            {
+                "Channel": channel,
+                "Nonce": nonce,
+                "Data": data,
+                "Time": int(time.time() * 1000),
+                "Event": event,
+            }
+        )
+
+    def _price(self, primary, secondary):
+        primary = primary.capitalize()
+        secondary = secondary.capitalize()
+        mid = PRICES.get(primary, 1.0) * FX_RATES.get(secondary, 1.0)
+        return round(mid * (1 + self._random.uniform(-0.001, 0.001)), 2)
+
+    def _trade(self, primary, secondary):
+        return {
+            "TradeGuid": self._guid(),
+            "Pair": "{0}-{1}".format(primary, secondary),
+            "TradeDate": timestamp(datetime.utcnow()),
+            "Price": self._price(primary, secondary),
+            "Volume": round(self._random.uniform(0.001, 2.0), 8),
+            "BidGuid": self._guid(),
+            "OfferGuid": self._guid(),
+            "Side": self._random.choice(("Buy", "Sell")),
+        }
+
+    def _order_book(self, channel, primary):
+        orders = self._orders.setdefault(channel, [])
+        draw = self._random.random()
+        if not orders or draw < 0.5:
+            order = {
+                "OrderGuid": self._guid(),
+                "OrderType": self._random.choice(LIMIT_ORDER_TYPES),
+                "Price": dict(
+                    (code.lower(), self._price(primary, code))
+                    for code in SECONDARY_CURRENCY_CODES
+                ),
+                "Volume": round(self._random.uniform(0.01, 5.0), 8),
+            }
+            orders.append(order)
+            return "NewOrder", dict(order)
+        order = orders[self._random.randrange(len(orders))]
+        if draw < 0.8:
+            order["Volume"] = round(order["Volume"] * self._random.uniform(0.1, 0.9), 8)
+            return "OrderChanged", dict(order)
+        orders.remove(order)
+        return "OrderCanceled", {
+            "OrderGuid": order["OrderGuid"],
+            "OrderType": order["OrderType"],
+        }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _respond(self, status, result):
+        body = json.dumps(result).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        parts = urlsplit(self.path)
+        query = dict(
+            (name, values[0]) for name, values in parse_qs(parts.query).items()
+        )
+        self._respond(*self.server.exchange.public(parts.path, query))
+
+    def do_POST(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        path = urlsplit(self.path).path
+        url = "http://{0}{1}".format(self.headers.get("Host"), path)
+        self._respond(*self.server.exchange.private(url, path, body))
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # the default backlog of 5 drops connections opened at once by concurrent clients, which then retry after 1s
+    request_queue_size = 128
+
+
+class Simulator(object):
+    """
+    Local REST API and websocket feed over one Exchange.
+
+    :param seed: Seed of the market, the account history and the feed.
+    :param history: Filled orders in the account history.
+    :param depth: Orders on each side of each order book.
+    :param nonce_window: See Exchange.
+    :param latency: Seconds each REST request is held before it is answered, to stand in for the network.
+    :param rate: Websocket messages sent per second on each connection, None for as fast as possible.
+    :param limit: Messages sent on each websocket connection before it is closed, None for no limit.
+    :param port: REST port, 0 for any free port.
+    :param websocket_port: Websocket port, 0 for any free port.
+    """
+
+    def __init__(
+        self,
+        seed=0,
+        history=200,
+        depth=50,
+        nonce_window=0,
+        latency=0.0,
+        rate=1000,
+        limit=None,
+        host="127.0.0.1",
+        port=0,
+        websocket_port=0,
+        api_key=API_KEY,
+        api_secret=API_SECRET,
+    ):
+        self.exchange = Exchange(
+            seed, api_key, api_secret, depth, history, nonce_window
+        )
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.seed = seed
+        self.latency = latency
+        self.rate = rate
+        self.limit = limit
+        self.host = host
+        self.port = port
+        self.websocket_port = websocket_port
+        self.connections = 0
+
+        self._server = None
+        self._loop = None
+        self._threads = []
+
+    @property
+    def url(self):
+        return "http://{0}:{1}".format(self.host, self._server.server_address[1])
+
+    @property
+    def ws_url(self):
+        return "ws://{0}:{1}".format(self.host, self.websocket_port)
+
+    def start(self):
+        self._server = _Server((self.host, self.port), _RequestHandler)
+        self._server.exchange = self.exchange
+        self._server.latency = self.latency
+        ready = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._run_feed, args=(ready,), daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        for thread in self._threads:
+            thread.join()
+        self._server, self._loop, self._threads = None, None, []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run_feed(self, ready):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        server = loop.run_until_complete(
+            websockets.serve(self._serve_feed, self.host, self.websocket_port)
+        )
+        self.websocket_port = server.sockets[0].getsockname()[1]
+        self._loop = loop
+        ready.set()
+        loop.run_forever()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+
+    async def _serve_feed(self, websocket, path):
+        query = parse_qs(urlsplit(path).query)
+        channels = [
+            channel
+            for value in query.get("subscribe", ())
+            for channel in value.split(",")
+            if channel
+        ]
+        generator = _FeedGenerator("{0}-{1}".format(self.seed, self.connections))
+        self.connections += 1
+        reader = asyncio.ensure_future(self._read_subscriptions(websocket, channels))
+
+        # messages are sent in batches every 10ms, or continuously when the rate is unlimited
+        batch = 1000 if self.rate is None else max(1, int(self.rate / 100.0))
+        interval = 0.0 if self.rate is None else batch / float(self.rate)
+        loop = asyncio.get_event_loop()
+        due = loop.time()
+        sent = 0
+        try:
+            # the reader finishes when the client closes the connection, which sending notices only with channels
+            while (self.limit is None or sent < self.limit) and not reader.done():
+                for _ in range(batch):
+                    if not channels or (self.limit is not None and sent >= self.limit):
+                        break
+                    await websocket.send(
+                        generator.message(channels[sent % len(channels)])
+                    )
+                    sent += 1
+                due += interval
+                await asyncio.sleep(max(0.0, due - loop.time()))
+            await websocket.close()
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            reader.cancel()
+
+    @staticmethod
+    async def _read_subscriptions(websocket, channels):
+        async for data in websocket:
+            try:
+                message = json.loads(data)
+                names = list(message.get("Data") or ())
+            except (ValueError, AttributeError, TypeError):
+                continue
+            if message.get("Event") == "Subscribe":
+                channels.extend(name for name in names if name not in channels)
+            elif message.get("Event") == "Unsubscribe":
+                channels[:] = [name for name in channels if name not in names]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--history", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=1000,
+        help="Websocket messages per second per connection, 0 for as fast as possible.",
+    )
+    parser.add_argument(
+        "--nonce-window",
+        type=int,
+        default=0,
+        help="Reordered nonces accepted, see Exchange; 0 for strictly increasing nonces as the exchange requires.",
+    )
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--websocket-port", type=int, default=8081)
+    args = parser.parse_args()
+
+    with Simulator(
+        seed=args.seed,
+        history=args.history,
+        nonce_window=args.nonce_window,
+        latency=args.latency,
+        rate=args.rate or None,
+        port=args.port,
+        websocket_port=args.websocket_port,
+    ) as simulator:
+        print("REST      {0}".format(simulator.url))
+        print("websocket {0}".format(simulator.ws_url))
+        print("API key   {0}".format(simulator.api_key))
+        print("secret    {0}".format(simulator.api_secret), flush=True)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
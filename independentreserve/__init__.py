@@ -11,4 +11,26 @@ Fiat currency amounts cannot have more than 2 decimal places, and XBT amounts ca
 from .public import *
 from .authentication import *
 from .private import *
-from .websocket import *
\ No newline at end of file
+from .websocket import *
+from .transport import *
+from .aio import *
+from .nonce import *
+from .cache import *
+from .orderbook import *
+from .events import *
+from .feed import *
+from .batch import *
+from .deadline import *
+from .endpoints import *
+from .ratelimit import *
+from .exceptions import *
+from .retry import *
+from .models import *
+from .columns import *
+from .store import *
+from .snapshot import *
+from .reference import *
+from .tracker import *
+from .ledger import *
+from .transactions import *
+from .instrumentation import *
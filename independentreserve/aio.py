@@ -0,0 +1,627 @@
+"""
+asyncio counterparts of PublicMethods and PrivateMethods.
+
+Methods share names, parameters and return values with the blocking clients, but are coroutines that run on a
+pooled aiohttp session, so hundreds of calls can be in flight concurrently on a single event loop.
+
+Requires the optional aiohttp dependency:
+
+    $ pip install pyindependentreserve[async]
+"""
+
+import asyncio
+import time
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from . import instrumentation
+from .authentication import Authentication
+from .batch import arun_batch
+from .cache import ResponseCache, cached
+from .columns import Candles, TradeTape, columnar
+from .deadline import check_deadline, effective_timeout
+from .endpoints import ENDPOINTS, PRIVATE_ENDPOINTS
+from .exceptions import (
+    TransportError,
+    async_http_exception_handler,
+    error_from_response,
+)
+from .models import (
+    MarketSummary,
+    OrderBookSnapshot,
+    RecentTrades,
+    TradeHistorySummary,
+    modelled,
+)
+from .pagination import apaginate
+from .private import (
+    PLACEMENTS,
+    _candidates,
+    _order_key,
+    _placement_key,
+    _Placements,
+)
+from .retry import AMBIGUOUS, RetryPolicy
+from .snapshot import BOOK, SUMMARY, TRADES, snapshot_markets_async
+from .transport import retry_after
+
+"""
+aiohttp tracing signals recorded, as (signal, timing key), when instrumentation is active.
+"""
+_TRACED_SIGNALS = (
+    ("on_connection_queued_start", "queue_start"),
+    ("on_connection_queued_end", "queue_end"),
+    ("on_connection_create_start", "connect_start"),
+    ("on_connection_create_end", "connect_end"),
+    ("on_dns_resolvehost_start", "dns_start"),
+    ("on_dns_resolvehost_end", "dns_end"),
+    ("on_request_end", "headers"),
+)
+
+
+def _timing(key):
+    async def record(session, context, params):
+        timings = context.trace_request_ctx
+        if timings is not None:
+            timings[key] = time.perf_counter()
+
+    return record
+
+
+def _trace_config():
+    """
+    :return: aiohttp.TraceConfig recording the time of each of _TRACED_SIGNALS into the trace_request_ctx dict
+    """
+    trace_config = aiohttp.TraceConfig()
+    for signal, key in _TRACED_SIGNALS:
+        getattr(trace_config, signal).append(_timing(key))
+    return trace_config
+
+
+def _phases(started, timings):
+    """
+    :param started: perf_counter value when the request was issued.
+    :param timings: dict filled by _trace_config.
+    :return: dict of phase name to seconds
+    """
+
+    def span(start, end):
+        if start in timings and end in timings:
+            return timings[end] - timings[start]
+        return 0.0
+
+    dns = span("dns_start", "dns_end")
+    phases = {
+        "queue": span("queue_start", "queue_end"),
+        "dns": dns,
+        "connect": max(0.0, span("connect_start", "connect_end") - dns),
+    }
+    if "headers" in timings:
+        sent = max(started, timings.get("connect_end", started))
+        phases["server"] = timings["headers"] - sent
+    return phases
+
+
+class AsyncTransport(object):
+    """
+    Pooled keep-alive HTTP transport for the asyncio clients.
+
+    The aiohttp session is created lazily on first use so the transport can be constructed outside of a running
+    event loop.
+
+    :param limit: Maximum number of simultaneous connections.
+    :param limit_per_host: Maximum number of simultaneous connections to the same host.
+    :param keepalive_timeout: Seconds an idle connection is kept open for reuse.
+    :param connect_timeout: Default seconds to wait for a connection to be established.
+    :param read_timeout: Default seconds to wait for the server to send data. Both can be overridden per call with
+                         `request_timeout` and are cut to the time left inside a `deadline` block.
+    :param rate_limiter: Optional RateLimiter every request must obtain a token from before it is sent. May be shared
+                         with blocking Transports.
+    :param retry_policy: RetryPolicy applied to Public (GET) requests here and to Private requests by the client
+                         methods, which re-sign each attempt. True for the default RetryPolicy(), None to disable.
+    """
+
+    def __init__(
+        self,
+        limit=100,
+        limit_per_host=100,
+        keepalive_timeout=30.0,
+        connect_timeout=5.0,
+        read_timeout=30.0,
+        rate_limiter=None,
+        retry_policy=True,
+    ):
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for the asyncio clients: pip install pyindependentreserve[async]"
+            )
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.rate_limiter = rate_limiter
+        self.retry_policy = (
+            RetryPolicy() if retry_policy is True else (retry_policy or None)
+        )
+        self.session = None
+
+    def _session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=self.connect_timeout, sock_read=self.read_timeout
+            )
+            # tracing is only set up when instrumentation is active when the session is created
+            trace_configs = (
+                [_trace_config()] if instrumentation._active is not None else []
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=timeout, trace_configs=trace_configs
+            )
+        return self.session
+
+    async def request(self, method, url, **kwargs):
+        """
+        Sends a request and returns the successful response, see Transport.request.
+        """
+        if method == "GET" and self.retry_policy is not None:
+            return await self.retry_policy.call_async(
+                lambda: self._send(method, url, **kwargs), idempotent=True
+            )
+        return await self._send(method, url, **kwargs)
+
+    async def _send(self, method, url, **kwargs):
+        hooks = instrumentation._active
+        if self.rate_limiter is not None:
+            waited = await self.rate_limiter.acquire_async(url)
+            if hooks is not None and waited:
+                hooks.rate_limit_wait(instrumentation.endpoint_of(url), waited)
+        connect, read = effective_timeout(self.connect_timeout, self.read_timeout)
+        kwargs["timeout"] = aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        timings = None
+        if hooks is not None:
+            timings = kwargs["trace_request_ctx"] = {}
+            started = time.perf_counter()
+        try:
+            response = await self._session().request(method, url, **kwargs)
+        except aiohttp.ClientConnectorError as error:
+            error = TransportError(
+                "{0}: {1}".format(type(error).__name__, error), sent=False
+            )
+            if hooks is not None:
+                self._record(hooks, method, url, started, timings, None, kwargs, error)
+            check_deadline()
+            raise error
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            error = TransportError(
+                "{0}: {1}".format(type(error).__name__, error), sent=True
+            )
+            if hooks is not None:
+                self._record(hooks, method, url, started, timings, None, kwargs, error)
+            check_deadline(sent=True)
+            raise error
+        if response.status >= 400:
+            seconds = retry_after(response.headers)
+            if response.status == 429 and self.rate_limiter is not None:
+                self.rate_limiter.penalize(url, seconds)
+            try:
+                error = error_from_response(
+                    response.status, await response.text(), seconds
+                )
+                if hooks is not None:
+                    self._record(
+                        hooks, method, url, started, timings, response, kwargs, error
+                    )
+                raise error
+            finally:
+                response.release()
+        if hooks is not None:
+            self._record(hooks, method, url, started, timings, response, kwargs, None)
+        return response
+
+    @staticmethod
+    def _record(hooks, method, url, started, timings, response, kwargs, error):
+        data = kwargs.get("data")
+        hooks.request(
+            instrumentation.endpoint_of(url),
+            method,
+            None if response is None else response.status,
+            time.perf_counter() - started,
+            _phases(started, timings),
+            len(data) if data else 0,
+            (response.content_length or 0) if response is not None else 0,
+            error,
+        )
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, data=None, headers=None, **kwargs):
+        return await self.request("POST", url, data=data, headers=headers, **kwargs)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def _instance_cache(args):
+    return args[0].cache
+
+
+def _instance_url(args):
+    return args[0].api_url
+
+
+def _instance_models(args):
+    return args[0].models
+
+
+class AsyncPublicMethods(object):
+    """
+    asyncio wrapper for API endpoint documented at https://www.independentreserve.com/API#public
+
+    See PublicMethods for full documentation of each method.
+    Pass cache=True, or a ResponseCache shared with other clients, to enable client side caching, and models=True to
+    return typed models from the market data methods.
+    """
+
+    def __init__(
+        self,
+        api_url="https://api.independentreserve.com",
+        transport=None,
+        cache=None,
+        models=False,
+    ):
+        self.api_url = api_url
+        self.transport = transport if transport is not None else AsyncTransport()
+        self.cache = (
+            ResponseCache() if cache is True else (None if cache is False else cache)
+        )
+        self.models = models
+
+    async def close(self):
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_valid_primary_currency_codes(self):
+        return await self.transport.get(
+            self.api_url + "/Public/GetValidPrimaryCurrencyCodes"
+        )
+
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_valid_secondary_currency_codes(self):
+        return await self.transport.get(
+            self.api_url + "/Public/GetValidSecondaryCurrencyCodes"
+        )
+
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_valid_limit_order_types(self):
+        return await self.transport.get(
+            self.api_url + "/Public/GetValidLimitOrderTypes"
+        )
+
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_valid_market_order_types(self):
+        return await self.transport.get(
+            self.api_url + "/Public/GetValidMarketOrderTypes"
+        )
+
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_valid_order_types(self):
+        return await self.transport.get(self.api_url + "/Public/GetValidOrderTypes")
+
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_valid_transaction_types(self):
+        return await self.transport.get(
+            self.api_url + "/Public/GetValidTransactionTypes"
+        )
+
+    @modelled(_instance_models, MarketSummary)
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_market_summary(
+        self, primary_currency_code="Xbt", secondary_currency_code="Aud"
+    ):
+        return await self.transport.get(
+            self.api_url
+            + "/Public/GetMarketSummary?primaryCurrencyCode={0}&secondaryCurrencyCode={1}".format(
+                primary_currency_code, secondary_currency_code
+            )
+        )
+
+    @modelled(_instance_models, OrderBookSnapshot)
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_order_book(
+        self, primary_currency_code="Xbt", secondary_currency_code="Aud"
+    ):
+        return await self.transport.get(
+            self.api_url
+            + "/Public/GetOrderBook?primaryCurrencyCode={0}&secondaryCurrencyCode={1}".format(
+                primary_currency_code, secondary_currency_code
+            )
+        )
+
+    @modelled(_instance_models, OrderBookSnapshot)
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_all_orders(
+        self, primary_currency_code="Xbt", secondary_currency_code="Aud"
+    ):
+        return await self.transport.get(
+            self.api_url
+            + "/Public/GetAllOrders?primaryCurrencyCode={0}&secondaryCurrencyCode={1}".format(
+                primary_currency_code, secondary_currency_code
+            )
+        )
+
+    @modelled(_instance_models, TradeHistorySummary)
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_trade_history_summary(
+        self, primary_currency_code="Xbt", secondary_currency_code="Aud", hours="240"
+    ):
+        return await self.transport.get(
+            self.api_url
+            + "/Public/GetTradeHistorySummary?primaryCurrencyCode={0}&secondaryCurrencyCode={1}&numberOfHoursInThePastToRetrieve={2}".format(
+                primary_currency_code, secondary_currency_code, hours
+            )
+        )
+
+    @modelled(_instance_models, RecentTrades)
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_recent_trades(
+        self,
+        primary_currency_code="Xbt",
+        secondary_currency_code="Aud",
+        number_of_trades=50,
+    ):
+        return await self.transport.get(
+            self.api_url
+            + "/Public/GetRecentTrades?primaryCurrencyCode={0}&secondaryCurrencyCode={1}&numberOfRecentTradesToRetrieve={2}".format(
+                primary_currency_code, secondary_currency_code, number_of_trades
+            )
+        )
+
+    @cached(_instance_cache, _instance_url)
+    @columnar(Candles)
+    @async_http_exception_handler
+    async def get_candles(
+        self, primary_currency_code="Xbt", secondary_currency_code="Aud", hours="240"
+    ):
+        return await self.transport.get(
+            self.api_url
+            + "/Public/GetTradeHistorySummary?primaryCurrencyCode={0}&secondaryCurrencyCode={1}&numberOfHoursInThePastToRetrieve={2}".format(
+                primary_currency_code, secondary_currency_code, hours
+            )
+        )
+
+    @cached(_instance_cache, _instance_url)
+    @columnar(TradeTape)
+    @async_http_exception_handler
+    async def get_trade_tape(
+        self,
+        primary_currency_code="Xbt",
+        secondary_currency_code="Aud",
+        number_of_trades=50,
+    ):
+        return await self.transport.get(
+            self.api_url
+            + "/Public/GetRecentTrades?primaryCurrencyCode={0}&secondaryCurrencyCode={1}&numberOfRecentTradesToRetrieve={2}".format(
+                primary_currency_code, secondary_currency_code, number_of_trades
+            )
+        )
+
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_fx_rates(self):
+        return await self.transport.get(self.api_url + "/Public/GetFxRates")
+
+    @cached(_instance_cache, _instance_url)
+    @async_http_exception_handler
+    async def get_order_minimum_volumes(self):
+        return await self.transport.get(self.api_url + "/Public/GetOrderMinimumVolumes")
+
+    async def snapshot_markets(
+        self, pairs=None, include=(SUMMARY, BOOK, TRADES), max_concurrency=32
+    ):
+        """
+        Retrieves market data for many currency pairs concurrently, see snapshot_markets.
+        """
+        return await snapshot_markets_async(self, pairs, include, max_concurrency)
+
+
+def _endpoint_send(endpoint):
+    async def send(self, parameters):
+        return await self._post(endpoint.path, parameters)
+
+    send.__name__ = send.__qualname__ = endpoint.name
+    return async_http_exception_handler(send)
+
+
+_SENDERS = dict(
+    (endpoint.name, _endpoint_send(endpoint)) for endpoint in PRIVATE_ENDPOINTS
+)
+
+
+def _endpoint_method(endpoint):
+    send = _SENDERS[endpoint.name]
+    convert = endpoint.convert
+    placement = endpoint.name in PLACEMENTS
+
+    async def method(self, *args, **kwargs):
+        parameters = endpoint.bind(args, kwargs)
+        if endpoint.validated and self.reference_data is not None:
+            self.reference_data.validate_parameters(parameters)
+        if placement:
+            key = _placement_key(parameters)
+            result = None
+            self._placements.start(key)
+            try:
+                result = await send(self, parameters)
+            finally:
+                self._placements.finish(key, result)
+        else:
+            result = await send(self, parameters)
+        if self.models and convert is not None:
+            return convert(result)
+        return result
+
+    return endpoint.describe(method)
+
+
+async def _converted(items, convert):
+    async for item in items:
+        yield convert(item)
+
+
+def _endpoint_iterator(endpoint):
+    send = _SENDERS[endpoint.name]
+    convert = endpoint.convert_item
+
+    def iterator(self, *args, **kwargs):
+        page, prefetch = endpoint.bind_pages(args, kwargs)
+        items = apaginate(lambda page_index: send(self, page(page_index)), prefetch)
+        if self.models and convert is not None:
+            return _converted(items, convert)
+        return items
+
+    return endpoint.describe(iterator, iterator=True)
+
+
+class AsyncPrivateMethods(Authentication):
+    """
+    asyncio wrapper for API endpoint documented at https://www.independentreserve.com/API#private
+
+    See PrivateMethods for full documentation of each method. The endpoint methods are generated from
+    PRIVATE_ENDPOINTS like those of PrivateMethods, as coroutines, and the iter_* helpers as async generators.
+    """
+
+    def __init__(
+        self,
+        api_key,
+        api_secret,
+        api_url="https://api.independentreserve.com",
+        transport=None,
+        nonce_generator=None,
+        models=False,
+        reference_data=None,
+    ):
+        super(AsyncPrivateMethods, self).__init__(
+            api_key,
+            api_secret,
+            api_url,
+            transport if transport is not None else AsyncTransport(),
+            nonce_generator,
+        )
+        self.models = models
+        self.reference_data = reference_data
+        self._placements = _Placements()
+
+    async def close(self):
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _raw(self, name, *args, **kwargs):
+        return await _SENDERS[name](self, ENDPOINTS[name].bind(args, kwargs))
+
+    async def _post(self, path, parameters):
+        nonce = self.nonce_generator()
+        url = self.url + path
+        body = self._build_request(url, nonce, parameters)
+        return await self.transport.post(url, data=body, headers=self.headers)
+
+    async def _find_placed_order(
+        self,
+        started,
+        primary_currency_code,
+        secondary_currency_code,
+        order_type,
+        volume,
+        price=None,
+    ):
+        candidates = []
+        for name in ("get_open_orders", "get_closed_orders"):
+            page = await self._raw(
+                name, primary_currency_code, secondary_currency_code, 1, 50
+            )
+            candidates += _candidates(
+                page, self._placements, started, order_type, volume, price
+            )
+        guid = self._placements.identify(
+            candidates,
+            _order_key(
+                primary_currency_code,
+                secondary_currency_code,
+                order_type,
+                volume,
+                price,
+            ),
+        )
+        if guid is None or guid is AMBIGUOUS:
+            return guid
+        return await self._raw("get_order_details", guid)
+
+    async def _reconcile_place_order(self, started, parameters):
+        parameters = dict(parameters)
+        return await self._find_placed_order(
+            started,
+            parameters["primaryCurrencyCode"],
+            parameters["secondaryCurrencyCode"],
+            parameters["orderType"],
+            parameters["volume"],
+            parameters.get("price"),
+        )
+
+    _reconcile_place_limit_order = _reconcile_place_order
+    _reconcile_place_market_order = _reconcile_place_order
+
+    async def place_orders(self, orders, max_concurrency=8):
+        return await arun_batch(self._place_order, orders, max_concurrency)
+
+    async def _place_order(self, order):
+        if "price" in order:
+            return await self.place_limit_order(**order)
+        return await self.place_market_order(**order)
+
+    async def cancel_orders(self, order_guids, max_concurrency=8):
+        return await arun_batch(self.cancel_order, order_guids, max_concurrency)
+
+
+for _endpoint in PRIVATE_ENDPOINTS:
+    setattr(AsyncPrivateMethods, _endpoint.name, _endpoint_method(_endpoint))
+    if _endpoint.iterator is not None:
+        setattr(AsyncPrivateMethods, _endpoint.iterator, _endpoint_iterator(_endpoint))
@@ -1,5 +1,68 @@
 import hmac
 import hashlib
+import json
+from decimal import Decimal
+from json.encoder import encode_basestring_ascii
+
+from .nonce import NonceGenerator
+from .transport import default_transport
+
+
+def _json_float(value):
+    if value != value or value in (float("inf"), float("-inf")):
+        return json.dumps(value)
+    return float.__repr__(value)
+
+
+def _json_list(value):
+    return "[" + ", ".join(_json_value(item) for item in value) + "]"
+
+
+"""
+Encoders of the parameter types used by the Private endpoints, producing the same text as json.dumps.
+Decimals are written as JSON numbers.
+"""
+_JSON_ENCODERS = {
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    float: _json_float,
+    Decimal: str,
+    list: _json_list,
+    tuple: _json_list,
+}
+
+
+def _json_value(value):
+    """
+    Encodes a single request parameter exactly as json.dumps would.
+    """
+    encode = _JSON_ENCODERS.get(type(value))
+    if encode is None:
+        return json.dumps(value)
+    return encode(value)
+
+
+class Signer(object):
+    """
+    HMAC-SHA256 signer keyed once with the API secret.
+
+    Each signature starts from a copy of the pre-keyed HMAC, so the secret is neither re-encoded nor re-hashed into
+    the key pads on every request.
+    """
+
+    __slots__ = ("_hmac",)
+
+    def __init__(self, secret):
+        self._hmac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+    def __call__(self, message):
+        """
+        :param message: Message to sign.
+        :return: upper case hex digest
+        """
+        signature = self._hmac.copy()
+        signature.update(message.encode("utf-8"))
+        return signature.hexdigest().upper()
 
 
 class Authentication(object):
@@ -12,16 +75,36 @@ class Authentication(object):
     Signature
 
     API Url can be overridden for testing purposes.
+    Transport can be supplied to share or tune the pooled HTTP session used for requests.
+    Nonce generator can be supplied to share a nonce source between clients using the same API key, or to persist
+    nonces across restarts. It must be a callable returning a strictly increasing integer.
     """
 
-    def __init__(self, api_key, api_secret, api_url):
+    def __init__(
+        self, api_key, api_secret, api_url, transport=None, nonce_generator=None
+    ):
 
         self.key = api_key
         self.secret = api_secret
-        # self.nonce = int(time.time())
+        self.signer = Signer(api_secret)
+        self._message_prefix = ",apiKey=" + api_key + ",nonce="
+        self._body_prefix = (
+            '{"apiKey": ' + encode_basestring_ascii(api_key) + ', "nonce": '
+        )
+        self.nonce_generator = (
+            nonce_generator if nonce_generator is not None else NonceGenerator()
+        )
         self.headers = {"Content-Type": "application/json"}
 
         self.url = api_url
+        self.transport = transport if transport is not None else default_transport
+
+    @property
+    def retry_policy(self):
+        """
+        RetryPolicy of the transport, applied to every private call.
+        """
+        return getattr(self.transport, "retry_policy", None)
 
     def _generate_signature(self, parameters):
         """
@@ -30,15 +113,39 @@ class Authentication(object):
         :param parameters: Query params that get passed to the URL
         :return:
         """
-        message = ",".join(parameters)
+        return self.signer(",".join(parameters))
+
+    def _build_request(self, url, nonce, parameters):
+        """
+        Signs a private request and returns its JSON body.
+
+        The signed message and the body are built together in a single pass over parameters, with the constant
+        apiKey fragments of both precomputed. The body is byte for byte what json.dumps of the equivalent
+        OrderedDict would produce.
+
+        :param url: Full url of the Private endpoint
+        :param nonce: Nonce for this request
+        :param parameters: Ordered list of (name, value) pairs following apiKey and nonce. List values are joined
+                           with commas in the signed message and sent as JSON arrays in the body.
+        :return: str
+        """
+        nonce = str(nonce)
+        message = [url, self._message_prefix, nonce]
+        body = []
+        for name, value in parameters:
+            if isinstance(value, list):
+                message.append("," + name + "=" + ",".join(value))
+            else:
+                message.append("," + name + "=" + str(value))
+            body.append(', "' + name + '": ' + _json_value(value))
 
-        signature = (
-            hmac.new(
-                self.secret.encode("utf-8"),
-                msg=message.encode("utf-8"),
-                digestmod=hashlib.sha256,
-            )
-            .hexdigest()
-            .upper()
+        # Collection order has to be in the same order as the signed message
+        return (
+            self._body_prefix
+            + nonce
+            + ', "signature": "'
+            + self.signer("".join(message))
+            + '"'
+            + "".join(body)
+            + "}"
         )
-        return signature
@@ -0,0 +1,82 @@
+"""
+Concurrent dispatch of many independent private calls, e.g. re-quoting a ladder of limit orders or cancelling every
+open order at once.
+
+Each item is signed and sent on its own pooled connection, so a batch completes in roughly the time of its slowest
+round trip instead of the sum of all of them.
+
+Independent Reserve rejects a nonce that is not greater than the last one it received, and requests dispatched
+concurrently can reach the exchange in a different order from the one they were signed in. An overtaken request fails
+with NonceRejectedError, which the RetryPolicy of the client's transport retries, signed with a fresh nonce: the
+exchange did not process it, so this is safe for order placements too.
+
+Inside a `deadline` block every item runs under the caller's deadline; items that could not be sent in time fail with
+DeadlineExceeded.
+"""
+
+import asyncio
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .deadline import submit
+
+
+class BatchResult(namedtuple("BatchResult", ["request", "result", "error"])):
+    """
+    Outcome of one item of a batch.
+
+    request: The order dict or order guid that was submitted.
+    result: Decoded response, or None when the call failed.
+    error: Exception raised by the call, if any.
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.error is None and self.result is not None
+
+
+def _call(call, request):
+    try:
+        return BatchResult(request, call(request), None)
+    except Exception as error:
+        return BatchResult(request, None, error)
+
+
+def run_batch(call, requests, max_workers=8):
+    """
+    Runs call for every request on a thread pool.
+
+    :param call: Callable taking one request.
+    :param requests: Iterable of requests.
+    :param max_workers: Maximum number of calls in flight.
+    :return: list of BatchResult, in the order of requests
+    """
+    requests = list(requests)
+    if not requests:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(requests))) as pool:
+        futures = [submit(pool, _call, call, request) for request in requests]
+        return [future.result() for future in futures]
+
+
+async def arun_batch(call, requests, max_concurrency=8):
+    """
+    Coroutine counterpart of run_batch.
+
+    :param call: Coroutine function taking one request.
+    :param requests: Iterable of requests.
+    :param max_concurrency: Maximum number of calls in flight.
+    :return: list of BatchResult, in the order of requests
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded(request):
+        async with semaphore:
+            try:
+                return BatchResult(request, await call(request), None)
+            except Exception as error:
+                return BatchResult(request, None, error)
+
+    return list(await asyncio.gather(*[bounded(request) for request in requests]))
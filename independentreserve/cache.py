@@ -0,0 +1,237 @@
+"""
+Opt-in client side cache for Public endpoints.
+
+Independent Reserve caches several Public endpoints server side (1 second for market summaries, order books and
+recent trades, 30 minutes for trade history summaries), so calling them more often only returns the same data again.
+ResponseCache keeps responses for the same windows locally, evicts least recently used entries once full, and
+coalesces concurrent identical calls so they share a single in-flight request.
+
+Cached values are shared between callers and must be treated as read-only.
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+
+"""
+Seconds each Public endpoint is cached for by default. Endpoints not listed here are not cached.
+"""
+DEFAULT_TTLS = {
+    "get_valid_primary_currency_codes": 3600,
+    "get_valid_secondary_currency_codes": 3600,
+    "get_valid_limit_order_types": 3600,
+    "get_valid_market_order_types": 3600,
+    "get_valid_order_types": 3600,
+    "get_valid_transaction_types": 3600,
+    "get_market_summary": 1,
+    "get_order_book": 1,
+    "get_all_orders": 1,
+    "get_recent_trades": 1,
+    "get_trade_history_summary": 1800,
+    "get_trade_tape": 1,
+    "get_candles": 1800,
+    "get_fx_rates": 60,
+    "get_order_minimum_volumes": 3600,
+}
+
+
+class ResponseCache(object):
+    """
+    Bounded TTL cache with LRU eviction and request coalescing, safe to share between threads and asyncio tasks.
+
+    :param maxsize: Maximum number of responses kept.
+    :param ttls: Mapping of method name to seconds, merged over DEFAULT_TTLS. A TTL of 0 disables caching for that
+                 method.
+    """
+
+    def __init__(self, maxsize=1024, ttls=None):
+        self.maxsize = maxsize
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._async_inflight = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key):
+        """
+        Returns (True, value) for a fresh entry, otherwise (False, None). Must be called with the lock held.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._entries[key]
+        return False, None
+
+    def _store(self, key, ttl, value):
+        """
+        Stores a successful response. Must be called with the lock held.
+        """
+        if value is None:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_or_call(self, name, key, call):
+        """
+        Returns the cached response for (name, key), calling `call` at most once across concurrent callers on a miss.
+
+        :param name: Method name, used to look up the TTL.
+        :param key: Hashable representation of the call arguments.
+        :param call: Callable performing the request.
+        :return: response
+        """
+        ttl = self.ttls.get(name, 0)
+        if not ttl:
+            return call()
+        key = (name, key)
+
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                waiter = self._inflight[key] = [threading.Event(), None, None]
+                owner = True
+                self.misses += 1
+            else:
+                owner = False
+
+        if not owner:
+            waiter[0].wait()
+            if waiter[2] is not None:
+                raise waiter[2]
+            return waiter[1]
+
+        try:
+            value = call()
+            waiter[1] = value
+            with self._lock:
+                self._store(key, ttl, value)
+            return value
+        except Exception as error:
+            waiter[2] = error
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            waiter[0].set()
+
+    async def get_or_call_async(self, name, key, call):
+        """
+        Coroutine counterpart of get_or_call.
+
+        :param name: Method name, used to look up the TTL.
+        :param key: Hashable representation of the call arguments.
+        :param call: Coroutine function performing the request.
+        :return: response
+        """
+        ttl = self.ttls.get(name, 0)
+        if not ttl:
+            return await call()
+        key = (name, key)
+
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            future = self._async_inflight.get(key)
+            if future is None:
+                future = self._async_inflight[key] = (
+                    asyncio.get_running_loop().create_future()
+                )
+                owner = True
+                self.misses += 1
+            else:
+                owner = False
+
+        if not owner:
+            return await asyncio.shield(future)
+
+        try:
+            value = await call()
+            with self._lock:
+                self._store(key, ttl, value)
+            future.set_result(value)
+            return value
+        except BaseException as error:
+            future.set_exception(error)
+            # Mark the exception as retrieved when nobody else is waiting on it
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_inflight[key]
+
+
+def cached(get_cache, get_url):
+    """
+    Decorator routing a Public method through a ResponseCache.
+
+    :param get_cache: Callable receiving the positional call arguments and returning the ResponseCache to use, or
+                      None to bypass caching.
+    :param get_url: Callable receiving the positional call arguments and returning the base url of the client. It is
+                    part of the key, so clients of different hosts can share a cache without seeing each other's
+                    responses.
+    :return:
+    """
+
+    def decorator(f):
+        signature = inspect.signature(f)
+        name = f.__name__
+
+        def key_of(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (get_url(args),) + tuple(
+                str(value) for arg, value in bound.arguments.items() if arg != "self"
+            )
+
+        if inspect.iscoroutinefunction(f):
+
+            @functools.wraps(f)
+            async def async_wrapper(*args, **kwargs):
+                cache = get_cache(args)
+                if cache is None:
+                    return await f(*args, **kwargs)
+                return await cache.get_or_call_async(
+                    name, key_of(args, kwargs), lambda: f(*args, **kwargs)
+                )
+
+            return async_wrapper
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            cache = get_cache(args)
+            if cache is None:
+                return f(*args, **kwargs)
+            return cache.get_or_call(
+                name, key_of(args, kwargs), lambda: f(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,176 @@
+"""
+Columnar (struct-of-arrays) views of trade history summaries and recent trades, for vectorised analytics.
+
+Candles and TradeTape hold one contiguous array per field, built in a single pass over the decoded JSON, rows in
+chronological order (oldest first). Prices and volumes are float64, timestamps int64 microseconds since the Unix
+epoch, so with the optional numpy dependency installed `to_numpy()` wraps the columns without copying them:
+
+    >>> candles = ir.PublicMethods.get_candles("Xbt", "Aud", hours=24 * 90)
+    >>> close = candles.to_numpy()["close"]
+    >>> sma = numpy.convolve(close, numpy.ones(24) / 24, mode="valid")
+"""
+
+from array import array
+from datetime import date
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+from .models import modelled
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_NAN = float("nan")
+
+
+def epoch_microseconds(value):
+    """
+    Converts an exchange timestamp such as "2014-08-05T06:42:11.3032208Z" to microseconds since the Unix epoch without
+    building a datetime. Fractions of a second beyond microseconds are truncated.
+
+    :param value: str
+    :return: int
+    """
+    days = (
+        date(int(value[0:4]), int(value[5:7]), int(value[8:10])).toordinal()
+        - _EPOCH_ORDINAL
+    )
+    seconds = (
+        days * 86400
+        + int(value[11:13]) * 3600
+        + int(value[14:16]) * 60
+        + int(value[17:19])
+    )
+    microseconds = 0
+    if len(value) > 20 and value[19] == ".":
+        microseconds = int(value[20:].rstrip("Z")[:6].ljust(6, "0"))
+    return seconds * 1000000 + microseconds
+
+
+class Columns(object):
+    """
+    Base class of the columnar views. Subclasses list their columns as (attribute, JSON key, array typecode) in
+    `columns`, timestamp first, and the attributes holding timestamps in `timestamps`. Missing prices are NaN.
+    """
+
+    __slots__ = ()
+    columns = ()
+    timestamps = ()
+
+    def __init__(self, **columns):
+        for attribute, _, typecode in self.columns:
+            setattr(self, attribute, columns.get(attribute, array(typecode)))
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        :param rows: Decoded JSON objects, in any order.
+        :return: instance of cls with rows sorted oldest first
+        """
+        key = cls.columns[0][1]
+        if len(rows) > 1 and rows[0][key] > rows[-1][key]:
+            rows = rows[::-1]
+        view = cls.__new__(cls)
+        for attribute, name, typecode in cls.columns:
+            if attribute in cls.timestamps:
+                values = [epoch_microseconds(row[name]) for row in rows]
+            elif typecode == "d":
+                values = [_NAN if row[name] is None else row[name] for row in rows]
+            else:
+                values = [row[name] or 0 for row in rows]
+            setattr(view, attribute, array(typecode, values))
+        return view
+
+    def __len__(self):
+        return len(getattr(self, self.columns[0][0]))
+
+    def to_numpy(self):
+        """
+        Wraps every column in a numpy array sharing its memory. Timestamps are datetime64[us].
+
+        :return: dict of column name to numpy.ndarray
+        """
+        if numpy is None:
+            raise ImportError("numpy is required for to_numpy: pip install numpy")
+        result = {}
+        for attribute, _, typecode in self.columns:
+            dtype = "datetime64[us]" if attribute in self.timestamps else typecode
+            result[attribute] = numpy.frombuffer(getattr(self, attribute), dtype=dtype)
+        return result
+
+    def __repr__(self):
+        return "{0}({1} rows)".format(type(self).__name__, len(self))
+
+
+class Candles(Columns):
+    """
+    Hourly OHLCV buckets of get_trade_history_summary.
+    """
+
+    __slots__ = (
+        "start",
+        "end",
+        "open",
+        "high",
+        "low",
+        "close",
+        "average",
+        "volume",
+        "secondary_volume",
+        "trades",
+    )
+    columns = (
+        ("start", "StartTimestampUtc", "q"),
+        ("end", "EndTimestampUtc", "q"),
+        ("open", "OpeningSecondaryCurrencyPrice", "d"),
+        ("high", "HighestSecondaryCurrencyPrice", "d"),
+        ("low", "LowestSecondaryCurrencyPrice", "d"),
+        ("close", "ClosingSecondaryCurrencyPrice", "d"),
+        ("average", "AverageSecondaryCurrencyPrice", "d"),
+        ("volume", "PrimaryCurrencyVolume", "d"),
+        ("secondary_volume", "SecondaryCurrencyVolume", "d"),
+        ("trades", "NumberOfTrades", "q"),
+    )
+    timestamps = ("start", "end")
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        :param data: Decoded get_trade_history_summary response.
+        :return: Candles
+        """
+        return cls.from_rows(data["HistorySummaryItems"])
+
+
+class TradeTape(Columns):
+    """
+    Trades of get_recent_trades.
+    """
+
+    __slots__ = ("timestamp", "price", "amount")
+    columns = (
+        ("timestamp", "TradeTimestampUtc", "q"),
+        ("price", "SecondaryCurrencyTradePrice", "d"),
+        ("amount", "PrimaryCurrencyAmount", "d"),
+    )
+    timestamps = ("timestamp",)
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        :param data: Decoded get_recent_trades response.
+        :return: TradeTape
+        """
+        return cls.from_rows(data["Trades"])
+
+
+def _always(args):
+    return True
+
+
+def columnar(view):
+    """
+    Decorator converting the decoded response of a Public method into the Columns subclass view.
+    """
+    return modelled(_always, view)
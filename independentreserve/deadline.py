@@ -0,0 +1,109 @@
+"""
+Per-call timeouts and deadline propagation for REST calls.
+
+Every request is sent with a connect and a read timeout, the Transport's defaults unless overridden for the calls made
+inside a `request_timeout` block. A `deadline` block bounds the total time of a higher level operation, such as
+re-quoting a ladder of orders or exporting every page of GetTransactions: each request made inside it, including
+retries and rate limit waits, has its timeouts cut to the time remaining. A request that times out because the
+deadline passed raises DeadlineExceeded, and no further requests are sent.
+
+    >>> with ir.deadline(0.3):
+    ...     api.cancel_order(guid)
+    ...     api.place_limit_order(price, volume)
+
+Both are carried in context variables, so they follow the caller into asyncio tasks created inside the block (each
+task runs in a copy of its creator's context, which requires Python 3.7) and into the thread pools used by pagination
+and batches (see `submit`). A block entered in one task never applies to other tasks.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+from .exceptions import DeadlineExceeded
+
+_deadline = contextvars.ContextVar("independentreserve_deadline", default=None)
+_timeout = contextvars.ContextVar("independentreserve_timeout", default=None)
+
+
+@contextmanager
+def deadline(seconds):
+    """
+    Bounds the total time of every call made inside the block. Nested deadlines can only shorten the outer one.
+
+    :param seconds: Time budget from now, in seconds.
+    """
+    at = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        at = min(at, outer)
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def request_timeout(connect=None, read=None):
+    """
+    Overrides the transport's connect and/or read timeout for every request made inside the block.
+
+    :param connect: Seconds to wait for a connection to be established, None to keep the transport's.
+    :param read: Seconds to wait for the server to send a response, None to keep the transport's.
+    """
+    token = _timeout.set((connect, read))
+    try:
+        yield
+    finally:
+        _timeout.reset(token)
+
+
+def remaining():
+    """
+    :return: seconds left before the current deadline, or None when there is no deadline
+    """
+    at = _deadline.get()
+    if at is None:
+        return None
+    return at - time.monotonic()
+
+
+def check_deadline(sent=False):
+    """
+    Raises DeadlineExceeded when the current deadline has passed.
+
+    :param sent: Whether the request being abandoned may already have reached the exchange.
+    :return: seconds left before the current deadline, or None when there is no deadline
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Deadline exceeded", sent=sent)
+    return left
+
+
+def effective_timeout(connect, read):
+    """
+    Timeouts for the next request: the transport's defaults, overridden by request_timeout and cut to the current
+    deadline.
+
+    :param connect: Transport's connect timeout.
+    :param read: Transport's read timeout.
+    :return: (connect, read) tuple
+    """
+    override = _timeout.get()
+    if override is not None:
+        connect = connect if override[0] is None else override[0]
+        read = read if override[1] is None else override[1]
+    left = check_deadline()
+    if left is not None:
+        connect = left if connect is None else min(connect, left)
+        read = left if read is None else min(read, left)
+    return connect, read
+
+
+def submit(executor, fn, *args):
+    """
+    executor.submit that runs fn with the caller's deadline and timeouts.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args)
@@ -0,0 +1,798 @@
+"""
+Registry of the Private API endpoints.
+
+Each Endpoint lists the method name, the path, and the ordered parameters with their API names, defaults and the
+conversion applied to the value sent. PrivateMethods and AsyncPrivateMethods generate their endpoint methods (and the
+iter_* helpers of paged endpoints) from PRIVATE_ENDPOINTS, so every endpoint shares a single signing, retry and
+dispatch path. The parameter order is significant: it is the order in which parameters are signed and sent.
+"""
+
+import inspect
+from datetime import datetime
+
+from .models import (
+    Account,
+    BrokerageFee,
+    DepositAddress,
+    ListOf,
+    Order,
+    OrderSummary,
+    PageOf,
+    Trade,
+    model_converter,
+)
+
+"""
+Marks a parameter without a default value.
+"""
+REQUIRED = inspect.Parameter.empty
+
+"""
+Largest page size accepted by the paged endpoints, used by the iter_* helpers.
+"""
+MAX_PAGE_SIZE = 50
+
+
+def _timestamp(value):
+    if value is None:
+        return ""
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _timestamp_or_now(value):
+    """
+    Encodes value, or the current UTC time when value is None, so the default is evaluated at call time.
+    """
+    return _timestamp(datetime.utcnow() if value is None else value)
+
+
+def _list(value):
+    if value is None:
+        return ""
+    return list(value)
+
+
+class Param(object):
+    """
+    One parameter of an endpoint.
+
+    :param name: Keyword argument name of the Python method.
+    :param wire: Name of the parameter in the API request.
+    :param default: Default value, REQUIRED when the argument must be given.
+    :param encode: Optional callable converting the argument to the value signed and sent.
+    """
+
+    __slots__ = ("name", "wire", "default", "encode")
+
+    def __init__(self, name, wire, default=REQUIRED, encode=None):
+        self.name = name
+        self.wire = wire
+        self.default = default
+        self.encode = encode
+
+
+class Endpoint(object):
+    """
+    One Private API endpoint.
+
+    :param name: Name of the generated client method.
+    :param path: Path of the endpoint, e.g. "/Private/GetOpenOrders".
+    :param params: List of Param, in the order in which they are signed and sent.
+    :param arguments: Names of params in the order of the method's arguments, when it differs from params.
+    :param iterator: Name of the generated iter_* method for paged endpoints (those taking page_index and page_size),
+                     None otherwise.
+    :param idempotent: Whether calling the endpoint twice has the same effect as calling it once. Non idempotent
+                       calls are not retried after an ambiguous failure, see RetryPolicy.
+    :param model: Response model returned when the client was created with models=True: a Model subclass, PageOf
+                  or ListOf. None to always return the decoded JSON.
+    :param validated: Whether calls are order placements, checked against the client's ReferenceData (when it has
+                      one) before they are signed.
+    :param doc: Docstring of the generated method.
+    """
+
+    def __init__(
+        self,
+        name,
+        path,
+        params,
+        arguments=None,
+        iterator=None,
+        idempotent=True,
+        model=None,
+        validated=False,
+        doc=None,
+    ):
+        self.name = name
+        self.path = path
+        self.params = params
+        self.iterator = iterator
+        self.idempotent = idempotent
+        self.model = model
+        self.validated = validated
+        self.doc = doc
+
+        self.convert = None if model is None else model_converter(model)
+        self.convert_item = None
+        if isinstance(model, PageOf):
+            self.convert_item = model.item.from_json
+
+        by_name = dict((param.name, param) for param in params)
+        if arguments is None:
+            arguments = [param.name for param in params]
+        self.arguments = [by_name[argument] for argument in arguments]
+        self.signature = _signature(self.arguments)
+        self._binder = _Binder(name, self.arguments)
+        self._plan = [
+            (param.wire, param.encode, arguments.index(param.name)) for param in params
+        ]
+
+        if iterator is not None:
+            page_arguments = [
+                (
+                    Param(param.name, param.wire, MAX_PAGE_SIZE, param.encode)
+                    if param.name == "page_size"
+                    else param
+                )
+                for param in self.arguments
+                if param.name != "page_index"
+            ]
+            page_arguments.append(Param("prefetch", None, True))
+            self.iterator_signature = _signature(page_arguments)
+            self._page_binder = _Binder(iterator, page_arguments)
+
+    def bind(self, args, kwargs):
+        """
+        Converts the arguments of a call into the (wire name, value) pairs to sign and send.
+
+        :return: list
+        """
+        values = self._binder(args, kwargs)
+        parameters = []
+        for wire, encode, position in self._plan:
+            value = values[position]
+            parameters.append((wire, value if encode is None else encode(value)))
+        return parameters
+
+    def bind_pages(self, args, kwargs):
+        """
+        Converts the arguments of an iter_* call, which are those of the endpoint without page_index plus prefetch.
+
+        Arguments are converted once, so every page of one iteration is requested with identical parameters.
+
+        :return: (page, prefetch) where page is a callable returning the pairs for a 1-based page index
+        """
+        values = dict(
+            zip(
+                [param.name for param in self._page_binder.params],
+                self._page_binder(args, kwargs),
+            )
+        )
+        values["page_index"] = 1
+        first = [
+            (
+                param.wire,
+                (
+                    values[param.name]
+                    if param.encode is None
+                    else param.encode(values[param.name])
+                ),
+            )
+            for param in self.params
+        ]
+        position = [param.name for param in self.params].index("page_index")
+        page_param = self.params[position]
+
+        def page(page_index):
+            parameters = list(first)
+            if page_param.encode is not None:
+                page_index = page_param.encode(page_index)
+            parameters[position] = (page_param.wire, page_index)
+            return parameters
+
+        return page, values["prefetch"]
+
+    def describe(self, function, iterator=False):
+        """
+        Gives a generated method its name, docstring and signature.
+
+        :param function: Generated method.
+        :param iterator: Whether function is the iter_* method of the endpoint.
+        :return: function
+        """
+        if iterator:
+            function.__name__ = self.iterator
+            function.__doc__ = (
+                "\n        Yields every item of {0} across all pages.\n\n"
+                "        Takes the parameters of {0} except page_index, plus prefetch (fetch the next page in the\n"
+                "        background while the current page is consumed).\n\n"
+                "        :return: generator of dict\n        "
+            ).format(self.name)
+            function.__signature__ = self.iterator_signature
+        else:
+            function.__name__ = self.name
+            function.__doc__ = self.doc
+            function.__signature__ = self.signature
+        function.__qualname__ = function.__name__
+        return function
+
+
+def _signature(params):
+    return inspect.Signature(
+        [inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+        + [
+            inspect.Parameter(
+                param.name,
+                inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                default=param.default,
+            )
+            for param in params
+        ]
+    )
+
+
+class _Binder(object):
+    """
+    Maps positional and keyword arguments onto an ordered parameter list, as a Python call would, without the cost
+    of inspect.Signature.bind.
+    """
+
+    __slots__ = ("name", "params", "defaults", "index", "required")
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = params
+        self.defaults = [param.default for param in params]
+        self.index = dict((param.name, i) for i, param in enumerate(params))
+        self.required = sum(1 for param in params if param.default is REQUIRED)
+
+    def __call__(self, args, kwargs):
+        if len(args) > len(self.defaults):
+            raise TypeError(
+                "{0}() takes {1} positional arguments but {2} were given".format(
+                    self.name, len(self.defaults), len(args)
+                )
+            )
+        values = list(args) + self.defaults[len(args) :]
+        if not kwargs and len(args) >= self.required:
+            return values
+        for name, value in kwargs.items():
+            position = self.index.get(name)
+            if position is None:
+                raise TypeError(
+                    "{0}() got an unexpected keyword argument '{1}'".format(
+                        self.name, name
+                    )
+                )
+            if position < len(args):
+                raise TypeError(
+                    "{0}() got multiple values for argument '{1}'".format(
+                        self.name, name
+                    )
+                )
+            values[position] = value
+        for param, value in zip(
+            self.params[len(args) : self.required], values[len(args) : self.required]
+        ):
+            if value is REQUIRED:
+                raise TypeError(
+                    "{0}() missing required argument '{1}'".format(
+                        self.name, param.name
+                    )
+                )
+        return values
+
+
+PRIVATE_ENDPOINTS = [
+    Endpoint(
+        "place_limit_order",
+        "/Private/PlaceLimitOrder",
+        [
+            Param("primary_currency_code", "primaryCurrencyCode", "Xbt", str),
+            Param("secondary_currency_code", "secondaryCurrencyCode", "Aud", str),
+            Param("order_type", "orderType", "LimitBid"),
+            Param("price", "price"),
+            Param("volume", "volume"),
+        ],
+        arguments=[
+            "price",
+            "volume",
+            "primary_currency_code",
+            "secondary_currency_code",
+            "order_type",
+        ],
+        idempotent=False,
+        model=Order,
+        validated=True,
+        doc="""
+        :param price: The price in secondary currency to buy/sell.
+        :param volume: The volume to buy/sell in primary currency.
+        :param primary_currency_code: The digital currency code of limit order. Must be a valid primary currency,
+                                      which can be checked via the GetValidPrimaryCurrencyCodes method.
+        :param secondary_currency_code: The fiat currency of limit order. Must be a valid secondary currency,
+                                        which can be checked via the GetValidSecondaryCurrencyCodes method.
+        :param order_type: The type of limit order. Must be a valid limit order type,
+                           which can be checked via the GetValidLimitOrderTypes method.
+        :return:
+
+
+        {
+            "apiKey":"{api-key}",
+            "nonce":{nonce},
+            "signature":"{signature}",
+            "primaryCurrencyCode":"Xbt",
+            "secondaryCurrencyCode":"Usd",
+            "orderType": "LimitBid",
+            "price": 485.76,
+            "volume": 0.358
+        }
+
+        {
+            "CreatedTimestampUtc":"2014-08-05T06:42:11.3032208Z",
+            "OrderGuid":"719c495c-a39e-4884-93ac-280b37245037",
+            "Price":485.76,
+            "PrimaryCurrencyCode":"Xbt",
+            "ReservedAmount":0.358,
+            "SecondaryCurrencyCode":"Usd",
+            "Status":"Open",
+            "Type":"LimitOffer",
+            "VolumeFilled":0,
+            "VolumeOrdered":0.358
+        }
+        """,
+    ),
+    Endpoint(
+        "place_market_order",
+        "/Private/PlaceMarketOrder",
+        [
+            Param("primary_currency_code", "primaryCurrencyCode", "Xbt", str),
+            Param("secondary_currency_code", "secondaryCurrencyCode", "Aud", str),
+            Param("order_type", "orderType", "MarketBid"),
+            Param("volume", "volume"),
+        ],
+        arguments=[
+            "volume",
+            "primary_currency_code",
+            "secondary_currency_code",
+            "order_type",
+        ],
+        idempotent=False,
+        model=Order,
+        validated=True,
+        doc="""
+        Place new market bid / offer order. A Market Bid is a buy order and a Market Offer is a sell order.
+
+        :param volume: The volume to buy/sell in primary currency.
+        :param primary_currency_code: The digital currency code of market order. Must be a valid primary currency,
+                                      which can be checked via the GetValidPrimaryCurrencyCodes method.
+        :param secondary_currency_code: The fiat currency of market order. Must be a valid secondary currency,
+                                        which can be checked via the GetValidSecondaryCurrencyCodes method.
+        :param order_type: The type of market order. Must be a valid market order type,
+                           which can be checked via the GetValidMarketOrderTypes method.
+        :return: dict
+
+        {
+            "CreatedTimestampUtc":"2014-08-05T06:42:11.3032208Z",
+            "OrderGuid":"5c8885cd-5384-4e05-b397-9f5119353e10",
+            "PrimaryCurrencyCode":"Xbt",
+            "ReservedAmount":0.025,
+            "SecondaryCurrencyCode":"Usd",
+            "Status":"Open",
+            "Type":"MarketOffer",
+            "VolumeFilled":0,
+            "VolumeOrdered":0.025
+        }
+        """,
+    ),
+    Endpoint(
+        "cancel_order",
+        "/Private/CancelOrder",
+        [
+            Param("order_guid", "orderGuid", REQUIRED, str),
+        ],
+        model=Order,
+        doc="""
+        Cancels a previously placed order.
+
+        Notes
+
+        The order must be in either 'Open' or 'PartiallyFilled' status to be valid for cancellation.
+        You can retrieve list of Open and Partially Filled orders via the GetOpenOrders method.
+        You can also check an individual order's status by calling the GetOrderDetails method.
+
+        :param order_guid: The guid of currently open or partially filled order.
+        :return: dict
+
+        {
+            "CreatedTimestampUtc":"2014-08-05T06:42:11.3032208Z",
+            "OrderGuid":"719c495c-a39e-4884-93ac-280b37245037",
+            "Price":485.76,
+            "PrimaryCurrencyCode":"Xbt",
+            "ReservedAmount":0.358,
+            "SecondaryCurrencyCode":"Usd",
+            "Status":"Cancelled",
+            "Type":"LimitOffer",
+            "VolumeFilled":0,
+            "VolumeOrdered":0.358
+        }
+        """,
+    ),
+    Endpoint(
+        "get_open_orders",
+        "/Private/GetOpenOrders",
+        [
+            Param("primary_currency_code", "primaryCurrencyCode", "Xbt", str),
+            Param("secondary_currency_code", "secondaryCurrencyCode", "Aud", str),
+            Param("page_index", "pageIndex", 1),
+            Param("page_size", "pageSize", 10),
+        ],
+        iterator="iter_open_orders",
+        model=PageOf(OrderSummary),
+        doc="""
+        Retrieves a page of a specified size, with your currently Open and Partially Filled orders.
+        :return:
+        """,
+    ),
+    Endpoint(
+        "get_closed_orders",
+        "/Private/GetClosedOrders",
+        [
+            Param("primary_currency_code", "primaryCurrencyCode", "Xbt", str),
+            Param("secondary_currency_code", "secondaryCurrencyCode", "Aud", str),
+            Param("page_index", "pageIndex", 1),
+            Param("page_size", "pageSize", 50),
+        ],
+        iterator="iter_closed_orders",
+        model=PageOf(OrderSummary),
+        doc="""
+        :param primary_currency_code: The primary currency of orders. This is an optional parameter.
+        :param secondary_currency_code: The secondary currency of orders. This is an optional parameter.
+        :param page_index: The page index. Must be greater or equal to 1
+        :param page_size: Must be greater or equal to 1 and less than or equal to 50.
+                          If a number greater than 50 is specified, then 50 will be used.
+        :return: dict
+
+        "PageSize": Number of orders shown per page
+        "TotalItems": Total number of closed orders
+        "TotalPages": Total number of pages
+        "Data":[ List of all open orders
+        {
+            "AvgPrice": Average price for all trades executed for the order
+            "CreatedTimestampUtc": UTC timestamp of when order was created
+            "FeePercent": Brokerage fee
+            "OrderGuid": Unique identifier of the order
+            "OrderType": Type of order,
+            "Outstanding": Unfilled volume still outstanding on this order
+            "Price": Order limit price in secondary currency
+            "PrimaryCurrencyCode": Primary currency of order
+            "SecondaryCurrencyCode": Secondary currency of order
+            "Status": Order status (Filled, PartiallyFilledAndCancelled, Cancelled, PartiallyFilledAndExpired, Expired)
+            "Value": The value of the order, denominated in secondary currency
+            "Volume": The original volume ordered
+        }]
+        """,
+    ),
+    Endpoint(
+        "get_closed_filled_orders",
+        "/Private/GetClosedFilledOrders",
+        [
+            Param("primary_currency_code", "primaryCurrencyCode", "Xbt", str),
+            Param("secondary_currency_code", "secondaryCurrencyCode", "Aud", str),
+            Param("page_index", "pageIndex", 1),
+            Param("page_size", "pageSize", 50),
+        ],
+        iterator="iter_closed_filled_orders",
+        model=PageOf(OrderSummary),
+        doc="""
+        :param primary_currency_code: The primary currency of orders. This is an optional parameter.
+        :param secondary_currency_code: The secondary currency of orders. This is an optional parameter.
+        :param page_index: The page index. Must be greater or equal to 1
+        :param page_size: Must be greater or equal to 1 and less than or equal to 50.
+                          If a number greater than 50 is specified, then 50 will be used.
+        :return: dict
+
+        "PageSize": Number of orders shown per page
+        "TotalItems": Total number of closed orders
+        "TotalPages": Total number of pages
+        "Data":[ List of all open orders
+        {
+            "AvgPrice": Average price for all trades executed for the order
+            "CreatedTimestampUtc": UTC timestamp of when order was created
+            "FeePercent": Brokerage fee
+            "OrderGuid": Unique identifier of the order
+            "OrderType": Type of order,
+            "Outstanding": Unfilled volume still outstanding on this order
+            "Price": Order limit price in secondary currency
+            "PrimaryCurrencyCode": Primary currency of order
+            "SecondaryCurrencyCode": Secondary currency of order
+            "Status": Order status (Filled, PartiallyFilledAndCancelled, PartiallyFilledAndExpired)
+            "Value": The value of the order, denominated in secondary currency
+            "Volume": The original volume ordered
+        }]
+        """,
+    ),
+    Endpoint(
+        "get_order_details",
+        "/Private/GetOrderDetails",
+        [
+            Param("order_guid", "orderGuid", REQUIRED, str),
+        ],
+        model=Order,
+        doc="""
+        Retrieves details about a single order.
+
+        :param order_guid:The guid of the order.
+        :return: dict
+
+        {
+          "OrderGuid": "c7347e4c-b865-4c94-8f74-d934d4b0b177",
+          "CreatedTimestampUtc": "2014-09-23T12:39:34.3817763Z",
+          "Type": "MarketBid",
+          "VolumeOrdered": 5.0,
+          "VolumeFilled": 5.0,
+          "Price": null,
+          "AvgPrice": 100.0,
+          "ReservedAmount": 0.0,
+          "Status": "Filled",
+          "PrimaryCurrencyCode": "Xbt",
+          "SecondaryCurrencyCode": "Usd"
+        }
+        """,
+    ),
+    Endpoint(
+        "get_accounts",
+        "/Private/GetAccounts",
+        [],
+        model=ListOf(Account),
+        doc="""
+        Retrieves information about your Independent Reserve accounts in digital and fiat currencies.
+
+        :return: list
+
+        [
+            {
+                "AccountGuid":"66dcac65-bf07-4e68-ad46-838f51100424",
+                "AccountStatus":"Active",
+                "AvailableBalance":45.33400000,
+                "CurrencyCode":"Xbt",
+                "TotalBalance":46.81000000
+            },
+            {
+                "AccountGuid":"49994921-60ec-411e-8a78-d0eba078d5e9",
+                "AccountStatus":"Active",
+                "AvailableBalance":14345.53000000,
+                "CurrencyCode":"Usd",
+                "TotalBalance":15784.07000000
+            }
+        ]
+        """,
+    ),
+    Endpoint(
+        "get_transactions",
+        "/Private/GetTransactions",
+        [
+            Param("account_guid", "accountGuid"),
+            Param("from_date", "fromTimestampUtc", datetime(1970, 1, 1), _timestamp),
+            Param("to_date", "toTimestampUtc", None, _timestamp_or_now),
+            Param("transaction_types", "txTypes", ["Trade", "Brokerage"], _list),
+            Param("page_index", "pageIndex", 1),
+            Param("page_size", "pageSize", 50),
+        ],
+        iterator="iter_transactions",
+        doc="""
+        Retrieves a page of a specified size, containing all trnasactions made on an account.
+
+        :param account_guid: The Guid of your Independent Reseve account.
+                             You can retrieve information about your accounts via the GetAccounts method.
+        :param from_date: The optional start date (UTC) to retrieve transactions.
+        :param to_date: The optional end date (UTC) to retrieve transactions. Defaults to the time of the call; an
+                        iteration over all pages uses the time it started for every page.
+        :param transaction_types: The optional list of transaction types to filter result.
+        :param page_index: The page index. Must be greater or equal to 1
+        :param page_size: Must be greater or equal to 1 and less than or equal to 50.
+                          If a number greater than 50 is specified, then 50 will be used.
+        :return:
+        """,
+    ),
+    Endpoint(
+        "get_digital_currency_deposit_address",
+        "/Private/GetDigitalCurrencyDepositAddress",
+        [
+            Param("primary_currency_code", "primaryCurrencyCode", "Xbt", str),
+        ],
+        model=DepositAddress,
+        doc="""
+        Retrieves the deposit address which should be used for new Bitcoin or Ether deposits.
+
+        :param primary_currency_code: The digital currency to generate deposit address for.
+        :return: dict
+
+        {
+            "DepositAddress":"12a7FbBzSGvJd36wNesAxAksLXMWm4oLUJ",
+            "LastCheckedTimestampUtc":"2014-05-05T09:35:22.4032405Z",
+            "NextUpdateTimestampUtc":"2014-05-05T09:45:22.4032405Z"
+        }
+        """,
+    ),
+    Endpoint(
+        "get_digital_currency_deposit_addresses",
+        "/Private/GetDigitalCurrencyDepositAddresses",
+        [
+            Param("primary_currency_code", "primaryCurrencyCode", "Xbt", str),
+            Param("page_index", "pageIndex", 1, str),
+            Param("page_size", "pageSize", 50, str),
+        ],
+        model=PageOf(DepositAddress),
+        doc="""
+        Retrieves a page of digital currency deposit addresses which have been assigned to your account.
+
+        :param primary_currency_code: The digital currency to generate deposit address for.
+        :param page_index: The page index. Must be greater or equal to 1
+        :param page_size: Must be greater or equal to 1 and less than or equal to 50.
+                          If a number greater than 50 is specified, then 50 will be used.
+        :return: dict
+
+        {
+            "PageSize": 10,
+            "TotalItems": 10,
+            "TotalPages": 1
+            "Data": [
+                    {
+                        "DepositAddress": "1CxrjaGvVLgXwi1s1d9d62hrCVLU83nHpX",
+                        "LastCheckedTimestampUtc": "2014-07-24T11:23:48.8693053Z",
+                        "NextUpdateTimestampUtc": "2014-07-25T11:23:48.8693053Z"
+                    },
+                    // ...
+                    {
+                        "DepositAddress":"12a7FbBzSGvJd36wNesAxAksLXMWm4oLUJ",
+                        "LastCheckedTimestampUtc":"2014-05-05T09:35:22.4032405Z",
+                        "NextUpdateTimestampUtc":"2014-05-05T09:45:22.4032405Z"
+                    }
+            ]
+        }
+        """,
+    ),
+    Endpoint(
+        "synch_digital_currency_deposit_address_with_blockchain",
+        "/Private/SynchDigitalCurrencyDepositAddressWithBlockchain",
+        [
+            Param("deposit_address", "depositAddress", REQUIRED, str),
+        ],
+        model=DepositAddress,
+        doc="""
+        Forces the deposit address to be checked for new Bitcoin or Ether deposits.
+
+        :param deposit_address: Bitcoin or Ether deposit address to check for new deposits.
+        :return: dict
+
+        {
+            "DepositAddress":"12a7FbBzSGvJd36wNesAxAksLXMWm4oLUJ",
+            "LastCheckedTimestampUtc":"2014-05-05T09:35:22.4032405Z",
+            "NextUpdateTimestampUtc":"2014-05-05T09:45:22.4032405Z"
+        }
+        """,
+    ),
+    Endpoint(
+        "withdraw_digital_currency",
+        "/Private/WithdrawDigitalCurrency",
+        [
+            Param("amount", "amount", REQUIRED, str),
+            Param("withdrawal_address", "withdrawalAddress", REQUIRED, str),
+            Param("comment", "comment", "", str),
+        ],
+        idempotent=False,
+        doc="""
+        Creates a digital currency withdrawal request. There is a minimum withdrawal amount of XBT 0.001 or ETH 0.01,
+        except where the available balance is less than this amount. In all cases, the withdrawal amount must be greater
+        than the withdrawal fee. Take care to provide a valid destination address.
+        Bitcoin and Ether withdrawals are irreversible once sent.
+
+
+        :param amount: The amount of Bitcoin to withdraw.
+        :param withdrawal_address: Target Bitcoin or Ether withdrawal address.
+        :param comment: Withdrawal comment. Should not exceed 500 characters.
+        :return: null
+        """,
+    ),
+    Endpoint(
+        "request_fiat_withdrawal",
+        "/Private/RequestFiatWithdrawal",
+        [
+            Param("secondary_currency_code", "secondaryCurrencyCode", "USD", str),
+            Param("withdrawal_amount", "withdrawalAmount", REQUIRED, str),
+            Param(
+                "withdrawal_bank_account_name",
+                "withdrawalBankAccountName",
+                REQUIRED,
+                str,
+            ),
+            Param("comment", "comment", "", str),
+        ],
+        arguments=[
+            "withdrawal_amount",
+            "withdrawal_bank_account_name",
+            "secondary_currency_code",
+            "comment",
+        ],
+        idempotent=False,
+    ),
+    Endpoint(
+        "get_trades",
+        "/Private/GetTrades",
+        [
+            Param("page_index", "pageIndex", 1),
+            Param("page_size", "pageSize", 50),
+        ],
+        iterator="iter_trades",
+        model=PageOf(Trade),
+        doc="""
+        Retrieves a page of a specified size, containing trades which were executed against your orders.
+
+        :param page_index: The page index. Must be greater or equal to 1
+        :param page_size: Must be greater or equal to 1 and less than or equal to 50.
+                          If a number greater than 50 is specified, then 50 will be used.
+        :return:
+
+        {
+          "Data": [
+            {
+              "TradeGuid": "593e609d-041a-4f46-a41d-2cb8e908973f",
+              "TradeTimestampUtc": "2014-12-16T03:44:19.2187707Z",
+              "OrderGuid": "8bf851a3-76d2-439c-945a-93367541d467",
+              "OrderType": "LimitBid",
+              "OrderTimestampUtc": "2014-12-16T03:43:36.7423769Z",
+              "VolumeTraded": 0.5,
+              "Price": 410.0,
+              "PrimaryCurrencyCode": "Xbt",
+              "SecondaryCurrencyCode": "Usd"
+            },
+            // ...
+            {
+              "TradeGuid": "13c1e71c-bfb4-452c-b13e-e03535f98b09",
+              "TradeTimestampUtc": "2014-12-11T11:37:42.2089564Z",
+              "OrderGuid": "1ce88acf-6013-4867-b58d-77f0e41ec475",
+              "OrderType": "LimitBid",
+              "OrderTimestampUtc": "2014-12-11T11:37:42.0724391Z",
+              "VolumeTraded": 0.4,
+              "Price": 399.0,
+              "PrimaryCurrencyCode": "Xbt",
+              "SecondaryCurrencyCode": "Usd"
+            }
+          ],
+          "PageSize": 5,
+          "TotalItems": 20,
+          "TotalPages": 4
+        }
+        """,
+    ),
+    Endpoint(
+        "get_brokerage_fees",
+        "/Private/GetBrokerageFees",
+        [],
+        model=ListOf(BrokerageFee),
+        doc="""
+        Retrieves information about the trading fees for the digital currencies in your Independent Reserve account.
+
+        :return:
+
+        [
+          {
+            "CurrencyCode": "Xbt",
+            "Fee": 0.005
+          },
+          {
+            "CurrencyCode": "Eth",
+            "Fee": 0.005
+          },
+          {
+            "CurrencyCode": "Bch",
+            "Fee": 0.014
+          }
+        ]
+        """,
+    ),
+]
+
+"""
+PRIVATE_ENDPOINTS by method name.
+"""
+ENDPOINTS = dict((endpoint.name, endpoint) for endpoint in PRIVATE_ENDPOINTS)
@@ -0,0 +1,136 @@
+"""
+Typed websocket events, parsed once from the raw message.
+
+Every websocket message has the shape {"Channel": ..., "Nonce": ..., "Event": ..., "Time": ..., "Data": {...}}.
+parse_event decodes a message with orjson when it is installed (falling back to the standard library json module)
+and wraps it in a slotted event object chosen by channel and event name.
+"""
+
+try:
+    import orjson
+
+    loads = orjson.loads
+except ImportError:  # pragma: no cover - optional dependency
+    import json
+
+    loads = json.loads
+
+
+class Event(object):
+    """
+    A websocket message that is not specific to a channel, e.g. Heartbeat or Subscriptions.
+    """
+
+    __slots__ = ("channel", "nonce", "event", "time", "data")
+
+    def __init__(self, channel, nonce, event, time, data):
+        self.channel = channel
+        self.nonce = nonce
+        self.event = event
+        self.time = time
+        self.data = data
+
+    def __repr__(self):
+        return "{0}(channel={1!r}, nonce={2!r}, event={3!r}, data={4!r})".format(
+            type(self).__name__, self.channel, self.nonce, self.event, self.data
+        )
+
+
+class TickerEvent(Event):
+    """
+    A message on a ticker-{primary}-{secondary} channel.
+    """
+
+    __slots__ = ()
+
+
+class TradeEvent(TickerEvent):
+    """
+    A Trade executed on a ticker channel.
+
+    {
+        "TradeGuid": "f7be5a3c-3a4a-4a4c-9b2e-5c1c2a3b4d5e",
+        "Pair": "xbt-aud",
+        "TradeDate": "2019-10-14T04:08:07.4434812Z",
+        "Price": 12345.67,
+        "Volume": 0.1,
+        "BidGuid": "...",
+        "OfferGuid": "...",
+        "Side": "Buy"
+    }
+    """
+
+    __slots__ = ()
+
+    @property
+    def trade_guid(self):
+        return self.data.get("TradeGuid")
+
+    @property
+    def price(self):
+        return self.data.get("Price")
+
+    @property
+    def volume(self):
+        return self.data.get("Volume")
+
+    @property
+    def side(self):
+        return self.data.get("Side")
+
+    @property
+    def trade_date(self):
+        return self.data.get("TradeDate")
+
+
+class OrderBookEvent(Event):
+    """
+    A NewOrder, OrderChanged or OrderCanceled message on an orderbook-{primary} channel.
+    """
+
+    __slots__ = ()
+
+    @property
+    def order_guid(self):
+        return self.data.get("OrderGuid")
+
+    @property
+    def order_type(self):
+        return self.data.get("OrderType")
+
+    @property
+    def price(self):
+        """
+        :return: dict of lower case secondary currency code to price
+        """
+        return self.data.get("Price")
+
+    @property
+    def volume(self):
+        return self.data.get("Volume")
+
+
+def parse_event(data):
+    """
+    Decodes a websocket message into its typed event.
+
+    :param data: str or bytes as received from the websocket.
+    :return: Event
+    """
+    message = loads(data)
+    channel = message.get("Channel") or ""
+    event = message.get("Event")
+
+    if channel.startswith("orderbook-"):
+        cls = OrderBookEvent
+    elif channel.startswith("ticker-"):
+        cls = TradeEvent if event == "Trade" else TickerEvent
+    else:
+        cls = Event
+    return cls(
+        channel,
+        message.get("Nonce"),
+        event,
+        message.get("Time"),
+        message.get("Data") or {},
+    )
@@ -1,36 +1,282 @@
-from requests.exceptions import HTTPError
+import functools
+import json
 import logging
+import time
 
+from requests.exceptions import ConnectionError, ConnectTimeout, RequestException
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from . import instrumentation
+
+__all__ = [
+    "IndependentReserveError",
+    "ValidationError",
+    "InsufficientBalanceError",
+    "AuthenticationError",
+    "NonceRejectedError",
+    "RateLimitedError",
+    "ServerError",
+    "TransportError",
+    "RateLimitTimeout",
+    "DeadlineExceeded",
+]
+
+
+class IndependentReserveError(Exception):
+    """
+    Base class of every error raised by API calls.
+
+    :param message: Description of the error, taken from the exchange's "Message" when available.
+    :param status_code: HTTP status code of the response, None when no response was received.
+    :param body: Raw response body, if any.
+    """
+
+    def __init__(self, message, status_code=None, body=None):
+        super(IndependentReserveError, self).__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.body = body
+
+
+class ValidationError(IndependentReserveError):
+    """
+    The exchange rejected the request parameters (HTTP 400). Retrying the same request will not succeed.
+    """
+
+
+class InsufficientBalanceError(ValidationError):
+    """
+    An order was rejected locally by a BalanceLedger because the account balance does not cover it.
+    """
 
-def http_exception_handler(f):
 
+class AuthenticationError(IndependentReserveError):
+    """
+    The API key, signature or nonce was rejected.
+    """
+
+
+class NonceRejectedError(AuthenticationError):
+    """
+    The exchange rejected the nonce as not greater than the last one used with the API key, typically because a
+    request signed later by another thread or task reached the exchange first. The request was not processed, so it
+    can safely be signed again with a fresh nonce and resent, even when it places an order.
+    """
+
+
+class RateLimitedError(IndependentReserveError):
+    """
+    The exchange rejected the request for exceeding its rate limit (HTTP 429).
+
+    :param retry_after: Seconds the exchange asked the client to wait.
+    """
+
+    def __init__(self, message, status_code=None, body=None, retry_after=1.0):
+        super(RateLimitedError, self).__init__(message, status_code, body)
+        self.retry_after = retry_after
+
+
+class ServerError(IndependentReserveError):
+    """
+    The exchange failed to process the request (HTTP 5xx). The request may or may not have taken effect.
+    """
+
+
+class TransportError(IndependentReserveError):
+    """
+    No response was received, e.g. a connection failure or timeout.
+
+    :param sent: False when the request certainly never reached the exchange (e.g. the connection could not be
+                 established), True when it may have been processed.
+    """
+
+    def __init__(self, message, sent=True):
+        super(TransportError, self).__init__(message)
+        self.sent = sent
+
+
+class RateLimitTimeout(IndependentReserveError):
+    """
+    Raised when a call could not obtain a rate limit token before its timeout and was therefore not sent.
+    """
+
+
+class DeadlineExceeded(IndependentReserveError):
+    """
+    The deadline of the enclosing `deadline` block passed, either before the request was sent or while waiting for its
+    response.
+
+    :param sent: True when the request may have reached the exchange and been processed, as for TransportError.
+    """
+
+    def __init__(self, message, sent=False):
+        super(DeadlineExceeded, self).__init__(message)
+        self.sent = sent
+
+
+"""
+Fragments of the exchange's error messages that indicate an authentication problem rather than invalid parameters.
+"""
+AUTHENTICATION_MESSAGES = ("nonce", "signature", "api key", "apikey", "unauthorized")
+
+"""
+Fragment of the exchange's error messages that indicates a rejected nonce.
+"""
+NONCE_MESSAGE = "nonce"
+
+
+def error_from_response(status_code, body, retry_after=1.0):
+    """
+    Builds the typed error for an unsuccessful HTTP response.
+
+    :param status_code: HTTP status code.
+    :param body: Response body as text.
+    :param retry_after: Seconds from the Retry-After header, used for HTTP 429.
+    :return: IndependentReserveError
+    """
+    message = body
+    try:
+        message = json.loads(body).get("Message", body)
+    except (ValueError, AttributeError):
+        pass
+    message = "HTTP {0}: {1}".format(status_code, message)
+
+    if status_code == 429:
+        return RateLimitedError(message, status_code, body, retry_after)
+    if status_code >= 500:
+        return ServerError(message, status_code, body)
+    if NONCE_MESSAGE in message.lower():
+        return NonceRejectedError(message, status_code, body)
+    if status_code in (401, 403) or any(
+        fragment in message.lower() for fragment in AUTHENTICATION_MESSAGES
+    ):
+        return AuthenticationError(message, status_code, body)
+    return ValidationError(message, status_code, body)
+
+
+def error_from_exception(error):
+    """
+    Wraps a requests exception in a TransportError.
+
+    :param error: requests.exceptions.RequestException
+    :return: TransportError
+    """
+    sent = True
+    if isinstance(error, ConnectTimeout):
+        sent = False
+    elif isinstance(error, ConnectionError) and error.args:
+        reason = getattr(error.args[0], "reason", error.args[0])
+        sent = not isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+    return TransportError("{0}: {1}".format(type(error).__name__, error), sent=sent)
+
+
+def log_error(error):
     """
     Logs error.
 
     :param error: error being logged
     """
+    if hasattr(error, "message"):
+        logging.error(error.message)
+    else:
+        logging.error(error)
+
+
+def _retry_context(args, f):
+    """
+    Returns (policy, reconcile) for a private method call, (None, None) for public calls, which are retried by the
+    Transport instead.
+    """
+    client = args[0] if args else None
+    policy = getattr(client, "retry_policy", None)
+    if policy is None:
+        return None, None
+    reconcile = getattr(client, "_reconcile_" + f.__name__, None)
+    return policy, reconcile
 
-    def log_error(error):
-        if hasattr(error, "message"):
-            logging.error(error.message)
-        else:
-            logging.error(error)
 
+def http_exception_handler(f):
     """
     Decorator to keep try catch block dry for all API calls.
 
+    Returns the decoded JSON body of a successful response and raises an IndependentReserveError subclass otherwise.
+    Private calls are retried according to the client's RetryPolicy; each attempt re-runs the method, so it is signed
+    again with a fresh nonce.
+
     :param f: function being wrapped
     :return:
     """
 
-    def wrapper(*args, **kwargs):
+    def attempt(*args, **kwargs):
         try:
             response = f(*args, **kwargs)
-            response.raise_for_status()
+        except IndependentReserveError:
+            raise
+        except RequestException as error:
+            raise error_from_exception(error)
+        if response.status_code >= 400:
+            raise error_from_response(response.status_code, response.text)
+        hooks = instrumentation._active
+        if hooks is None:
             return response.json()
-        except HTTPError as error:
-            log_error(error)
-        except Exception as error:
-            log_error(error)
+        started = time.perf_counter()
+        result = response.json()
+        hooks.parse(
+            instrumentation.endpoint_of(response.url), time.perf_counter() - started
+        )
+        return result
+
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        policy, reconcile = _retry_context(args, f)
+        if policy is None:
+            return attempt(*args, **kwargs)
+        if reconcile is not None:
+            started = time.time()
+            reconcile = functools.partial(reconcile, started, *args[1:], **kwargs)
+        return policy.call(
+            lambda: attempt(*args, **kwargs), f.__name__, reconcile=reconcile
+        )
+
+    return wrapper
+
+
+def async_http_exception_handler(f):
+    """
+    Coroutine counterpart of http_exception_handler for the asyncio clients.
+
+    :param f: coroutine function being wrapped, returning an aiohttp response
+    :return:
+    """
+
+    async def attempt(*args, **kwargs):
+        response = await f(*args, **kwargs)
+        try:
+            if response.status >= 400:
+                raise error_from_response(response.status, await response.text())
+            hooks = instrumentation._active
+            if hooks is None:
+                return await response.json(content_type=None)
+            started = time.perf_counter()
+            result = await response.json(content_type=None)
+            hooks.parse(
+                instrumentation.endpoint_of(response.url),
+                time.perf_counter() - started,
+            )
+            return result
+        finally:
+            response.release()
+
+    @functools.wraps(f)
+    async def wrapper(*args, **kwargs):
+        policy, reconcile = _retry_context(args, f)
+        if policy is None:
+            return await attempt(*args, **kwargs)
+        if reconcile is not None:
+            started = time.time()
+            reconcile = functools.partial(reconcile, started, *args[1:], **kwargs)
+        return await policy.call_async(
+            lambda: attempt(*args, **kwargs), f.__name__, reconcile=reconcile
+        )
 
     return wrapper
@@ -0,0 +1,136 @@
+"""
+Overflow policies for delivering websocket messages onto a consumer queue.
+
+When a consumer falls behind, blocking the socket reader lets the exchange's send buffers fill up until the
+connection is dropped. These policies keep the reader running instead:
+
+"block": wait for space on the queue (the behaviour of earlier releases).
+"drop-oldest": discard the oldest queued message to make room, so the consumer always sees the most recent data.
+"drop-newest": discard the incoming message when the queue is full.
+"conflate": keep only the latest pending message per key, e.g. one ticker per channel. Requires a ConflatingQueue.
+            Messages without a key (such as orderbook changes, which must all be applied) are never conflated.
+"""
+
+import asyncio
+from collections import deque
+
+from .events import Event, TickerEvent, loads
+
+BLOCK = "block"
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+CONFLATE = "conflate"
+
+OVERFLOW_POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, CONFLATE)
+
+
+def ticker_channel_key(item):
+    """
+    Default conflation key: the channel of ticker messages, None for everything else.
+
+    :param item: Event, str or bytes as put on the queue.
+    :return: str or None
+    """
+    if isinstance(item, Event):
+        return item.channel if isinstance(item, TickerEvent) else None
+    try:
+        channel = loads(item).get("Channel") or ""
+    except (ValueError, AttributeError):
+        return None
+    return channel if channel.startswith("ticker-") else None
+
+
+class ConflatingQueue(asyncio.Queue):
+    """
+    asyncio.Queue that holds at most one pending message per key.
+
+    :param maxsize: Maximum number of pending messages, 0 for unbounded.
+    :param key: Callable returning the conflation key of a message, or None for messages that must be kept.
+    """
+
+    def __init__(self, maxsize=0, key=ticker_channel_key):
+        self.key = key
+        super(ConflatingQueue, self).__init__(maxsize)
+
+    def _init(self, maxsize):
+        self._queue = deque()
+        self._pending = {}
+
+    def _put(self, item):
+        key = self.key(item)
+        if key is None:
+            key = object()
+        elif key in self._pending:
+            self._pending[key] = item
+            return
+        self._pending[key] = item
+        self._queue.append(key)
+
+    def _get(self):
+        return self._pending.pop(self._queue.popleft())
+
+    def conflate(self, item):
+        """
+        Replaces the pending message with the same key as item, if there is one.
+
+        :param item: Incoming message.
+        :return: bool, True when item replaced a pending message and must not be put on the queue
+        """
+        key = self.key(item)
+        if key is None or key not in self._pending:
+            return False
+        self._pending[key] = item
+        return True
+
+
+class FeedMetrics(object):
+    """
+    Counters describing how messages were delivered onto a queue.
+    """
+
+    __slots__ = ("delivered", "dropped", "conflated", "max_depth")
+
+    def __init__(self):
+        self.delivered = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+
+    def __repr__(self):
+        return "FeedMetrics(delivered={0}, dropped={1}, conflated={2}, max_depth={3})".format(
+            self.delivered, self.dropped, self.conflated, self.max_depth
+        )
+
+
+async def deliver(queue, item, policy, metrics):
+    """
+    Puts item on queue according to the overflow policy.
+
+    :param queue: asyncio.Queue, or ConflatingQueue for the conflate policy.
+    :param item: Message to deliver.
+    :param policy: One of OVERFLOW_POLICIES.
+    :param metrics: FeedMetrics updated with the outcome.
+    """
+    if policy == BLOCK:
+        await queue.put(item)
+    elif policy == CONFLATE and queue.conflate(item):
+        metrics.conflated += 1
+        return
+    elif queue.full():
+        if policy == DROP_NEWEST:
+            metrics.dropped += 1
+            return
+        if policy == DROP_OLDEST:
+            queue.get_nowait()
+            queue.task_done()
+            metrics.dropped += 1
+            queue.put_nowait(item)
+        else:
+            await queue.put(item)
+    else:
+        queue.put_nowait(item)
+
+    metrics.delivered += 1
+    depth = queue.qsize()
+    if depth > metrics.max_depth:
+        metrics.max_depth = depth
@@ -0,0 +1,362 @@
+"""
+Pluggable instrumentation of the request path and of websocket feeds.
+
+Every REST call made through a Transport or AsyncTransport, every retry, rate limiter wait and websocket message is
+reported to the active Instrumentation, if any. None is active by default, and each call site then costs a single
+attribute lookup and comparison.
+
+Metrics is the built-in collector: per-endpoint latency histograms of each phase of a request, request, byte, retry
+and message counters, and Prometheus text exposition. To export elsewhere (OpenTelemetry spans, StatsD, ...) subclass
+Instrumentation, or Metrics to keep the built-in collection, and override its hooks.
+
+    >>> metrics = ir.Metrics()
+    >>> ir.set_instrumentation(metrics)
+    >>> ir.PublicMethods.get_market_summary()
+    >>> print(metrics.prometheus())
+
+Request phases, in seconds:
+
+queue: waiting for a free pooled connection (asyncio clients only).
+dns: resolving the host name (asyncio clients only).
+connect: establishing a new TCP and TLS connection, zero on a reused connection (asyncio clients only).
+server: from sending the request until the response headers arrived. Includes connecting on the blocking clients,
+        where requests does not time the connection separately.
+transfer: reading the response body (blocking clients only; the asyncio clients read it while parsing).
+parse: reading and decoding the JSON body, reported separately through Instrumentation.parse.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from urllib.parse import urlsplit
+
+"""
+Upper bounds in seconds of the latency histogram buckets.
+"""
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_active = None
+
+
+def set_instrumentation(instrumentation):
+    """
+    Makes instrumentation receive the events of every client in the process.
+
+    :param instrumentation: Instrumentation, or None to disable instrumentation.
+    :return: the Instrumentation previously active, or None
+    """
+    global _active
+    previous, _active = _active, instrumentation
+    return previous
+
+
+def get_instrumentation():
+    """
+    :return: the active Instrumentation, or None
+    """
+    return _active
+
+
+def endpoint_of(url):
+    """
+    :param url: Full url, as a str or yarl.URL.
+    :return: str path of the endpoint, used as its label
+    """
+    return urlsplit(str(url)).path
+
+
+class Instrumentation(object):
+    """
+    Base class of instrumentations; every hook does nothing. Hooks are called synchronously on the thread or event
+    loop making the call, so they must be fast and must not raise.
+    """
+
+    def request(
+        self, endpoint, method, status, elapsed, phases, bytes_out, bytes_in, error
+    ):
+        """
+        Called after each HTTP request attempt.
+
+        :param endpoint: Path of the endpoint, e.g. "/Public/GetOrderBook".
+        :param method: "GET" or "POST".
+        :param status: int HTTP status, None when no response was received.
+        :param elapsed: Seconds the attempt took, from sending the request until the response was read or it failed.
+        :param phases: dict of phase name to seconds, see the module documentation.
+        :param bytes_out: Size of the request body.
+        :param bytes_in: Size of the response body, 0 when unknown.
+        :param error: IndependentReserveError raised for the attempt, or None.
+        """
+
+    def parse(self, endpoint, elapsed):
+        """
+        Called after the JSON body of a successful response was decoded.
+
+        :param elapsed: Seconds spent reading and decoding the body.
+        """
+
+    def retry(self, name, attempt, error, delay):
+        """
+        Called before sleeping ahead of a retry.
+
+        :param name: Method name of private calls, None for public (GET) calls.
+        :param attempt: Number of attempts made so far.
+        :param error: Error raised by the last attempt.
+        :param delay: Seconds about to be slept.
+        """
+
+    def rate_limit_wait(self, endpoint, elapsed):
+        """
+        Called when a request waited for a RateLimiter token.
+
+        :param elapsed: Seconds waited.
+        """
+
+    def message(self, channel, size, queue_depth):
+        """
+        Called after each websocket message was delivered onto the subscriber's queue.
+
+        :param channel: Channel of the message in "event" mode, None otherwise.
+        :param size: Length of the message as received.
+        :param queue_depth: Number of items on the queue after delivery.
+        """
+
+
+class Histogram(object):
+    """
+    Fixed-bucket histogram. counts[i] is the number of observations no larger than buckets[i] and larger than the
+    previous bucket; the last count holds those larger than every bucket.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """
+        :param q: Quantile between 0 and 1.
+        :return: upper bound of the bucket holding the q quantile, inf past the last bucket, None when empty
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def __repr__(self):
+        return "Histogram(count={0}, sum={1:.6f}, p50={2}, p99={3})".format(
+            self.count, self.sum, self.quantile(0.5), self.quantile(0.99)
+        )
+
+
+def _labels(**labels):
+    return ",".join(
+        '{0}="{1}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in labels.items()
+    )
+
+
+class Metrics(Instrumentation):
+    """
+    In-memory collector of request and websocket metrics. Safe to use from several threads.
+
+    :param buckets: Upper bounds in seconds of the latency histogram buckets.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.monotonic()
+            # (endpoint, phase) -> Histogram, phase "total" for the whole attempt
+            self.latency = {}
+            # (endpoint, method, status or error type) -> int
+            self.requests = {}
+            self.bytes_out = {}
+            self.bytes_in = {}
+            # method name, "public" for GET calls -> int
+            self.retries = {}
+            self.rate_limit_waits = {}
+            self.messages = {}
+            self.message_bytes = {}
+            self.queue_depth = 0
+            self.max_queue_depth = 0
+
+    def _observe(self, endpoint, phase, value):
+        histogram = self.latency.get((endpoint, phase))
+        if histogram is None:
+            histogram = self.latency[(endpoint, phase)] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def request(
+        self, endpoint, method, status, elapsed, phases, bytes_out, bytes_in, error
+    ):
+        outcome = type(error).__name__ if status is None else status
+        key = (endpoint, method, outcome)
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes_out[endpoint] = self.bytes_out.get(endpoint, 0) + bytes_out
+            self.bytes_in[endpoint] = self.bytes_in.get(endpoint, 0) + bytes_in
+            self._observe(endpoint, "total", elapsed)
+            for phase, value in phases.items():
+                self._observe(endpoint, phase, value)
+
+    def parse(self, endpoint, elapsed):
+        with self._lock:
+            self._observe(endpoint, "parse", elapsed)
+
+    def retry(self, name, attempt, error, delay):
+        name = name or "public"
+        with self._lock:
+            self.retries[name] = self.retries.get(name, 0) + 1
+
+    def rate_limit_wait(self, endpoint, elapsed):
+        with self._lock:
+            histogram = self.rate_limit_waits.get(endpoint)
+            if histogram is None:
+                histogram = self.rate_limit_waits[endpoint] = Histogram(self.buckets)
+            histogram.observe(elapsed)
+
+    def message(self, channel, size, queue_depth):
+        channel = channel or ""
+        with self._lock:
+            self.messages[channel] = self.messages.get(channel, 0) + 1
+            self.message_bytes[channel] = self.message_bytes.get(channel, 0) + size
+            self.queue_depth = queue_depth
+            if queue_depth > self.max_queue_depth:
+                self.max_queue_depth = queue_depth
+
+    def message_rate(self):
+        """
+        :return: float websocket messages per second since the metrics were created or reset
+        """
+        elapsed = time.monotonic() - self.started
+        return sum(self.messages.values()) / elapsed if elapsed > 0 else 0.0
+
+    def prometheus(self, prefix="independentreserve"):
+        """
+        :param prefix: Prefix of every metric name.
+        :return: str of the metrics in the Prometheus text exposition format
+        """
+        lines = []
+
+        def header(name, kind, description):
+            lines.append("# HELP {0}_{1} {2}".format(prefix, name, description))
+            lines.append("# TYPE {0}_{1} {2}".format(prefix, name, kind))
+
+        def histogram(name, values, labels):
+            cumulative = 0
+            for bound, count in zip(values.buckets, values.counts):
+                cumulative += count
+                lines.append(
+                    '{0}_{1}_bucket{{{2},le="{3}"}} {4}'.format(
+                        prefix, name, labels, bound, cumulative
+                    )
+                )
+            lines.append(
+                '{0}_{1}_bucket{{{2},le="+Inf"}} {3}'.format(
+                    prefix, name, labels, values.count
+                )
+            )
+            lines.append(
+                "{0}_{1}_sum{{{2}}} {3}".format(prefix, name, labels, values.sum)
+            )
+            lines.append(
+                "{0}_{1}_count{{{2}}} {3}".format(prefix, name, labels, values.count)
+            )
+
+        def counter(name, labels, value):
+            lines.append("{0}_{1}{{{2}}} {3}".format(prefix, name, labels, value))
+
+        with self._lock:
+            header("request_duration_seconds", "histogram", "Request latency by phase.")
+            for (endpoint, phase), values in sorted(self.latency.items()):
+                histogram(
+                    "request_duration_seconds",
+                    values,
+                    _labels(endpoint=endpoint, phase=phase),
+                )
+            header("requests_total", "counter", "Requests by status or error.")
+            for (endpoint, method, outcome), value in sorted(
+                self.requests.items(), key=lambda item: str(item[0])
+            ):
+                counter(
+                    "requests_total",
+                    _labels(endpoint=endpoint, method=method, status=outcome),
+                    value,
+                )
+            header("request_bytes_total", "counter", "Request body bytes sent.")
+            for endpoint, value in sorted(self.bytes_out.items()):
+                counter("request_bytes_total", _labels(endpoint=endpoint), value)
+            header("response_bytes_total", "counter", "Response body bytes received.")
+            for endpoint, value in sorted(self.bytes_in.items()):
+                counter("response_bytes_total", _labels(endpoint=endpoint), value)
+            header("retries_total", "counter", "Retries by method.")
+            for name, value in sorted(self.retries.items()):
+                counter("retries_total", _labels(method=name), value)
+            header(
+                "rate_limit_wait_seconds",
+                "histogram",
+                "Time waited for a rate limit token.",
+            )
+            for endpoint, values in sorted(self.rate_limit_waits.items()):
+                histogram("rate_limit_wait_seconds", values, _labels(endpoint=endpoint))
+            header(
+                "websocket_messages_total", "counter", "Websocket messages received."
+            )
+            for channel, value in sorted(self.messages.items()):
+                counter("websocket_messages_total", _labels(channel=channel), value)
+            header(
+                "websocket_message_bytes_total",
+                "counter",
+                "Websocket message bytes received.",
+            )
+            for channel, value in sorted(self.message_bytes.items()):
+                counter(
+                    "websocket_message_bytes_total", _labels(channel=channel), value
+                )
+            header(
+                "websocket_queue_depth",
+                "gauge",
+                "Items waiting on the last queue delivered to.",
+            )
+            lines.append(
+                "{0}_websocket_queue_depth {1}".format(prefix, self.queue_depth)
+            )
+        return "\n".join(lines) + "\n"
+
+    def __repr__(self):
+        return "Metrics(requests={0}, retries={1}, messages={2})".format(
+            sum(self.requests.values()),
+            sum(self.retries.values()),
+            sum(self.messages.values()),
+        )
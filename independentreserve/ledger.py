@@ -0,0 +1,329 @@
+"""
+Local account balances for pre-trade risk checks.
+
+get_accounts returns every account on each call, and checking the balance before each order costs a signed round
+trip. BalanceLedger loads the balances once and keeps them current locally:
+
+- an order placement reserves its ReservedAmount in the available balance of the currency it spends;
+- fills reported by an OrderTracker move the filled amounts between the two currencies of the pair;
+- a cancelled or expired order releases what is left of its reservation;
+- the ledger reconciles against get_accounts every `interval` seconds, and as soon as drift is detected: a balance
+  going negative, a fill whose price is unknown (market orders), or the exchange rejecting an order the ledger
+  accepted.
+
+Fees are not modelled; they are corrected at the next reconciliation.
+
+    >>> tracker = ir.OrderTracker(api)
+    >>> ledger = ir.BalanceLedger(api, tracker=tracker, interval=60)
+    >>> ledger.available("Aud")
+    >>> ledger.place_limit_order(price=1000, volume=0.1)  # raises InsufficientBalanceError locally
+"""
+
+import threading
+import time
+
+from .exceptions import InsufficientBalanceError, ValidationError
+
+"""
+Default seconds between reconciliations against get_accounts.
+"""
+DEFAULT_RECONCILE_INTERVAL = 60
+
+"""
+Balances closer than this are considered equal; amounts have 8 decimal places.
+"""
+_BALANCE_EPSILON = 0.5e-8
+
+
+class Balance(object):
+    """
+    Balance of one currency account.
+    """
+
+    __slots__ = ("account_guid", "currency_code", "available", "total", "status")
+
+    def __init__(self, account_guid, currency_code, available, total, status=None):
+        self.account_guid = account_guid
+        self.currency_code = currency_code
+        self.available = available
+        self.total = total
+        self.status = status
+
+    def __repr__(self):
+        return "Balance({0}, available={1}, total={2})".format(
+            self.currency_code, self.available, self.total
+        )
+
+
+class _Reservation(object):
+    __slots__ = ("bid", "primary", "secondary", "price", "remaining", "filled")
+
+    def __init__(self, bid, primary, secondary, price, remaining):
+        self.bid = bid
+        self.primary = primary
+        self.secondary = secondary
+        self.price = price
+        self.remaining = remaining
+        self.filled = 0.0
+
+
+class BalanceLedger(object):
+    """
+    Locally maintained balances, keyed by currency code (case insensitive). Safe to use from several threads.
+
+    :param client: PrivateMethods used to place orders and to reconcile.
+    :param tracker: Optional OrderTracker through which orders are placed; its fills and cancellations update the
+                    ledger. Without one, only placements are applied and reconciliation corrects the rest.
+    :param interval: Seconds between reconciliations against get_accounts, checked whenever the ledger is used.
+                     None to only reconcile on drift or explicitly.
+    :param load: Reconcile now.
+    """
+
+    def __init__(
+        self, client, tracker=None, interval=DEFAULT_RECONCILE_INTERVAL, load=True
+    ):
+        self.client = client
+        self.tracker = tracker
+        self.interval = interval
+        self.reconciled_at = None
+        self.reconciliations = 0
+        self.drift = 0.0
+
+        self._balances = {}
+        self._reservations = {}
+        self._drifted = False
+        self._lock = threading.RLock()
+
+        if tracker is not None:
+            chained = tracker.on_change
+
+            def on_change(order, previous_status):
+                self.order_changed(order, previous_status)
+                if chained is not None:
+                    chained(order, previous_status)
+
+            tracker.on_change = on_change
+        if load:
+            self.reconcile()
+
+    def reconcile(self):
+        """
+        Replaces the local balances with those of get_accounts. Reservations of orders still open are kept so their
+        fills keep being applied.
+
+        :return: float largest absolute difference found between a local and an exchange balance
+        """
+        accounts = self.client._raw("get_accounts")
+        with self._lock:
+            drift = 0.0
+            balances = {}
+            for account in accounts:
+                code = account["CurrencyCode"].lower()
+                balance = Balance(
+                    account.get("AccountGuid"),
+                    account["CurrencyCode"],
+                    float(account["AvailableBalance"]),
+                    float(account["TotalBalance"]),
+                    account.get("AccountStatus"),
+                )
+                local = self._balances.get(code)
+                if local is not None:
+                    drift = max(
+                        drift,
+                        abs(local.available - balance.available),
+                        abs(local.total - balance.total),
+                    )
+                balances[code] = balance
+            self._balances = balances
+            self._drifted = False
+            self.drift = drift
+            self.reconciled_at = time.monotonic()
+            self.reconciliations += 1
+            return drift
+
+    def _maybe_reconcile(self):
+        if self._drifted or (
+            self.interval is not None
+            and (
+                self.reconciled_at is None
+                or time.monotonic() - self.reconciled_at >= self.interval
+            )
+        ):
+            self.reconcile()
+
+    def balance(self, currency_code):
+        """
+        :return: Balance, or None when there is no account in currency_code
+        """
+        self._maybe_reconcile()
+        return self._balances.get(currency_code.lower())
+
+    def available(self, currency_code):
+        """
+        :return: float available balance, 0 when there is no account in currency_code
+        """
+        balance = self.balance(currency_code)
+        return 0.0 if balance is None else balance.available
+
+    def check_order(
+        self,
+        primary_currency_code,
+        secondary_currency_code,
+        order_type,
+        volume,
+        price=None,
+    ):
+        """
+        Raises InsufficientBalanceError when the available balance cannot cover an order. Market bids, whose cost is
+        not known in advance, are only checked when price (an expected price) is given.
+        """
+        if order_type.endswith("Bid"):
+            if price is None:
+                return
+            currency, amount = secondary_currency_code, float(price) * float(volume)
+        else:
+            currency, amount = primary_currency_code, float(volume)
+        available = self.available(currency)
+        if amount > available + _BALANCE_EPSILON:
+            raise InsufficientBalanceError(
+                "Order needs {0} {1}, only {2} available".format(
+                    amount, currency, available
+                )
+            )
+
+    def place_limit_order(
+        self,
+        price,
+        volume,
+        primary_currency_code="Xbt",
+        secondary_currency_code="Aud",
+        order_type="LimitBid",
+    ):
+        """
+        Checks the order against the local balances, places it (through the tracker when there is one) and reserves
+        its amount.
+        """
+        self.check_order(
+            primary_currency_code, secondary_currency_code, order_type, volume, price
+        )
+        placer = self.tracker if self.tracker is not None else self.client
+        return self._placed(
+            placer.place_limit_order,
+            price,
+            volume,
+            primary_currency_code,
+            secondary_currency_code,
+            order_type,
+        )
+
+    def place_market_order(
+        self,
+        volume,
+        primary_currency_code="Xbt",
+        secondary_currency_code="Aud",
+        order_type="MarketBid",
+    ):
+        """
+        place_limit_order for market orders.
+        """
+        self.check_order(
+            primary_currency_code, secondary_currency_code, order_type, volume
+        )
+        placer = self.tracker if self.tracker is not None else self.client
+        return self._placed(
+            placer.place_market_order,
+            volume,
+            primary_currency_code,
+            secondary_currency_code,
+            order_type,
+        )
+
+    def _placed(self, place, *args):
+        try:
+            order = place(*args)
+        except ValidationError:
+            # the exchange disagrees with the local balances
+            self._drifted = True
+            raise
+        self.order_placed(order)
+        return order
+
+    def order_placed(self, order):
+        """
+        Reserves the amount of an order placed outside of the ledger.
+
+        :param order: dict or Order as returned by place_limit_order or place_market_order.
+        """
+        if isinstance(order, dict):
+            guid, order_type = order["OrderGuid"], order.get("Type") or ""
+            primary = order.get("PrimaryCurrencyCode") or ""
+            secondary = order.get("SecondaryCurrencyCode") or ""
+            price, reserved = order.get("Price"), order.get("ReservedAmount")
+        else:
+            guid, order_type = order.order_guid, order.type or ""
+            primary = order.primary_currency_code or ""
+            secondary = order.secondary_currency_code or ""
+            price, reserved = order.price, order.reserved_amount
+        bid = order_type.endswith("Bid")
+        reserved = float(reserved or 0)
+        with self._lock:
+            self._reservations[guid] = _Reservation(
+                bid,
+                primary.lower(),
+                secondary.lower(),
+                None if price is None else float(price),
+                reserved,
+            )
+            self._adjust(secondary if bid else primary, -reserved, 0.0)
+
+    def order_changed(self, order, previous_status):
+        """
+        Applies a fill or the end of an order reported by an OrderTracker.
+
+        :param order: TrackedOrder
+        """
+        with self._lock:
+            reservation = self._reservations.get(order.order_guid)
+            if reservation is None:
+                return
+            filled = order.filled - reservation.filled
+            if filled > 0:
+                reservation.filled = order.filled
+                self._fill(reservation, filled)
+            if order.done:
+                del self._reservations[order.order_guid]
+                if reservation.remaining > 0:
+                    spent = (
+                        reservation.secondary
+                        if reservation.bid
+                        else reservation.primary
+                    )
+                    self._adjust(spent, reservation.remaining, 0.0)
+
+    def _fill(self, reservation, volume):
+        if reservation.price is None:
+            # market order: the amount of the other currency is unknown
+            self._drifted = True
+            return
+        value = volume * reservation.price
+        if reservation.bid:
+            spent, spent_amount = reservation.secondary, value
+            self._adjust(reservation.primary, volume, volume)
+        else:
+            spent, spent_amount = reservation.primary, volume
+            self._adjust(reservation.secondary, value, value)
+        released = min(spent_amount, reservation.remaining)
+        reservation.remaining -= released
+        # the reserved part was already taken from available when the order was placed
+        self._adjust(spent, released - spent_amount, -spent_amount)
+
+    def _adjust(self, currency_code, available, total):
+        balance = self._balances.get(currency_code.lower())
+        if balance is None:
+            if available or total:
+                self._drifted = True
+            return
+        balance.available += available
+        balance.total += total
+        if balance.available < -_BALANCE_EPSILON or balance.total < -_BALANCE_EPSILON:
+            self._drifted = True
@@ -0,0 +1,662 @@
+"""
+Typed response models.
+
+By default every method returns the decoded JSON as dicts and lists with float amounts. Clients created with
+models=True return the slotted objects below instead:
+
+Amounts are exact Decimals. Values are converted from the shortest representation of the decoded float, which is
+the exchange's own decimal text for the up to 15 significant digits it sends.
+Timestamps are kept as the exchange's strings and only parsed into datetimes when first accessed.
+Order book sides are stored as columns of fixed-point integers (1e-8 units) in arrays rather than one dict per level,
+and levels are materialised on access.
+
+    >>> public = ir.PublicMethods(models=True)
+    >>> book = public.get_order_book("Xbt", "Aud")
+    >>> book.bids[0].price
+    Decimal('497.02000000')
+"""
+
+import functools
+import inspect
+from array import array
+from datetime import datetime
+from decimal import Decimal
+
+"""
+Number of decimal places of the fixed-point integers, the precision of Independent Reserve amounts.
+"""
+PLACES = 8
+SCALE = 10**PLACES
+
+"""
+Largest magnitude converted from float to fixed point by scaling; larger values go through Decimal so they stay exact.
+"""
+_FAST_FIXED_LIMIT = 2.0**51 / SCALE
+
+
+def to_decimal(value):
+    """
+    :param value: float, int, str or Decimal amount.
+    :return: Decimal, or None for None
+    """
+    if value is None or isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(value)
+
+
+def to_fixed(value):
+    """
+    :param value: float, int, str or Decimal amount with at most PLACES decimal places.
+    :return: int amount in 1e-8 units
+    """
+    if isinstance(value, float) and -_FAST_FIXED_LIMIT < value < _FAST_FIXED_LIMIT:
+        return int(round(value * SCALE))
+    return int(to_decimal(value).scaleb(PLACES))
+
+
+def from_fixed(value):
+    """
+    :param value: int amount in 1e-8 units.
+    :return: Decimal
+    """
+    return Decimal(value).scaleb(-PLACES)
+
+
+def parse_timestamp(value):
+    """
+    Parses an exchange timestamp such as "2014-08-05T06:42:11.3032208Z" into a naive UTC datetime. Fractions of a
+    second beyond microseconds are truncated.
+
+    :param value: str
+    :return: datetime
+    """
+    if len(value) > 20 and value[19] == ".":
+        fraction = value[20:].rstrip("Z")[:6].ljust(6, "0")
+        return datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S").replace(
+            microsecond=int(fraction)
+        )
+    return datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S")
+
+
+class LazyTimestamp(object):
+    """
+    Descriptor exposing the timestamp string held in a slot as a datetime, parsed on first access and then kept in
+    place of the string.
+    """
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot):
+        self.slot = slot
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if isinstance(value, str):
+            value = parse_timestamp(value)
+            setattr(instance, self.slot, value)
+        return value
+
+
+class Model(object):
+    """
+    Base class of the response models.
+
+    Subclasses list their fields as (attribute, JSON key, converter) in `fields`; converter is None for values kept
+    as they are. Timestamp fields are stored in a slot named after the attribute with a leading underscore and
+    exposed through a LazyTimestamp.
+    """
+
+    __slots__ = ()
+    fields = ()
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        :param data: Decoded JSON object.
+        :return: instance of cls
+        """
+        model = cls.__new__(cls)
+        for attribute, key, convert in cls.fields:
+            value = data.get(key)
+            if convert is not None and value is not None:
+                value = convert(value)
+            setattr(model, attribute, value)
+        return model
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, attribute) == getattr(other, attribute)
+            for attribute, _, _ in self.fields
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "{0}({1})".format(
+            type(self).__name__,
+            ", ".join(
+                "{0}={1!r}".format(attribute.lstrip("_"), getattr(self, attribute))
+                for attribute, _, _ in self.fields
+            ),
+        )
+
+
+class Page(object):
+    """
+    One page of a paged Private endpoint.
+
+    :param data: List of item models.
+    """
+
+    __slots__ = ("data", "page_size", "total_items", "total_pages")
+
+    def __init__(self, data, page_size, total_items, total_pages):
+        self.data = data
+        self.page_size = page_size
+        self.total_items = total_items
+        self.total_pages = total_pages
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __repr__(self):
+        return "Page({0} items, total_items={1!r}, total_pages={2!r})".format(
+            len(self.data), self.total_items, self.total_pages
+        )
+
+
+class PageOf(object):
+    """
+    Converter of a paged response into a Page of `item` models.
+    """
+
+    __slots__ = ("item",)
+
+    def __init__(self, item):
+        self.item = item
+
+    def __call__(self, data):
+        return Page(
+            [self.item.from_json(item) for item in data.get("Data") or ()],
+            data.get("PageSize"),
+            data.get("TotalItems"),
+            data.get("TotalPages"),
+        )
+
+
+class ListOf(object):
+    """
+    Converter of a list response into a list of `item` models.
+    """
+
+    __slots__ = ("item",)
+
+    def __init__(self, item):
+        self.item = item
+
+    def __call__(self, data):
+        return [self.item.from_json(item) for item in data]
+
+
+class OrderBookLevel(object):
+    """
+    One resting order of an order book side.
+    """
+
+    __slots__ = ("price", "volume", "guid")
+
+    def __init__(self, price, volume, guid=None):
+        self.price = price
+        self.volume = volume
+        self.guid = guid
+
+    def __eq__(self, other):
+        return isinstance(other, OrderBookLevel) and (
+            self.price,
+            self.volume,
+            self.guid,
+        ) == (other.price, other.volume, other.guid)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "OrderBookLevel(price={0!r}, volume={1!r}, guid={2!r})".format(
+            self.price, self.volume, self.guid
+        )
+
+
+class BookSide(object):
+    """
+    One side of an order book snapshot, in exchange order (best price first), stored as columns.
+
+    :param prices: array of fixed-point prices.
+    :param volumes: array of fixed-point volumes.
+    :param guids: list of order guids for GetAllOrders snapshots, None for GetOrderBook snapshots.
+    """
+
+    __slots__ = ("prices", "volumes", "guids")
+
+    def __init__(self, prices, volumes, guids=None):
+        self.prices = prices
+        self.volumes = volumes
+        self.guids = guids
+
+    @classmethod
+    def from_json(cls, orders):
+        """
+        :param orders: Decoded BuyOrders or SellOrders list.
+        :return: BookSide
+        """
+        prices = array("q", [to_fixed(order["Price"]) for order in orders])
+        volumes = array("q", [to_fixed(order["Volume"]) for order in orders])
+        guids = None
+        if orders and "Guid" in orders[0]:
+            guids = [order["Guid"] for order in orders]
+        return cls(prices, volumes, guids)
+
+    def __len__(self):
+        return len(self.prices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return OrderBookLevel(
+            from_fixed(self.prices[index]),
+            from_fixed(self.volumes[index]),
+            None if self.guids is None else self.guids[index],
+        )
+
+    def __iter__(self):
+        for index in range(len(self.prices)):
+            yield self[index]
+
+    def price(self, index):
+        return from_fixed(self.prices[index])
+
+    def volume(self, index):
+        return from_fixed(self.volumes[index])
+
+    def total_volume(self):
+        return from_fixed(sum(self.volumes))
+
+    def __repr__(self):
+        return "BookSide({0} levels)".format(len(self))
+
+
+class OrderBookSnapshot(Model):
+    """
+    Response of get_order_book and get_all_orders. bids and offers are BookSides.
+    """
+
+    __slots__ = (
+        "primary_currency_code",
+        "secondary_currency_code",
+        "_created_timestamp_utc",
+        "bids",
+        "offers",
+    )
+    fields = (
+        ("primary_currency_code", "PrimaryCurrencyCode", None),
+        ("secondary_currency_code", "SecondaryCurrencyCode", None),
+        ("_created_timestamp_utc", "CreatedTimestampUtc", None),
+        ("bids", "BuyOrders", BookSide.from_json),
+        ("offers", "SellOrders", BookSide.from_json),
+    )
+    created_timestamp_utc = LazyTimestamp("_created_timestamp_utc")
+
+
+class MarketSummary(Model):
+    """
+    Response of get_market_summary.
+    """
+
+    __slots__ = (
+        "_created_timestamp_utc",
+        "current_highest_bid_price",
+        "current_lowest_offer_price",
+        "day_avg_price",
+        "day_highest_price",
+        "day_lowest_price",
+        "day_volume_xbt",
+        "day_volume_xbt_in_secondary_currency",
+        "last_price",
+        "primary_currency_code",
+        "secondary_currency_code",
+    )
+    fields = (
+        ("_created_timestamp_utc", "CreatedTimestampUtc", None),
+        ("current_highest_bid_price", "CurrentHighestBidPrice", to_decimal),
+        ("current_lowest_offer_price", "CurrentLowestOfferPrice", to_decimal),
+        ("day_avg_price", "DayAvgPrice", to_decimal),
+        ("day_highest_price", "DayHighestPrice", to_decimal),
+        ("day_lowest_price", "DayLowestPrice", to_decimal),
+        ("day_volume_xbt", "DayVolumeXbt", to_decimal),
+        (
+            "day_volume_xbt_in_secondary_currency",
+            "DayVolumeXbtInSecondaryCurrrency",
+            to_decimal,
+        ),
+        ("last_price", "LastPrice", to_decimal),
+        ("primary_currency_code", "PrimaryCurrencyCode", None),
+        ("secondary_currency_code", "SecondaryCurrencyCode", None),
+    )
+    created_timestamp_utc = LazyTimestamp("_created_timestamp_utc")
+
+
+class RecentTrade(Model):
+    """
+    One item of get_recent_trades.
+    """
+
+    __slots__ = (
+        "primary_currency_amount",
+        "secondary_currency_trade_price",
+        "_trade_timestamp_utc",
+    )
+    fields = (
+        ("primary_currency_amount", "PrimaryCurrencyAmount", to_decimal),
+        ("secondary_currency_trade_price", "SecondaryCurrencyTradePrice", to_decimal),
+        ("_trade_timestamp_utc", "TradeTimestampUtc", None),
+    )
+    trade_timestamp_utc = LazyTimestamp("_trade_timestamp_utc")
+
+
+class RecentTrades(Model):
+    """
+    Response of get_recent_trades. trades is a list of RecentTrade.
+    """
+
+    __slots__ = (
+        "_created_timestamp_utc",
+        "primary_currency_code",
+        "secondary_currency_code",
+        "trades",
+    )
+    fields = (
+        ("_created_timestamp_utc", "CreatedTimestampUtc", None),
+        ("primary_currency_code", "PrimaryCurrencyCode", None),
+        ("secondary_currency_code", "SecondaryCurrencyCode", None),
+        ("trades", "Trades", ListOf(RecentTrade)),
+    )
+    created_timestamp_utc = LazyTimestamp("_created_timestamp_utc")
+
+
+class HistorySummaryItem(Model):
+    """
+    One hourly bucket of get_trade_history_summary.
+    """
+
+    __slots__ = (
+        "average_secondary_currency_price",
+        "closing_secondary_currency_price",
+        "_start_timestamp_utc",
+        "_end_timestamp_utc",
+        "highest_secondary_currency_price",
+        "lowest_secondary_currency_price",
+        "number_of_trades",
+        "opening_secondary_currency_price",
+        "primary_currency_volume",
+        "secondary_currency_volume",
+    )
+    fields = (
+        (
+            "average_secondary_currency_price",
+            "AverageSecondaryCurrencyPrice",
+            to_decimal,
+        ),
+        (
+            "closing_secondary_currency_price",
+            "ClosingSecondaryCurrencyPrice",
+            to_decimal,
+        ),
+        ("_start_timestamp_utc", "StartTimestampUtc", None),
+        ("_end_timestamp_utc", "EndTimestampUtc", None),
+        (
+            "highest_secondary_currency_price",
+            "HighestSecondaryCurrencyPrice",
+            to_decimal,
+        ),
+        ("lowest_secondary_currency_price", "LowestSecondaryCurrencyPrice", to_decimal),
+        ("number_of_trades", "NumberOfTrades", None),
+        (
+            "opening_secondary_currency_price",
+            "OpeningSecondaryCurrencyPrice",
+            to_decimal,
+        ),
+        ("primary_currency_volume", "PrimaryCurrencyVolume", to_decimal),
+        ("secondary_currency_volume", "SecondaryCurrencyVolume", to_decimal),
+    )
+    start_timestamp_utc = LazyTimestamp("_start_timestamp_utc")
+    end_timestamp_utc = LazyTimestamp("_end_timestamp_utc")
+
+
+class TradeHistorySummary(Model):
+    """
+    Response of get_trade_history_summary. items is a list of HistorySummaryItem.
+    """
+
+    __slots__ = (
+        "_created_timestamp_utc",
+        "items",
+        "number_of_hours_in_the_past_to_retrieve",
+        "primary_currency_code",
+        "secondary_currency_code",
+    )
+    fields = (
+        ("_created_timestamp_utc", "CreatedTimestampUtc", None),
+        ("items", "HistorySummaryItems", ListOf(HistorySummaryItem)),
+        (
+            "number_of_hours_in_the_past_to_retrieve",
+            "NumberOfHoursInThePastToRetrieve",
+            None,
+        ),
+        ("primary_currency_code", "PrimaryCurrencyCode", None),
+        ("secondary_currency_code", "SecondaryCurrencyCode", None),
+    )
+    created_timestamp_utc = LazyTimestamp("_created_timestamp_utc")
+
+
+class Order(Model):
+    """
+    Response of place_limit_order, place_market_order, cancel_order and get_order_details.
+    """
+
+    __slots__ = (
+        "order_guid",
+        "_created_timestamp_utc",
+        "type",
+        "volume_ordered",
+        "volume_filled",
+        "price",
+        "avg_price",
+        "reserved_amount",
+        "status",
+        "primary_currency_code",
+        "secondary_currency_code",
+    )
+    fields = (
+        ("order_guid", "OrderGuid", None),
+        ("_created_timestamp_utc", "CreatedTimestampUtc", None),
+        ("type", "Type", None),
+        ("volume_ordered", "VolumeOrdered", to_decimal),
+        ("volume_filled", "VolumeFilled", to_decimal),
+        ("price", "Price", to_decimal),
+        ("avg_price", "AvgPrice", to_decimal),
+        ("reserved_amount", "ReservedAmount", to_decimal),
+        ("status", "Status", None),
+        ("primary_currency_code", "PrimaryCurrencyCode", None),
+        ("secondary_currency_code", "SecondaryCurrencyCode", None),
+    )
+    created_timestamp_utc = LazyTimestamp("_created_timestamp_utc")
+
+
+class OrderSummary(Model):
+    """
+    One item of get_open_orders, get_closed_orders and get_closed_filled_orders.
+    """
+
+    __slots__ = (
+        "order_guid",
+        "_created_timestamp_utc",
+        "order_type",
+        "volume",
+        "outstanding",
+        "price",
+        "avg_price",
+        "value",
+        "status",
+        "fee_percent",
+        "primary_currency_code",
+        "secondary_currency_code",
+    )
+    fields = (
+        ("order_guid", "OrderGuid", None),
+        ("_created_timestamp_utc", "CreatedTimestampUtc", None),
+        ("order_type", "OrderType", None),
+        ("volume", "Volume", to_decimal),
+        ("outstanding", "Outstanding", to_decimal),
+        ("price", "Price", to_decimal),
+        ("avg_price", "AvgPrice", to_decimal),
+        ("value", "Value", to_decimal),
+        ("status", "Status", None),
+        ("fee_percent", "FeePercent", to_decimal),
+        ("primary_currency_code", "PrimaryCurrencyCode", None),
+        ("secondary_currency_code", "SecondaryCurrencyCode", None),
+    )
+    created_timestamp_utc = LazyTimestamp("_created_timestamp_utc")
+
+
+class Account(Model):
+    """
+    One item of get_accounts.
+    """
+
+    __slots__ = (
+        "account_guid",
+        "account_status",
+        "available_balance",
+        "currency_code",
+        "total_balance",
+    )
+    fields = (
+        ("account_guid", "AccountGuid", None),
+        ("account_status", "AccountStatus", None),
+        ("available_balance", "AvailableBalance", to_decimal),
+        ("currency_code", "CurrencyCode", None),
+        ("total_balance", "TotalBalance", to_decimal),
+    )
+
+
+class Trade(Model):
+    """
+    One item of get_trades.
+    """
+
+    __slots__ = (
+        "trade_guid",
+        "_trade_timestamp_utc",
+        "order_guid",
+        "order_type",
+        "_order_timestamp_utc",
+        "volume_traded",
+        "price",
+        "primary_currency_code",
+        "secondary_currency_code",
+    )
+    fields = (
+        ("trade_guid", "TradeGuid", None),
+        ("_trade_timestamp_utc", "TradeTimestampUtc", None),
+        ("order_guid", "OrderGuid", None),
+        ("order_type", "OrderType", None),
+        ("_order_timestamp_utc", "OrderTimestampUtc", None),
+        ("volume_traded", "VolumeTraded", to_decimal),
+        ("price", "Price", to_decimal),
+        ("primary_currency_code", "PrimaryCurrencyCode", None),
+        ("secondary_currency_code", "SecondaryCurrencyCode", None),
+    )
+    trade_timestamp_utc = LazyTimestamp("_trade_timestamp_utc")
+    order_timestamp_utc = LazyTimestamp("_order_timestamp_utc")
+
+
+class BrokerageFee(Model):
+    """
+    One item of get_brokerage_fees.
+    """
+
+    __slots__ = ("currency_code", "fee")
+    fields = (("currency_code", "CurrencyCode", None), ("fee", "Fee", to_decimal))
+
+
+class DepositAddress(Model):
+    """
+    Response of get_digital_currency_deposit_address and synch_digital_currency_deposit_address_with_blockchain, and
+    item of get_digital_currency_deposit_addresses.
+    """
+
+    __slots__ = (
+        "deposit_address",
+        "_last_checked_timestamp_utc",
+        "_next_update_timestamp_utc",
+    )
+    fields = (
+        ("deposit_address", "DepositAddress", None),
+        ("_last_checked_timestamp_utc", "LastCheckedTimestampUtc", None),
+        ("_next_update_timestamp_utc", "NextUpdateTimestampUtc", None),
+    )
+    last_checked_timestamp_utc = LazyTimestamp("_last_checked_timestamp_utc")
+    next_update_timestamp_utc = LazyTimestamp("_next_update_timestamp_utc")
+
+
+def model_converter(model):
+    """
+    :param model: Model subclass, PageOf or ListOf.
+    :return: callable converting a decoded response
+    """
+    if isinstance(model, type):
+        return model.from_json
+    return model
+
+
+def modelled(get_enabled, model):
+    """
+    Decorator converting the decoded response of a Public method into model when models are enabled.
+
+    The decorated method keeps the decoded JSON available as its `raw` attribute, for callers such as OrderBook that
+    need it whatever the setting. Apply it above `cached`, so that cached responses are stored as decoded JSON and
+    shared by clients with and without models.
+
+    :param get_enabled: Callable receiving the positional call arguments and returning whether to convert.
+    :param model: Model subclass, PageOf or ListOf.
+    :return:
+    """
+    convert = model_converter(model)
+
+    def decorator(f):
+        if inspect.iscoroutinefunction(f):
+
+            @functools.wraps(f)
+            async def async_wrapper(*args, **kwargs):
+                result = await f(*args, **kwargs)
+                return convert(result) if get_enabled(args) else result
+
+            async_wrapper.raw = f
+            return async_wrapper
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            result = f(*args, **kwargs)
+            return convert(result) if get_enabled(args) else result
+
+        wrapper.raw = f
+        return wrapper
+
+    return decorator
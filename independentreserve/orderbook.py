@@ -0,0 +1,341 @@
+"""
+Local order book maintained from the websocket orderbook channels.
+
+The orderbook-{primary} channel publishes one message per change to an individual order:
+
+{
+    "Channel": "orderbook-xbt",
+    "Nonce": 8,
+    "Data": {
+        "OrderType": "LimitBid",
+        "OrderGuid": "2c2d6c8f-4f09-4d4c-8dd1-3a2d5fa6c2e4",
+        "Price": {"aud": 12345.0, "usd": 9012.0, "nzd": 13001.0, "sgd": 11890.0},
+        "Volume": 0.5
+    },
+    "Time": 1571028487443,
+    "Event": "NewOrder"
+}
+
+Events are NewOrder, OrderChanged (Volume is the new remaining volume) and OrderCanceled. Nonce increases by one per
+message on a channel, so a skipped nonce means a change was missed and the book has to be snapshotted again.
+"""
+
+import asyncio
+import heapq
+import inspect
+
+from .events import Event, loads
+from .exceptions import IndependentReserveError, log_error
+from .models import SCALE, to_fixed
+from .public import PublicMethods
+
+BID = "Bid"
+OFFER = "Offer"
+
+"""
+Returned by OrderBook._sequence for a message following a nonce gap.
+"""
+_GAP = object()
+
+"""
+Stale heap entries tolerated beyond the number of price levels before a side's heap is rebuilt.
+"""
+_STALE_SLACK = 64
+
+
+class OrderBook(object):
+    """
+    In-memory, price level indexed order book for a single currency pair.
+
+    The book is seeded from PublicMethods.get_all_orders (the per-order variant of get_order_book, needed to match
+    websocket changes to resting orders) and kept current by passing every orderbook channel message to apply().
+    A gap in the channel nonce triggers a fresh snapshot.
+
+    Price levels are kept in a dict alongside a heap of prices per side, so the best bid and offer are read in O(1), a
+    change to an existing level is O(1) and adding a level is O(log n). Removed levels leave the heap lazily, when
+    they reach its top, and the heap is rebuilt once such stale entries outnumber the levels, so removing a level is
+    amortised O(log n). Level volumes are summed exactly in the fixed-point units of models.to_fixed, so they do not
+    drift from the exchange's however many changes are applied, and are returned as floats.
+
+    An OrderChanged message that omits the Price applies to the price the order was resting at.
+
+    apply() snapshots the book with a blocking call when needed; from asyncio code use apply_async() or consume(),
+    which await an asynchronous snapshot callable (e.g. AsyncPublicMethods.get_all_orders) or run a blocking one in
+    the event loop's default executor, so the loop is never blocked.
+
+    :param primary_currency_code: Digital currency of the book, e.g. "Xbt".
+    :param secondary_currency_code: Fiat currency prices are quoted in, e.g. "Aud".
+    :param snapshot: Optional callable or coroutine function (primary, secondary) returning a get_all_orders style
+                     payload. Defaults to PublicMethods.get_all_orders.
+    """
+
+    def __init__(
+        self, primary_currency_code="Xbt", secondary_currency_code="Aud", snapshot=None
+    ):
+        self.primary_currency_code = primary_currency_code
+        self.secondary_currency_code = secondary_currency_code
+        self.channel = "orderbook-" + primary_currency_code.lower()
+        self._price_key = secondary_currency_code.lower()
+        # raw, so the book gets the decoded JSON even when PublicMethods(models=True) enabled models
+        self._snapshot = (
+            snapshot if snapshot is not None else PublicMethods.get_all_orders.raw
+        )
+
+        self.nonce = None
+        self.gaps = 0
+        self.snapshots = 0
+
+        self._reset()
+
+    def _reset(self):
+        # guid -> (side, price, fixed-point volume)
+        self._orders = {}
+        # price -> [fixed-point volume, number of orders]
+        self._levels = {BID: {}, OFFER: {}}
+        # bids are pushed negated, so the top of each heap is the best price
+        self._heaps = {BID: [], OFFER: []}
+
+    def resnapshot(self):
+        """
+        Discards the book and reloads it from a REST snapshot.
+
+        :return: bool, False when the snapshot could not be retrieved
+        """
+        if inspect.iscoroutinefunction(self._snapshot):
+            raise TypeError(
+                "the snapshot callable is a coroutine function, use resnapshot_async"
+            )
+        try:
+            payload = self._snapshot(
+                self.primary_currency_code, self.secondary_currency_code
+            )
+        except IndependentReserveError as error:
+            log_error(error)
+            return False
+        return self._load(payload)
+
+    async def resnapshot_async(self):
+        """
+        Coroutine counterpart of resnapshot that does not block the event loop.
+
+        :return: bool, False when the snapshot could not be retrieved
+        """
+        try:
+            if inspect.iscoroutinefunction(self._snapshot):
+                payload = await self._snapshot(
+                    self.primary_currency_code, self.secondary_currency_code
+                )
+            else:
+                payload = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    self._snapshot,
+                    self.primary_currency_code,
+                    self.secondary_currency_code,
+                )
+        except IndependentReserveError as error:
+            log_error(error)
+            return False
+        return self._load(payload)
+
+    def _load(self, payload):
+        if payload is None:
+            return False
+
+        self._reset()
+        for side, key in ((BID, "BuyOrders"), (OFFER, "SellOrders")):
+            for order in payload.get(key, []):
+                self._add(order["Guid"], side, order["Price"], order["Volume"])
+        self.snapshots += 1
+        return True
+
+    def apply(self, message):
+        """
+        Applies one orderbook channel message.
+
+        :param message: OrderBookEvent, decoded dict, or the raw str/bytes received from the websocket.
+        :return: bool, True when the message changed the book
+        """
+        change = self._sequence(message)
+        if change is None:
+            return False
+        if change is _GAP:
+            self.resnapshot()
+            return True
+        if not self.snapshots:
+            self.resnapshot()
+        return self._change(*change)
+
+    async def apply_async(self, message):
+        """
+        Coroutine counterpart of apply, snapshotting the book without blocking the event loop.
+
+        :param message: OrderBookEvent, decoded dict, or the raw str/bytes received from the websocket.
+        :return: bool, True when the message changed the book
+        """
+        change = self._sequence(message)
+        if change is None:
+            return False
+        if change is _GAP:
+            await self.resnapshot_async()
+            return True
+        if not self.snapshots:
+            await self.resnapshot_async()
+        return self._change(*change)
+
+    def _sequence(self, message):
+        """
+        Decodes a message and checks its nonce.
+
+        :return: None for messages of other channels, _GAP when messages were missed and the book must be snapshotted
+                 instead, otherwise the (event, data) to apply
+        """
+        if isinstance(message, Event):
+            channel, nonce, event, data = (
+                message.channel,
+                message.nonce,
+                message.event,
+                message.data,
+            )
+        else:
+            if isinstance(message, (bytes, str)):
+                message = loads(message)
+            channel, nonce, event, data = (
+                message.get("Channel"),
+                message.get("Nonce"),
+                message.get("Event"),
+                message.get("Data") or {},
+            )
+        if channel != self.channel:
+            return None
+
+        if nonce is not None:
+            if self.nonce is not None and nonce != self.nonce + 1:
+                self.gaps += 1
+                self.nonce = nonce
+                return _GAP
+            self.nonce = nonce
+        return event, data
+
+    def _change(self, event, data):
+        guid = data.get("OrderGuid")
+        if event == "OrderCanceled":
+            return self._remove(guid)
+
+        if event not in ("NewOrder", "OrderChanged"):
+            return False
+        resting = self._orders.get(guid)
+        price = data.get("Price")
+        if isinstance(price, dict):
+            price = price.get(self._price_key)
+        order_type = data.get("OrderType")
+        if order_type:
+            side = BID if order_type.endswith("Bid") else OFFER
+        elif resting is not None:
+            side = resting[0]
+        else:
+            return False
+        if price is None:
+            if resting is None:
+                return False
+            price = resting[1]
+
+        self._remove(guid)
+        if data.get("Volume", 0) > 0:
+            self._add(guid, side, price, data["Volume"])
+        return True
+
+    def _add(self, guid, side, price, volume):
+        volume = to_fixed(volume)
+        levels = self._levels[side]
+        level = levels.get(price)
+        if level is None:
+            levels[price] = [volume, 1]
+            heapq.heappush(self._heaps[side], -price if side == BID else price)
+        else:
+            level[0] += volume
+            level[1] += 1
+        self._orders[guid] = (side, price, volume)
+
+    def _remove(self, guid):
+        order = self._orders.pop(guid, None)
+        if order is None:
+            return False
+        side, price, volume = order
+        levels = self._levels[side]
+        level = levels[price]
+        level[1] -= 1
+        if level[1] == 0:
+            del levels[price]
+            self._prune(side)
+        else:
+            level[0] -= volume
+        return True
+
+    def _prune(self, side):
+        """
+        Drops entries of removed levels from the top of a side's heap, and rebuilds the heap once they outnumber the
+        levels.
+        """
+        heap = self._heaps[side]
+        levels = self._levels[side]
+        sign = -1 if side == BID else 1
+        if len(heap) > 2 * len(levels) + _STALE_SLACK:
+            heap[:] = [sign * price for price in levels]
+            heapq.heapify(heap)
+        while heap and sign * heap[0] not in levels:
+            heapq.heappop(heap)
+
+    def _best(self, side):
+        heap = self._heaps[side]
+        if not heap:
+            return None
+        price = -heap[0] if side == BID else heap[0]
+        return price, self._levels[side][price][0] / SCALE
+
+    def best_bid(self):
+        """
+        :return: (price, volume) of the highest bid, or None when there are no bids
+        """
+        return self._best(BID)
+
+    def best_offer(self):
+        """
+        :return: (price, volume) of the lowest offer, or None when there are no offers
+        """
+        return self._best(OFFER)
+
+    def spread(self):
+        bid, offer = self.best_bid(), self.best_offer()
+        if bid is None or offer is None:
+            return None
+        return offer[0] - bid[0]
+
+    def depth(self, levels=10):
+        """
+        :param levels: Number of price levels per side.
+        :return: dict with "Bids" (best first) and "Offers" (best first) lists of (price, volume)
+        """
+        bids = self._levels[BID]
+        offers = self._levels[OFFER]
+        return {
+            "Bids": [(p, bids[p][0] / SCALE) for p in heapq.nlargest(levels, bids)],
+            "Offers": [
+                (p, offers[p][0] / SCALE) for p in heapq.nsmallest(levels, offers)
+            ],
+        }
+
+    def __len__(self):
+        return len(self._orders)
+
+    async def consume(self, queue):
+        """
+        Applies every message put on an asyncio queue by wss_subscribe until None is received. Snapshots are taken
+        with resnapshot_async, so the event loop keeps running while they are retrieved.
+
+        :param queue: asyncio.Queue being fed by wss_subscribe with the orderbook channel subscribed.
+        """
+        while True:
+            message = await queue.get()
+            if message is None:
+                break
+            await self.apply_async(message)
@@ -0,0 +1,99 @@
+"""
+Lazy iteration over the paged Private endpoints (GetOpenOrders, GetClosedOrders, GetTransactions, GetTrades ...).
+
+Paged responses have the shape {"Data": [...], "PageSize": n, "TotalItems": n, "TotalPages": n}. The helpers here
+yield the items of "Data" one at a time across all pages, fetching the next page in the background while the caller
+works through the current one, so at most two pages are held in memory at any time. Pages are never requested in
+parallel: the exchange requires strictly increasing nonces, so concurrent requests that reach it out of nonce order
+are rejected and have to be resent, which makes parallel paging slower than paging one page at a time. An error
+fetching any page is raised from the iterator. Inside a `deadline` block, background fetches run under the same
+deadline, and pages not yet fetched when it passes raise DeadlineExceeded rather than being requested.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .deadline import submit
+
+
+def paginate(fetch_page, prefetch=True):
+    """
+    Yields every item of a paged endpoint.
+
+    :param fetch_page: Callable taking a 1-based page index and returning the decoded page.
+    :param prefetch: Fetch the next page in the background while the current page is consumed.
+    :return: generator
+    """
+    page = fetch_page(1)
+    total_pages = page.get("TotalPages", 1)
+
+    if not prefetch or total_pages <= 1:
+        for page_index in range(1, total_pages + 1):
+            if page_index > 1:
+                page = fetch_page(page_index)
+            for item in page["Data"]:
+                yield item
+        return
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    pending = deque()
+    next_index = 2
+    try:
+        pending.append((next_index, submit(executor, fetch_page, next_index)))
+        next_index += 1
+
+        for item in page["Data"]:
+            yield item
+
+        while pending:
+            _, future = pending.popleft()
+            page = future.result()
+            if next_index <= total_pages:
+                pending.append((next_index, submit(executor, fetch_page, next_index)))
+                next_index += 1
+            for item in page["Data"]:
+                yield item
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def apaginate(fetch_page, prefetch=True):
+    """
+    Async generator counterpart of paginate for the asyncio clients.
+
+    :param fetch_page: Coroutine function taking a 1-based page index and returning the decoded page.
+    :param prefetch: Fetch the next page in the background while the current page is consumed.
+    :return: async generator
+    """
+    page = await fetch_page(1)
+    total_pages = page.get("TotalPages", 1)
+    window = 1 if prefetch else 0
+
+    pending = deque()
+    next_index = 2
+    try:
+        while next_index <= total_pages and len(pending) < window:
+            pending.append((next_index, asyncio.ensure_future(fetch_page(next_index))))
+            next_index += 1
+
+        for item in page["Data"]:
+            yield item
+
+        while pending or next_index <= total_pages:
+            if pending:
+                _, task = pending.popleft()
+                page = await task
+            else:
+                page = await fetch_page(next_index)
+                next_index += 1
+            if window and next_index <= total_pages:
+                pending.append((next_index, asyncio.ensure_future(fetch_page(next_index))))
+                next_index += 1
+            for item in page["Data"]:
+                yield item
+    finally:
+        for _, task in pending:
+            task.cancel()
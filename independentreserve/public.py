@@ -2,9 +2,29 @@
 Python wrapper for API endpoint documented at https://www.independentreserve.com/API#public
 """
 
-import requests
-
+from .cache import ResponseCache, cached
+from .columns import Candles, TradeTape, columnar
 from .exceptions import http_exception_handler
+from .models import (
+    MarketSummary,
+    OrderBookSnapshot,
+    RecentTrades,
+    TradeHistorySummary,
+    modelled,
+)
+from .transport import default_transport
+
+
+def _public_cache(args):
+    return PublicMethods.cache
+
+
+def _public_url(args):
+    return PublicMethods.api_url
+
+
+def _public_models(args):
+    return PublicMethods.models
 
 
 class PublicMethods(object):
@@ -18,11 +38,45 @@ class PublicMethods(object):
     """
     api_url = "https://api.independentreserve.com"
 
-    def __init__(self, api_url="https://api.independentreserve.com"):
+    """
+    Pooled HTTP transport used for every request.
+    Pass a Transport to tune connection pool size and timeouts.
+    """
+    transport = default_transport
+
+    """
+    Optional ResponseCache. Disabled by default.
+    Pass cache=True for a cache using the server side cache windows, or a ResponseCache to tune TTLs and size.
+    """
+    cache = None
+
+    """
+    Return typed models (see models.py) from the market data methods instead of the decoded JSON.
+    Disabled by default. Like the other settings, this applies to every PublicMethods call in the process; the decoded
+    JSON stays available from the `raw` attribute of each market data method, e.g. PublicMethods.get_all_orders.raw.
+    """
+    models = False
+
+    def __init__(
+        self,
+        api_url="https://api.independentreserve.com",
+        transport=None,
+        cache=None,
+        models=None,
+    ):
         PublicMethods.api_url = api_url
-        pass
+        if transport is not None:
+            PublicMethods.transport = transport
+        if cache is True:
+            PublicMethods.cache = ResponseCache()
+        elif cache is not None:
+            # an empty ResponseCache is falsy, so only False disables caching
+            PublicMethods.cache = None if cache is False else cache
+        if models is not None:
+            PublicMethods.models = bool(models)
 
     @staticmethod
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_valid_primary_currency_codes():
         """
@@ -33,12 +87,13 @@ class PublicMethods(object):
 
         :return: list
         """
-        response = requests.get(
+        response = PublicMethods.transport.get(
             PublicMethods.api_url + "/Public/GetValidPrimaryCurrencyCodes"
         )
         return response
 
     @staticmethod
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_valid_secondary_currency_codes():
         """
@@ -49,12 +104,13 @@ class PublicMethods(object):
 
         ["Usd","Aud", "Nzd"]
         """
-        response = requests.get(
+        response = PublicMethods.transport.get(
             PublicMethods.api_url + "/Public/GetValidSecondaryCurrencyCodes"
         )
         return response
 
     @staticmethod
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_valid_limit_order_types():
         """
@@ -64,12 +120,13 @@ class PublicMethods(object):
 
         ["LimitBid","LimitOffer"]
         """
-        response = requests.get(
+        response = PublicMethods.transport.get(
             PublicMethods.api_url + "/Public/GetValidLimitOrderTypes"
         )
         return response
 
     @staticmethod
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_valid_market_order_types():
         """
@@ -79,12 +136,13 @@ class PublicMethods(object):
 
         ["MarketBid","MarketOffer"]
         """
-        response = requests.get(
+        response = PublicMethods.transport.get(
             PublicMethods.api_url + "/Public/GetValidMarketOrderTypes"
         )
         return response
 
     @staticmethod
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_valid_order_types():
         """
@@ -94,10 +152,13 @@ class PublicMethods(object):
 
         ["LimitBid","LimitOffer","MarketBid","MarketOffer"]
         """
-        response = requests.get(PublicMethods.api_url + "/Public/GetValidOrderTypes")
+        response = PublicMethods.transport.get(
+            PublicMethods.api_url + "/Public/GetValidOrderTypes"
+        )
         return response
 
     @staticmethod
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_valid_transaction_types():
         """
@@ -115,12 +176,14 @@ class PublicMethods(object):
          u'Withdrawal',
          u'WithdrawalFee']
         """
-        response = requests.get(
+        response = PublicMethods.transport.get(
             PublicMethods.api_url + "/Public/GetValidTransactionTypes"
         )
         return response
 
     @staticmethod
+    @modelled(_public_models, MarketSummary)
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_market_summary(primary_currency_code="Xbt", secondary_currency_code="Aud"):
         """
@@ -162,7 +225,7 @@ class PublicMethods(object):
         "SecondaryCurrencyCode": The secondary currency being used for pricing
 
         """
-        response = requests.get(
+        response = PublicMethods.transport.get(
             PublicMethods.api_url
             + "/Public/GetMarketSummary?primaryCurrencyCode={0}&secondaryCurrencyCode={1}".format(
                 primary_currency_code, secondary_currency_code
@@ -171,6 +234,8 @@ class PublicMethods(object):
         return response
 
     @staticmethod
+    @modelled(_public_models, OrderBookSnapshot)
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_order_book(primary_currency_code="Xbt", secondary_currency_code="Aud"):
         """
@@ -211,7 +276,7 @@ class PublicMethods(object):
            ]
         }
         """
-        response = requests.get(
+        response = PublicMethods.transport.get(
             PublicMethods.api_url
             + "/Public/GetOrderBook?primaryCurrencyCode={0}&secondaryCurrencyCode={1}".format(
                 primary_currency_code, secondary_currency_code
@@ -220,6 +285,50 @@ class PublicMethods(object):
         return response
 
     @staticmethod
+    @modelled(_public_models, OrderBookSnapshot)
+    @cached(_public_cache, _public_url)
+    @http_exception_handler
+    def get_all_orders(primary_currency_code="Xbt", secondary_currency_code="Aud"):
+        """
+        Returns the Order Book for a given currency pair including the guid of every individual order, as needed to
+        apply the per-order changes published on the websocket orderbook channels.
+
+        This method caches return values for 1 second. Calling it more than once per second will result in cached
+        data being returned.
+
+        :return: dict
+
+        {
+           "BuyOrders":[
+              {
+                 "Guid":"78f9d6c4-2b07-4ae2-9a4f-4d1c13c9f4b8",
+                 "Price":497.02000000,
+                 "Volume":0.01000000
+              }
+           ],
+           "CreatedTimestampUtc":"2014-08-05T06:42:11.3032208Z",
+           "PrimaryCurrencyCode":"Xbt",
+           "SecondaryCurrencyCode":"Usd",
+           "SellOrders":[
+              {
+                 "Guid":"c1f5a4d2-63a5-4f6e-b1ce-0a0d5f8bb7f6",
+                 "Price":500.00000000,
+                 "Volume":1.00000000
+              }
+           ]
+        }
+        """
+        response = PublicMethods.transport.get(
+            PublicMethods.api_url
+            + "/Public/GetAllOrders?primaryCurrencyCode={0}&secondaryCurrencyCode={1}".format(
+                primary_currency_code, secondary_currency_code
+            )
+        )
+        return response
+
+    @staticmethod
+    @modelled(_public_models, TradeHistorySummary)
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_trade_history_summary(
         primary_currency_code="Xbt", secondary_currency_code="Aud", hours="240"
@@ -283,7 +392,7 @@ class PublicMethods(object):
 
         """
 
-        response = requests.get(
+        response = PublicMethods.transport.get(
             PublicMethods.api_url
             + "/Public/GetTradeHistorySummary?primaryCurrencyCode={0}&secondaryCurrencyCode={1}&numberOfHoursInThePastToRetrieve={2}".format(
                 primary_currency_code, secondary_currency_code, hours
@@ -292,6 +401,8 @@ class PublicMethods(object):
         return response
 
     @staticmethod
+    @modelled(_public_models, RecentTrades)
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_recent_trades(
         primary_currency_code="Xbt", secondary_currency_code="Aud", number_of_trades=50
@@ -344,7 +455,7 @@ class PublicMethods(object):
 
         """
 
-        response = requests.get(
+        response = PublicMethods.transport.get(
             PublicMethods.api_url
             + "/Public/GetRecentTrades?primaryCurrencyCode={0}&secondaryCurrencyCode={1}&numberOfRecentTradesToRetrieve={2}".format(
                 primary_currency_code, secondary_currency_code, number_of_trades
@@ -353,6 +464,53 @@ class PublicMethods(object):
         return response
 
     @staticmethod
+    @cached(_public_cache, _public_url)
+    @columnar(Candles)
+    @http_exception_handler
+    def get_candles(
+        primary_currency_code="Xbt", secondary_currency_code="Aud", hours="240"
+    ):
+        """
+        Returns the hourly buckets of get_trade_history_summary as columns, oldest first.
+
+        :param primary_currency_code: The digital currency for which to retrieve trade history.
+        :param secondary_currency_code: The fiat currency in which to retrieve trade history.
+        :param hours: The time period in hours to get trade history.
+        :return: Candles
+        """
+        response = PublicMethods.transport.get(
+            PublicMethods.api_url
+            + "/Public/GetTradeHistorySummary?primaryCurrencyCode={0}&secondaryCurrencyCode={1}&numberOfHoursInThePastToRetrieve={2}".format(
+                primary_currency_code, secondary_currency_code, hours
+            )
+        )
+        return response
+
+    @staticmethod
+    @cached(_public_cache, _public_url)
+    @columnar(TradeTape)
+    @http_exception_handler
+    def get_trade_tape(
+        primary_currency_code="Xbt", secondary_currency_code="Aud", number_of_trades=50
+    ):
+        """
+        Returns the trades of get_recent_trades as columns, oldest first.
+
+        :param primary_currency_code: The digital currency for which to retrieve recent trades.
+        :param secondary_currency_code: The fiat currency in which to retrieve recent trades.
+        :param number_of_trades: How many recent trades to retrieve (maximum is 50)
+        :return: TradeTape
+        """
+        response = PublicMethods.transport.get(
+            PublicMethods.api_url
+            + "/Public/GetRecentTrades?primaryCurrencyCode={0}&secondaryCurrencyCode={1}&numberOfRecentTradesToRetrieve={2}".format(
+                primary_currency_code, secondary_currency_code, number_of_trades
+            )
+        )
+        return response
+
+    @staticmethod
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_fx_rates():
         """
@@ -361,10 +519,13 @@ class PublicMethods(object):
 
         :return: list
         """
-        response = requests.get(PublicMethods.api_url + "/Public/GetFxRates")
+        response = PublicMethods.transport.get(
+            PublicMethods.api_url + "/Public/GetFxRates"
+        )
         return response
 
     @staticmethod
+    @cached(_public_cache, _public_url)
     @http_exception_handler
     def get_order_minimum_volumes():
         """
@@ -372,5 +533,7 @@ class PublicMethods(object):
 
         :return: dict
         """
-        response = requests.get(PublicMethods.api_url + "/Public/GetOrderMinimumVolumes")
-        return response
\ No newline at end of file
+        response = PublicMethods.transport.get(
+            PublicMethods.api_url + "/Public/GetOrderMinimumVolumes"
+        )
+        return response
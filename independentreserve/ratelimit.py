@@ -0,0 +1,231 @@
+"""
+Client side rate limiting for the REST API.
+
+Exceeding the exchange's rate limits results in HTTP 429 responses and, if repeated, temporary bans. A RateLimiter
+attached to a Transport (or AsyncTransport) makes every call wait for a token from a per-bucket token bucket before
+it is sent, so a process never exceeds the configured budget regardless of how many threads and asyncio tasks share
+the transport.
+
+Public and Private endpoints draw from separate buckets. Within a bucket, waiting calls are served by priority lane
+and then in arrival order, so order placement and cancellation overtake background polling such as GetTransactions.
+Calls that cannot get a token before their timeout raise RateLimitTimeout instead of being sent, and those that
+cannot get one before the deadline of an enclosing `deadline` block raise DeadlineExceeded (with sent=False).
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .deadline import remaining
+from .exceptions import DeadlineExceeded, RateLimitTimeout
+
+HIGH = 0
+NORMAL = 1
+LOW = 2
+
+"""
+Priority lane of each endpoint. Endpoints not listed here use NORMAL.
+"""
+DEFAULT_PRIORITIES = {
+    "/Private/CancelOrder": HIGH,
+    "/Private/PlaceLimitOrder": HIGH,
+    "/Private/PlaceMarketOrder": HIGH,
+    "/Private/GetClosedOrders": LOW,
+    "/Private/GetClosedFilledOrders": LOW,
+    "/Private/GetTransactions": LOW,
+    "/Private/GetTrades": LOW,
+    "/Private/GetDigitalCurrencyDepositAddresses": LOW,
+}
+
+
+class TokenBucket(object):
+    """
+    Token bucket refilled continuously at `rate` tokens per second up to `burst` tokens.
+
+    Not thread-safe on its own; RateLimiter guards it with its lock.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.waiters = []
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until_token(self):
+        return max(0.0, (1.0 - self.tokens) / self.rate)
+
+
+class RateLimiter(object):
+    """
+    Shared token bucket rate limiter with separate Public/Private budgets and priority lanes.
+
+    :param public_rate: Public requests per second.
+    :param public_burst: Public requests that may be sent back to back after an idle period.
+    :param private_rate: Private requests per second.
+    :param private_burst: Private requests that may be sent back to back after an idle period.
+    :param priorities: Mapping of endpoint path to HIGH, NORMAL or LOW, merged over DEFAULT_PRIORITIES.
+    :param timeout: Default seconds a call may wait for a token before RateLimitTimeout is raised, None to wait
+                    indefinitely.
+    """
+
+    def __init__(
+        self,
+        public_rate=10,
+        public_burst=10,
+        private_rate=10,
+        private_burst=10,
+        priorities=None,
+        timeout=None,
+    ):
+        self.buckets = {
+            "Public": TokenBucket(public_rate, public_burst),
+            "Private": TokenBucket(private_rate, private_burst),
+        }
+        self.priorities = dict(DEFAULT_PRIORITIES)
+        if priorities:
+            self.priorities.update(priorities)
+        self.timeout = timeout
+
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+
+    def _classify(self, url):
+        path = urlsplit(url).path
+        bucket = self.buckets["Public" if path.startswith("/Public/") else "Private"]
+        return bucket, self.priorities.get(path, NORMAL)
+
+    def _enqueue(self, url, priority, timeout):
+        bucket, default_priority = self._classify(url)
+        if priority is None:
+            priority = default_priority
+        if timeout is None:
+            timeout = self.timeout
+        # whether the wait is bounded by the enclosing deadline rather than by the timeout
+        bounded = False
+        left = remaining()
+        if left is not None and (timeout is None or left < timeout):
+            timeout = left
+            bounded = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        entry = [priority, next(self._sequence)]
+        with self._condition:
+            heapq.heappush(bucket.waiters, entry)
+        return bucket, entry, deadline, bounded
+
+    def _remove(self, bucket, entry):
+        """
+        Withdraws entry from its bucket's waiters, if still there, so it no longer holds up its lane.
+        Must be called with the condition held.
+        """
+        if entry in bucket.waiters:
+            bucket.waiters.remove(entry)
+            heapq.heapify(bucket.waiters)
+            self._condition.notify_all()
+
+    def _try_acquire(self, bucket, entry, deadline, bounded):
+        """
+        Takes a token for entry if it is at the head of its lane and one is available.
+        Must be called with the condition held.
+
+        :param bounded: Whether deadline is that of an enclosing `deadline` block.
+        :return: seconds to wait before trying again, or None when the token was taken
+        """
+        now = time.monotonic()
+        bucket.refill(now)
+        if bucket.waiters[0] is entry and bucket.tokens >= 1.0:
+            heapq.heappop(bucket.waiters)
+            bucket.tokens -= 1.0
+            self._condition.notify_all()
+            return None
+
+        wait = bucket.time_until_token() or 1.0 / bucket.rate
+        if deadline is not None:
+            remaining = deadline - now
+            if remaining <= 0:
+                self._remove(bucket, entry)
+                self.timeouts += 1
+                if bounded:
+                    raise DeadlineExceeded("Deadline exceeded", sent=False)
+                raise RateLimitTimeout("Timed out waiting for a rate limit token")
+            wait = min(wait, remaining)
+        return wait
+
+    def acquire(self, url, priority=None, timeout=None):
+        """
+        Blocks until a request to url may be sent.
+
+        :param url: Full url or path of the endpoint being called.
+        :param priority: HIGH, NORMAL or LOW. Defaults to the endpoint's lane.
+        :param timeout: Seconds to wait at most. Defaults to the limiter's timeout.
+        :return: seconds spent waiting
+        """
+        bucket, entry, deadline, bounded = self._enqueue(url, priority, timeout)
+        start = time.monotonic()
+        with self._condition:
+            try:
+                while True:
+                    wait = self._try_acquire(bucket, entry, deadline, bounded)
+                    if wait is None:
+                        break
+                    self._condition.wait(wait)
+            except BaseException:
+                # e.g. KeyboardInterrupt while waiting
+                self._remove(bucket, entry)
+                raise
+        return self._record(start)
+
+    async def acquire_async(self, url, priority=None, timeout=None):
+        """
+        Coroutine counterpart of acquire, sharing the same buckets and lanes.
+
+        :param url: Full url or path of the endpoint being called.
+        :param priority: HIGH, NORMAL or LOW. Defaults to the endpoint's lane.
+        :param timeout: Seconds to wait at most. Defaults to the limiter's timeout.
+        :return: seconds spent waiting
+        """
+        bucket, entry, deadline, bounded = self._enqueue(url, priority, timeout)
+        start = time.monotonic()
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_acquire(bucket, entry, deadline, bounded)
+                if wait is None:
+                    break
+                await asyncio.sleep(wait)
+        except BaseException:
+            # e.g. the task was cancelled while waiting
+            with self._condition:
+                self._remove(bucket, entry)
+            raise
+        return self._record(start)
+
+    def _record(self, start):
+        waited = time.monotonic() - start
+        if waited > 0.0005:
+            self.waits += 1
+            self.wait_time += waited
+        return waited
+
+    def penalize(self, url, seconds):
+        """
+        Pauses the bucket of url, e.g. after the exchange answered with HTTP 429.
+
+        :param url: Full url or path of the endpoint that was rate limited.
+        :param seconds: Seconds before the next token becomes available.
+        """
+        bucket, _ = self._classify(url)
+        with self._condition:
+            bucket.refill(time.monotonic())
+            bucket.tokens = min(bucket.tokens, 1.0 - seconds * bucket.rate)
@@ -0,0 +1,195 @@
+"""
+Reference data registry: valid currency codes, order types and minimum order volumes, loaded once and validated
+against locally.
+
+The API documentation asks callers to check codes and order types against the GetValid* methods and volumes against
+GetOrderMinimumVolumes; calling them per order costs a round trip each, and skipping them means an invalid order is
+only rejected by a HTTP 400 after another round trip. ReferenceData loads all of them concurrently, keeps them in sets
+for O(1) lookups and optionally refreshes them in the background. A PrivateMethods client created with
+reference_data=... checks every order placement against it and raises ValidationError before anything is signed or
+sent.
+
+    >>> reference = ir.ReferenceData(refresh=True)
+    >>> api = ir.PrivateMethods(key, secret, reference_data=reference)
+    >>> api.place_limit_order(1000, 0.00000001)
+    ValidationError: Volume 1e-08 is below the minimum order volume 0.0001 of Xbt
+"""
+
+import threading
+import time
+
+from .batch import run_batch
+from .exceptions import IndependentReserveError, ValidationError, log_error
+from .public import PublicMethods
+
+"""
+Seconds between background refreshes. The exchange caches these endpoints for an hour.
+"""
+DEFAULT_REFERENCE_TTL = 3600
+
+"""
+Public method loaded into each attribute of ReferenceData.
+"""
+REFERENCE_METHODS = (
+    ("primary_currency_codes", "get_valid_primary_currency_codes"),
+    ("secondary_currency_codes", "get_valid_secondary_currency_codes"),
+    ("limit_order_types", "get_valid_limit_order_types"),
+    ("market_order_types", "get_valid_market_order_types"),
+    ("order_types", "get_valid_order_types"),
+    ("transaction_types", "get_valid_transaction_types"),
+    ("minimum_volumes", "get_order_minimum_volumes"),
+)
+
+
+def _codes(values):
+    return frozenset(value.lower() for value in values)
+
+
+class ReferenceData(object):
+    """
+    Locally held reference data. Codes and types are compared case insensitively.
+
+    :param public: PublicMethods, or a client with the same blocking methods.
+    :param ttl: Seconds between background refreshes.
+    :param refresh: Start the background refresh thread.
+    :param load: Load the data now. When False, load() must be called before validating.
+    """
+
+    def __init__(
+        self, public=PublicMethods, ttl=DEFAULT_REFERENCE_TTL, refresh=False, load=True
+    ):
+        self.public = public
+        self.ttl = ttl
+        self.loaded_at = None
+
+        self.primary_currency_codes = frozenset()
+        self.secondary_currency_codes = frozenset()
+        self.limit_order_types = frozenset()
+        self.market_order_types = frozenset()
+        self.order_types = frozenset()
+        self.transaction_types = frozenset()
+        self.minimum_volumes = {}
+
+        self._stop = threading.Event()
+        self._thread = None
+        if load:
+            self.load()
+        if refresh:
+            self.start()
+
+    def load(self):
+        """
+        Loads every reference endpoint concurrently. Attributes are only replaced once all calls succeeded, so a failed
+        refresh keeps the previous data.
+
+        :raise IndependentReserveError: when any of the calls failed
+        """
+        results = run_batch(
+            lambda method: getattr(self.public, method)(),
+            [method for _, method in REFERENCE_METHODS],
+            len(REFERENCE_METHODS),
+        )
+        for result in results:
+            if result.error is not None:
+                raise result.error
+
+        values = dict(
+            (attribute, result.result)
+            for (attribute, _), result in zip(REFERENCE_METHODS, results)
+        )
+        minimum_volumes = dict(
+            (code.lower(), float(volume))
+            for code, volume in values.pop("minimum_volumes").items()
+        )
+        for attribute, value in values.items():
+            setattr(self, attribute, _codes(value))
+        self.minimum_volumes = minimum_volumes
+        self.loaded_at = time.time()
+
+    def start(self):
+        """
+        Starts refreshing the data every ttl seconds on a daemon thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="independentreserve-reference", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.ttl):
+            try:
+                self.load()
+            except IndependentReserveError as error:
+                log_error(error)
+
+    def is_valid_pair(self, primary_currency_code, secondary_currency_code):
+        return (
+            primary_currency_code.lower() in self.primary_currency_codes
+            and secondary_currency_code.lower() in self.secondary_currency_codes
+        )
+
+    def minimum_volume(self, primary_currency_code):
+        """
+        :return: float minimum order volume of primary_currency_code, or None when unknown
+        """
+        return self.minimum_volumes.get(primary_currency_code.lower())
+
+    def validate_order(
+        self,
+        primary_currency_code,
+        secondary_currency_code,
+        order_type,
+        volume,
+        price=None,
+    ):
+        """
+        Checks an order placement without calling the exchange.
+
+        :param price: Limit price, None for market orders.
+        :raise ValidationError: when the exchange would reject the order
+        """
+        if self.loaded_at is None:
+            return
+        if primary_currency_code.lower() not in self.primary_currency_codes:
+            raise ValidationError(
+                "Invalid primary currency code {0!r}".format(primary_currency_code)
+            )
+        if secondary_currency_code.lower() not in self.secondary_currency_codes:
+            raise ValidationError(
+                "Invalid secondary currency code {0!r}".format(secondary_currency_code)
+            )
+        order_types = (
+            self.market_order_types if price is None else self.limit_order_types
+        )
+        if order_type.lower() not in order_types:
+            raise ValidationError("Invalid order type {0!r}".format(order_type))
+        if price is not None and float(price) <= 0:
+            raise ValidationError("Price {0} must be positive".format(price))
+        minimum = self.minimum_volume(primary_currency_code)
+        if float(volume) <= 0 or (minimum is not None and float(volume) < minimum):
+            raise ValidationError(
+                "Volume {0} is below the minimum order volume {1} of {2}".format(
+                    volume, minimum or 0, primary_currency_code
+                )
+            )
+
+    def validate_parameters(self, parameters):
+        """
+        validate_order for the bound parameters of a place_limit_order or place_market_order call.
+
+        :param parameters: List of (wire name, value) pairs.
+        """
+        parameters = dict(parameters)
+        self.validate_order(
+            parameters["primaryCurrencyCode"],
+            parameters["secondaryCurrencyCode"],
+            parameters["orderType"],
+            parameters["volume"],
+            parameters.get("price"),
+        )
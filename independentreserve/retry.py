@@ -0,0 +1,226 @@
+"""
+Retry policy for REST calls.
+
+Only failures that a retry can fix are retried, with full-jitter exponential backoff:
+
+RateLimitedError: always; the exchange did not process the request. Waits at least the requested Retry-After.
+TransportError: always when the request never reached the exchange, otherwise only for idempotent calls.
+ServerError: only for idempotent calls.
+NonceRejectedError: always; the exchange did not process the request, which is signed again with a fresh nonce.
+ValidationError / AuthenticationError: never.
+
+Placing an order is not idempotent. When a placement fails ambiguously (a 5xx or a timeout after the request was
+sent) the client first looks for the order on the exchange (see PrivateMethods._reconcile_place_limit_order) and
+returns it if it was in fact placed, so an order is never placed twice. When the order cannot be told apart from
+others, the original error is raised. Withdrawals are never retried ambiguously.
+
+A retry budget caps retries at a fraction of successful calls, so a struggling exchange is not hit with a retry storm.
+Nonce rejections, which happen when concurrently signed requests (e.g. place_orders / cancel_orders batches) reach
+the exchange out of order, are caused by the client rather than by the exchange's load and do not draw from it.
+No retry is attempted when its backoff would outlast the deadline of an enclosing `deadline` block.
+"""
+
+import asyncio
+import inspect
+import random
+import threading
+import time
+
+from . import instrumentation
+from .deadline import remaining
+from .endpoints import PRIVATE_ENDPOINTS
+from .exceptions import (
+    NonceRejectedError,
+    RateLimitedError,
+    ServerError,
+    TransportError,
+)
+
+"""
+Errors the policy may retry; any other error is raised at once.
+"""
+RETRIED_ERRORS = (NonceRejectedError, RateLimitedError, ServerError, TransportError)
+
+"""
+Returned by a reconcile callable when the call may have taken effect but its result cannot be identified; the
+original error is then raised rather than retried.
+"""
+AMBIGUOUS = object()
+
+"""
+Methods whose repetition could have a different effect than a single call.
+"""
+NON_IDEMPOTENT = frozenset(
+    endpoint.name for endpoint in PRIVATE_ENDPOINTS if not endpoint.idempotent
+)
+
+
+class RetryPolicy(object):
+    """
+    :param max_attempts: Maximum number of attempts per call, including the first one.
+    :param nonce_attempts: Maximum number of attempts per call when the last one failed with NonceRejectedError.
+                           Every request of a large concurrent batch may be overtaken more than once, so this is
+                           higher than max_attempts.
+    :param backoff_initial: Upper bound in seconds of the delay before the first retry.
+    :param backoff_max: Upper bound in seconds of any delay.
+    :param budget_ratio: Retry tokens earned per successful call.
+    :param budget_max: Maximum retry tokens that can be banked; also the initial balance.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        nonce_attempts=10,
+        backoff_initial=0.05,
+        backoff_max=2.0,
+        budget_ratio=0.1,
+        budget_max=10.0,
+    ):
+        self.max_attempts = max_attempts
+        self.nonce_attempts = nonce_attempts
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.budget_ratio = budget_ratio
+        self.budget_max = budget_max
+
+        self.retries = 0
+        self.reconciled = 0
+        self.budget_exhausted = 0
+
+        self._budget = float(budget_max)
+        self._lock = threading.Lock()
+
+    def _deposit(self):
+        with self._lock:
+            self._budget = min(self.budget_max, self._budget + self.budget_ratio)
+
+    def _withdraw(self, budgeted=True):
+        with self._lock:
+            if not budgeted:
+                self.retries += 1
+                return True
+            if self._budget < 1.0:
+                self.budget_exhausted += 1
+                return False
+            self._budget -= 1.0
+            self.retries += 1
+            return True
+
+    @staticmethod
+    def _ambiguous(error):
+        return isinstance(error, ServerError) or (
+            isinstance(error, TransportError) and error.sent
+        )
+
+    def retryable(self, error, idempotent):
+        """
+        :param error: IndependentReserveError raised by the attempt.
+        :param idempotent: Whether repeating the call is harmless.
+        :return: bool
+        """
+        if isinstance(error, (RateLimitedError, NonceRejectedError)):
+            return True
+        if isinstance(error, TransportError) and not error.sent:
+            return True
+        return idempotent and self._ambiguous(error)
+
+    def delay(self, attempt, error):
+        """
+        :param attempt: Number of attempts made so far.
+        :param error: Error raised by the last attempt.
+        :return: seconds to wait before the next attempt
+        """
+        delay = random.uniform(
+            0, min(self.backoff_max, self.backoff_initial * 2 ** (attempt - 1))
+        )
+        if isinstance(error, RateLimitedError):
+            delay = max(delay, error.retry_after)
+        return delay
+
+    def _next(self, error, attempt, idempotent):
+        if not self.retryable(error, idempotent):
+            return None
+        nonce = isinstance(error, NonceRejectedError)
+        if attempt >= (self.nonce_attempts if nonce else self.max_attempts):
+            return None
+        delay = self.delay(attempt, error)
+        left = remaining()
+        if left is not None and delay >= left:
+            return None
+        if not self._withdraw(budgeted=not nonce):
+            return None
+        return delay
+
+    def call(self, attempt, name=None, reconcile=None, idempotent=None):
+        """
+        Runs attempt until it succeeds or the error is not worth retrying.
+
+        :param attempt: Callable performing one attempt.
+        :param name: Method name, used to decide idempotency.
+        :param reconcile: Optional callable returning the result of a non-idempotent call that failed ambiguously but
+                          took effect anyway, None when it did not take effect and may safely be repeated, or
+                          AMBIGUOUS when that cannot be told.
+        :param idempotent: Overrides the idempotency derived from name.
+        :return: result of attempt
+        """
+        if idempotent is None:
+            idempotent = name not in NON_IDEMPOTENT
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                result = attempt()
+            except RETRIED_ERRORS as error:
+                retry_idempotent = idempotent
+                if not idempotent and reconcile is not None and self._ambiguous(error):
+                    found = reconcile()
+                    if found is AMBIGUOUS:
+                        raise
+                    if found is not None:
+                        self.reconciled += 1
+                        return found
+                    retry_idempotent = True
+                wait = self._next(error, attempts, retry_idempotent)
+                if wait is None:
+                    raise
+                hooks = instrumentation._active
+                if hooks is not None:
+                    hooks.retry(name, attempts, error, wait)
+                time.sleep(wait)
+                continue
+            self._deposit()
+            return result
+
+    async def call_async(self, attempt, name=None, reconcile=None, idempotent=None):
+        """
+        Coroutine counterpart of call; attempt and reconcile are coroutine functions.
+        """
+        if idempotent is None:
+            idempotent = name not in NON_IDEMPOTENT
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                result = await attempt()
+            except RETRIED_ERRORS as error:
+                retry_idempotent = idempotent
+                if not idempotent and reconcile is not None and self._ambiguous(error):
+                    found = reconcile()
+                    if inspect.isawaitable(found):
+                        found = await found
+                    if found is AMBIGUOUS:
+                        raise
+                    if found is not None:
+                        self.reconciled += 1
+                        return found
+                    retry_idempotent = True
+                wait = self._next(error, attempts, retry_idempotent)
+                if wait is None:
+                    raise
+                hooks = instrumentation._active
+                if hooks is not None:
+                    hooks.retry(name, attempts, error, wait)
+                await asyncio.sleep(wait)
+                continue
+            self._deposit()
+            return result
@@ -0,0 +1,140 @@
+"""
+Concurrent snapshot of many markets at once.
+
+The market data methods take one currency pair per call, so refreshing every pair one call after another costs one
+round trip per pair and data type. snapshot_markets issues all of those calls concurrently over the pooled transport,
+bounded by a concurrency limit, and completes in roughly the time of the slowest call.
+
+    >>> markets = ir.snapshot_markets(include=(ir.SUMMARY, ir.BOOK))
+    >>> markets[("Xbt", "Aud")].summary["LastPrice"]
+"""
+
+import itertools
+
+from .batch import arun_batch, run_batch
+from .public import PublicMethods
+
+SUMMARY = "summary"
+BOOK = "book"
+TRADES = "trades"
+
+"""
+Public method called for each data type of a snapshot.
+"""
+SNAPSHOT_METHODS = {
+    SUMMARY: "get_market_summary",
+    BOOK: "get_order_book",
+    TRADES: "get_recent_trades",
+}
+
+
+class MarketSnapshot(object):
+    """
+    Data retrieved for one currency pair. Data types that were not requested, or whose call failed, are None.
+
+    :param primary_currency_code: Digital currency of the pair.
+    :param secondary_currency_code: Fiat currency of the pair.
+    """
+
+    __slots__ = (
+        "primary_currency_code",
+        "secondary_currency_code",
+        "summary",
+        "book",
+        "trades",
+        "errors",
+    )
+
+    def __init__(self, primary_currency_code, secondary_currency_code):
+        self.primary_currency_code = primary_currency_code
+        self.secondary_currency_code = secondary_currency_code
+        self.summary = None
+        self.book = None
+        self.trades = None
+        self.errors = {}
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def __repr__(self):
+        return "MarketSnapshot({0}/{1}, errors={2!r})".format(
+            self.primary_currency_code, self.secondary_currency_code, self.errors
+        )
+
+
+def all_pairs(public=PublicMethods):
+    """
+    :param public: PublicMethods, or a client with the same blocking methods.
+    :return: list of every (primary, secondary) combination of the valid currency codes
+    """
+    return list(
+        itertools.product(
+            public.get_valid_primary_currency_codes(),
+            public.get_valid_secondary_currency_codes(),
+        )
+    )
+
+
+def _requests(pairs, include):
+    for kind in include:
+        if kind not in SNAPSHOT_METHODS:
+            raise ValueError("Unknown snapshot data type {0!r}".format(kind))
+    return [(pair, kind) for pair in pairs for kind in include]
+
+
+def _combine(pairs, results):
+    snapshots = dict((pair, MarketSnapshot(*pair)) for pair in pairs)
+    for result in results:
+        pair, kind = result.request
+        snapshot = snapshots[pair]
+        if result.error is not None:
+            snapshot.errors[kind] = result.error
+        else:
+            setattr(snapshot, kind, result.result)
+    return snapshots
+
+
+def snapshot_markets(
+    pairs=None, include=(SUMMARY, BOOK, TRADES), max_workers=16, public=PublicMethods
+):
+    """
+    Retrieves market data for many currency pairs concurrently.
+
+    :param pairs: Iterable of (primary, secondary) currency code tuples. Defaults to every valid combination.
+    :param include: Data types to retrieve: any of SUMMARY, BOOK and TRADES.
+    :param max_workers: Maximum number of calls in flight. Keep it at most the transport's pool_maxsize so that every
+                        call reuses a pooled connection.
+    :param public: PublicMethods, or a client with the same blocking methods.
+    :return: dict of (primary, secondary) to MarketSnapshot, in the order of pairs
+    """
+    pairs = all_pairs(public) if pairs is None else [tuple(pair) for pair in pairs]
+    results = run_batch(
+        lambda request: getattr(public, SNAPSHOT_METHODS[request[1]])(*request[0]),
+        _requests(pairs, include),
+        max_workers,
+    )
+    return _combine(pairs, results)
+
+
+async def snapshot_markets_async(
+    public, pairs=None, include=(SUMMARY, BOOK, TRADES), max_concurrency=32
+):
+    """
+    Coroutine counterpart of snapshot_markets for AsyncPublicMethods.
+
+    :param public: AsyncPublicMethods
+    :return: dict of (primary, secondary) to MarketSnapshot, in the order of pairs
+    """
+    if pairs is None:
+        primary = await public.get_valid_primary_currency_codes()
+        secondary = await public.get_valid_secondary_currency_codes()
+        pairs = list(itertools.product(primary, secondary))
+    else:
+        pairs = [tuple(pair) for pair in pairs]
+
+    async def call(request):
+        return await getattr(public, SNAPSHOT_METHODS[request[1]])(*request[0])
+
+    results = await arun_batch(call, _requests(pairs, include), max_concurrency)
+    return _combine(pairs, results)
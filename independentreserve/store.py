@@ -0,0 +1,349 @@
+"""
+Local persistent store of hourly candles and trades, kept current incrementally.
+
+get_trade_history_summary re-sends its whole window on every call and get_recent_trades only returns the last 50
+trades, so history that is not captured is lost. MarketStore keeps both in a SQLite database, one row per hourly
+bucket and per trade:
+
+- sync_candles only requests the hours since the newest stored bucket (re-reading that bucket, which may have been
+  partial when stored).
+- sync_trades stores the latest REST trades, and apply() stores Trade messages from the websocket ticker channels as
+  they arrive.
+- candles() and trades() serve time range queries from disk as Candles and TradeTape columns.
+
+Distinct trades can share their timestamp, price and amount, e.g. the fills of one order split against several resting
+orders at the same price, so these are not a key. REST trades carry no identifier: a fetch only skips the trades
+already stored within the time range it covers, as many of each (timestamp, price, amount) as are stored, so the
+trades of a fetch that overlaps the previous one are stored once and identical fills are all kept. Websocket trades
+are keyed on their TradeGuid, and take over the row of the same trade when a REST fetch stored it first.
+
+Currency codes are stored capitalised ("Xbt", "Aud") and may be given in any case.
+
+    >>> store = ir.MarketStore("market.db")
+    >>> store.sync_candles("Xbt", "Aud")
+    >>> candles = store.candles("Xbt", "Aud", start=datetime(2019, 1, 1))
+"""
+
+import sqlite3
+import threading
+from array import array
+from collections import Counter
+from datetime import datetime
+
+from .columns import _NAN, Candles, TradeTape, epoch_microseconds
+from .events import Event, loads
+from .public import PublicMethods
+
+"""
+Longest window get_trade_history_summary is asked for, in hours, when the store holds no candles for a pair yet.
+"""
+DEFAULT_HISTORY_HOURS = 240
+
+HOUR = 3600 * 1000000
+
+_EPOCH = datetime(1970, 1, 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    primary_currency TEXT NOT NULL,
+    secondary_currency TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    "end" INTEGER NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    average REAL,
+    volume REAL,
+    secondary_volume REAL,
+    trades INTEGER,
+    PRIMARY KEY (primary_currency, secondary_currency, start)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS trades (
+    primary_currency TEXT NOT NULL,
+    secondary_currency TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    price REAL NOT NULL,
+    amount REAL NOT NULL,
+    guid TEXT,
+    side TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_time ON trades (primary_currency, secondary_currency, timestamp);
+CREATE UNIQUE INDEX IF NOT EXISTS trades_guid ON trades (guid) WHERE guid IS NOT NULL;
+"""
+
+
+def _microseconds(value):
+    """
+    :param value: naive UTC datetime, or int microseconds since the Unix epoch.
+    :return: int microseconds since the Unix epoch, None for None
+    """
+    if value is None or isinstance(value, int):
+        return value
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _pair(primary_currency_code, secondary_currency_code):
+    """
+    :return: tuple of the currency codes as stored, e.g. ("Xbt", "Aud")
+    """
+    return primary_currency_code.capitalize(), secondary_currency_code.capitalize()
+
+
+class MarketStore(object):
+    """
+    SQLite store of hourly candles and trades for any number of currency pairs. Safe to share between threads.
+
+    :param path: Database file, created if missing. ":memory:" for a store that is not persisted.
+    :param get_candles: Callable (primary, secondary, hours) returning Candles. Defaults to PublicMethods.get_candles.
+    :param get_trade_tape: Callable (primary, secondary, number_of_trades) returning a TradeTape. Defaults to
+                           PublicMethods.get_trade_tape.
+    """
+
+    def __init__(self, path, get_candles=None, get_trade_tape=None):
+        self.path = path
+        self._get_candles = (
+            get_candles if get_candles is not None else PublicMethods.get_candles
+        )
+        self._get_trade_tape = (
+            get_trade_tape
+            if get_trade_tape is not None
+            else PublicMethods.get_trade_tape
+        )
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, statement, rows):
+        with self._lock, self._connection:
+            before = self._connection.total_changes
+            self._connection.executemany(statement, rows)
+            return self._connection.total_changes - before
+
+    def _read(self, statement, parameters):
+        with self._lock:
+            return self._connection.execute(statement, parameters).fetchall()
+
+    def last_candle_start(self, primary_currency_code, secondary_currency_code):
+        """
+        :return: int start of the newest stored bucket in microseconds since the Unix epoch, or None
+        """
+        rows = self._read(
+            "SELECT MAX(start) FROM candles WHERE primary_currency = ? AND secondary_currency = ?",
+            _pair(primary_currency_code, secondary_currency_code),
+        )
+        return rows[0][0]
+
+    def sync_candles(
+        self,
+        primary_currency_code="Xbt",
+        secondary_currency_code="Aud",
+        max_hours=DEFAULT_HISTORY_HOURS,
+    ):
+        """
+        Fetches the hourly buckets missing since the newest stored one.
+
+        :param max_hours: Window requested when the pair has no stored candles, and upper bound of any request.
+        :return: int number of buckets inserted or updated
+        """
+        last = self.last_candle_start(primary_currency_code, secondary_currency_code)
+        hours = max_hours
+        if last is not None:
+            elapsed = _microseconds(datetime.utcnow()) - last
+            hours = min(max_hours, max(1, -(-elapsed // HOUR)) + 1)
+        return self.add_candles(
+            primary_currency_code,
+            secondary_currency_code,
+            self._get_candles(primary_currency_code, secondary_currency_code, hours),
+        )
+
+    def add_candles(self, primary_currency_code, secondary_currency_code, candles):
+        """
+        Stores candles, replacing stored buckets with the same start.
+
+        :param candles: Candles
+        :return: int number of buckets inserted or updated
+        """
+        pair = _pair(primary_currency_code, secondary_currency_code)
+        return self._write(
+            "INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                pair + row
+                for row in zip(
+                    *(getattr(candles, column[0]) for column in Candles.columns)
+                )
+            ],
+        )
+
+    def sync_trades(
+        self, primary_currency_code="Xbt", secondary_currency_code="Aud", number=50
+    ):
+        """
+        Fetches the latest trades through REST.
+
+        :param number: Number of recent trades requested, at most 50.
+        :return: int number of trades not stored before
+        """
+        return self.add_trades(
+            primary_currency_code,
+            secondary_currency_code,
+            self._get_trade_tape(
+                primary_currency_code, secondary_currency_code, number
+            ),
+        )
+
+    def add_trades(self, primary_currency_code, secondary_currency_code, tape):
+        """
+        Stores the trades of a TradeTape, skipping those already stored within the time range it covers.
+
+        :param tape: TradeTape
+        :return: int number of trades not stored before
+        """
+        pair = _pair(primary_currency_code, secondary_currency_code)
+        rows = sorted(zip(tape.timestamp, tape.price, tape.amount))
+        if not rows:
+            return 0
+        with self._lock, self._connection:
+            stored = Counter(
+                self._connection.execute(
+                    "SELECT timestamp, price, amount FROM trades WHERE primary_currency = ? AND secondary_currency = ?"
+                    " AND timestamp BETWEEN ? AND ?",
+                    pair + (rows[0][0], rows[-1][0]),
+                )
+            )
+            new = []
+            for row in rows:
+                if stored[row]:
+                    stored[row] -= 1
+                else:
+                    new.append(pair + row)
+            self._connection.executemany(
+                "INSERT INTO trades VALUES (?, ?, ?, ?, ?, NULL, NULL)", new
+            )
+        return len(new)
+
+    def apply(self, message):
+        """
+        Stores a Trade message of a ticker channel; other messages are ignored.
+
+        :param message: TradeEvent, decoded dict, or the raw str/bytes received from the websocket.
+        :return: bool, True when the trade was not stored before
+        """
+        if isinstance(message, Event):
+            event, data = message.event, message.data
+        else:
+            if isinstance(message, (bytes, str)):
+                message = loads(message)
+            event, data = message.get("Event"), message.get("Data") or {}
+        if event != "Trade" or not data.get("Pair") or not data.get("TradeDate"):
+            return False
+        primary, _, secondary = data["Pair"].partition("-")
+        trade = _pair(primary, secondary) + (
+            epoch_microseconds(data["TradeDate"]),
+            data["Price"],
+            data["Volume"],
+        )
+        guid, side = data.get("TradeGuid"), data.get("Side")
+        with self._lock, self._connection:
+            if guid is not None:
+                if self._connection.execute(
+                    "SELECT 1 FROM trades WHERE guid = ?", (guid,)
+                ).fetchone():
+                    return False
+                # stored by a REST fetch, which has no guid
+                if self._connection.execute(
+                    "UPDATE trades SET guid = ?, side = ? WHERE rowid = (SELECT rowid FROM trades"
+                    " WHERE primary_currency = ? AND secondary_currency = ? AND timestamp = ? AND price = ?"
+                    " AND amount = ? AND guid IS NULL LIMIT 1)",
+                    (guid, side) + trade,
+                ).rowcount:
+                    return False
+            self._connection.execute(
+                "INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?, ?)", trade + (guid, side)
+            )
+        return True
+
+    def _range(self, table, view, order, pair, start, end):
+        statement = "SELECT {0} FROM {1} WHERE primary_currency = ? AND secondary_currency = ?".format(
+            ", ".join('"{0}"'.format(column[0]) for column in view.columns), table
+        )
+        parameters = list(_pair(*pair))
+        if start is not None:
+            statement += " AND {0} >= ?".format(order)
+            parameters.append(_microseconds(start))
+        if end is not None:
+            statement += " AND {0} < ?".format(order)
+            parameters.append(_microseconds(end))
+        statement += " ORDER BY " + order
+        if table == "trades":
+            # keeps trades of the same timestamp in the order they were stored
+            statement += ", rowid"
+        return self._read(statement, parameters)
+
+    def candles(
+        self,
+        primary_currency_code="Xbt",
+        secondary_currency_code="Aud",
+        start=None,
+        end=None,
+    ):
+        """
+        :param start: Optional naive UTC datetime (or epoch microseconds) of the first bucket start included.
+        :param end: Optional naive UTC datetime (or epoch microseconds) of the first bucket start excluded.
+        :return: Candles, oldest first
+        """
+        rows = self._range(
+            "candles",
+            Candles,
+            "start",
+            (primary_currency_code, secondary_currency_code),
+            start,
+            end,
+        )
+        return _columns(Candles, rows)
+
+    def trades(
+        self,
+        primary_currency_code="Xbt",
+        secondary_currency_code="Aud",
+        start=None,
+        end=None,
+    ):
+        """
+        :param start: Optional naive UTC datetime (or epoch microseconds) of the first trade included.
+        :param end: Optional naive UTC datetime (or epoch microseconds) of the first trade excluded.
+        :return: TradeTape, oldest first
+        """
+        rows = self._range(
+            "trades",
+            TradeTape,
+            "timestamp",
+            (primary_currency_code, secondary_currency_code),
+            start,
+            end,
+        )
+        return _columns(TradeTape, rows)
+
+
+def _columns(cls, rows):
+    columns = list(zip(*rows)) or [()] * len(cls.columns)
+    view = cls()
+    for (attribute, _, typecode), values in zip(cls.columns, columns):
+        if typecode == "d":
+            # SQLite stores NaN as NULL
+            values = [_NAN if value is None else value for value in values]
+        setattr(view, attribute, array(typecode, values))
+    return view
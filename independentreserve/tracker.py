@@ -0,0 +1,371 @@
+"""
+Order lifecycle tracking without per-order polling.
+
+Following an order used to mean calling get_order_details for it again and again, one signed request per order per
+poll. OrderTracker records every order placed through it and keeps its state from, in order of preference:
+
+1. websocket messages: Trade messages of the ticker channels carry the BidGuid and OfferGuid of both orders, and
+   OrderChanged / OrderCanceled messages of the orderbook channels carry the OrderGuid and remaining Volume;
+2. sweep(), the polling fallback: one GetOpenOrders page walk per currency pair for all tracked orders at once, then
+   GetClosedOrders for the orders no longer open, and only then get_order_details for any order still unresolved.
+
+States follow the exchange's Status values: Open -> PartiallyFilled -> Filled, or one of the cancelled / expired
+statuses. An order removed from the book before it filled is marked Cancelled from the websocket but left unconfirmed:
+the removal may be an expiry, or a fill whose Trade message has not arrived yet, so later trades and the next sweep()
+can still correct it.
+
+    >>> tracker = ir.OrderTracker(api, on_change=lambda order, previous: print(order))
+    >>> tracker.place_limit_order(price=1000, volume=0.1)
+    >>> # feed websocket messages to tracker.apply(message), or call tracker.sweep() periodically
+"""
+
+import threading
+import time
+
+from .events import Event, loads
+
+OPEN = "Open"
+PARTIALLY_FILLED = "PartiallyFilled"
+FILLED = "Filled"
+CANCELLED = "Cancelled"
+PARTIALLY_FILLED_AND_CANCELLED = "PartiallyFilledAndCancelled"
+EXPIRED = "Expired"
+PARTIALLY_FILLED_AND_EXPIRED = "PartiallyFilledAndExpired"
+
+"""
+Statuses after which an order can no longer change.
+"""
+TERMINAL_STATUSES = frozenset(
+    [
+        FILLED,
+        CANCELLED,
+        PARTIALLY_FILLED_AND_CANCELLED,
+        EXPIRED,
+        PARTIALLY_FILLED_AND_EXPIRED,
+    ]
+)
+
+"""
+Volumes closer than this are considered equal; amounts have 8 decimal places.
+"""
+_VOLUME_EPSILON = 0.5e-8
+
+"""
+Pages of GetClosedOrders searched per currency pair by sweep() for orders that left the open orders.
+"""
+CLOSED_PAGES_SEARCHED = 2
+
+
+class TrackedOrder(object):
+    """
+    Last known state of one order.
+    """
+
+    __slots__ = (
+        "order_guid",
+        "primary_currency_code",
+        "secondary_currency_code",
+        "order_type",
+        "price",
+        "volume",
+        "filled",
+        "status",
+        "confirmed",
+        "updated",
+        "_traded",
+        "_trades",
+    )
+
+    def __init__(
+        self,
+        order_guid,
+        primary_currency_code,
+        secondary_currency_code,
+        order_type,
+        price,
+        volume,
+        filled=0.0,
+        status=OPEN,
+    ):
+        self.order_guid = order_guid
+        self.primary_currency_code = primary_currency_code
+        self.secondary_currency_code = secondary_currency_code
+        self.order_type = order_type
+        self.price = price
+        self.volume = volume
+        self.filled = filled
+        self.status = status
+        self.confirmed = False
+        self.updated = time.time()
+        self._traded = 0.0
+        self._trades = set()
+
+    @property
+    def outstanding(self):
+        return max(0.0, self.volume - self.filled)
+
+    @property
+    def done(self):
+        """
+        True once the order is in a terminal status. The status is final when confirmed is also True.
+        """
+        return self.status in TERMINAL_STATUSES
+
+    def __repr__(self):
+        return "TrackedOrder({0}, {1} {2}/{3}, status={4})".format(
+            self.order_guid, self.order_type, self.filled, self.volume, self.status
+        )
+
+
+def _order_fields(order):
+    """
+    Normalises a place_*/get_order_details response, as a dict or Order model.
+
+    :return: (guid, primary, secondary, type, price, volume ordered, volume filled, status)
+    """
+    if isinstance(order, dict):
+        return (
+            order["OrderGuid"],
+            order.get("PrimaryCurrencyCode"),
+            order.get("SecondaryCurrencyCode"),
+            order.get("Type"),
+            order.get("Price"),
+            float(order.get("VolumeOrdered") or 0),
+            float(order.get("VolumeFilled") or 0),
+            order.get("Status") or OPEN,
+        )
+    return (
+        order.order_guid,
+        order.primary_currency_code,
+        order.secondary_currency_code,
+        order.type,
+        order.price,
+        float(order.volume_ordered or 0),
+        float(order.volume_filled or 0),
+        order.status or OPEN,
+    )
+
+
+class OrderTracker(object):
+    """
+    In-memory state of the orders placed through it. Safe to use from several threads.
+
+    :param client: PrivateMethods used to place orders and by sweep().
+    :param on_change: Optional callable (TrackedOrder, previous status) called after an order's status or filled
+                      volume changed.
+    """
+
+    def __init__(self, client, on_change=None):
+        self.client = client
+        self.on_change = on_change
+        self._orders = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._orders)
+
+    def __contains__(self, order_guid):
+        return order_guid in self._orders
+
+    def get(self, order_guid):
+        """
+        :return: TrackedOrder, or None when order_guid is not tracked
+        """
+        return self._orders.get(order_guid)
+
+    def open_orders(self):
+        """
+        :return: list of TrackedOrder not yet in a terminal status
+        """
+        with self._lock:
+            return [order for order in self._orders.values() if not order.done]
+
+    def prune(self):
+        """
+        Stops tracking orders in a terminal status.
+
+        :return: list of the TrackedOrder removed
+        """
+        with self._lock:
+            done = [order for order in self._orders.values() if order.done]
+            for order in done:
+                del self._orders[order.order_guid]
+            return done
+
+    def place_limit_order(self, *args, **kwargs):
+        """
+        client.place_limit_order, tracking the order placed.
+        """
+        result = self.client.place_limit_order(*args, **kwargs)
+        self.track(result)
+        return result
+
+    def place_market_order(self, *args, **kwargs):
+        """
+        client.place_market_order, tracking the order placed.
+        """
+        result = self.client.place_market_order(*args, **kwargs)
+        self.track(result)
+        return result
+
+    def cancel_order(self, order_guid):
+        """
+        client.cancel_order, updating the tracked order.
+        """
+        result = self.client.cancel_order(order_guid)
+        self.track(result)
+        return result
+
+    def track(self, order):
+        """
+        Starts tracking an order, or updates it from a newer response.
+
+        :param order: dict or Order as returned by place_limit_order, place_market_order or get_order_details.
+        :return: TrackedOrder
+        """
+        guid, primary, secondary, order_type, price, volume, filled, status = (
+            _order_fields(order)
+        )
+        with self._lock:
+            tracked = self._orders.get(guid)
+            if tracked is None:
+                tracked = TrackedOrder(
+                    guid, primary, secondary, order_type, price, volume
+                )
+                self._orders[guid] = tracked
+            self._update(tracked, filled, status, confirmed=True)
+            return tracked
+
+    def _update(self, tracked, filled, status=None, confirmed=False):
+        """
+        Moves tracked forward; a state is never moved back by a stale message.
+
+        :param status: Terminal status reported for the order, if any.
+        :param confirmed: Whether status was reported by the exchange rather than inferred from the websocket.
+        """
+        if tracked.done and tracked.confirmed:
+            return False
+        previous_status, previous_filled = tracked.status, tracked.filled
+        tracked.filled = min(max(filled, tracked.filled), tracked.volume)
+        if status in TERMINAL_STATUSES and confirmed:
+            tracked.status, tracked.confirmed = status, True
+        elif tracked.volume - tracked.filled <= _VOLUME_EPSILON:
+            tracked.status, tracked.confirmed = FILLED, True
+        elif status in TERMINAL_STATUSES:
+            tracked.status = status
+        elif tracked.status == CANCELLED and tracked.filled > 0:
+            tracked.status = PARTIALLY_FILLED_AND_CANCELLED
+        elif not tracked.done and tracked.filled > 0:
+            tracked.status = PARTIALLY_FILLED
+        if tracked.status == previous_status and tracked.filled == previous_filled:
+            return False
+        tracked.updated = time.time()
+        if self.on_change is not None:
+            self.on_change(tracked, previous_status)
+        return True
+
+    def apply(self, message):
+        """
+        Updates tracked orders from one websocket message. Messages about other orders are ignored cheaply.
+
+        :param message: Event, decoded dict, or the raw str/bytes received from the websocket.
+        :return: bool, True when a tracked order changed
+        """
+        if isinstance(message, Event):
+            event, data = message.event, message.data
+        else:
+            if isinstance(message, (bytes, str)):
+                message = loads(message)
+            event, data = message.get("Event"), message.get("Data") or {}
+
+        with self._lock:
+            if event == "Trade":
+                changed = False
+                for key in ("BidGuid", "OfferGuid"):
+                    tracked = self._orders.get(data.get(key))
+                    if tracked is not None:
+                        changed = self._apply_trade(tracked, data) or changed
+                return changed
+
+            tracked = self._orders.get(data.get("OrderGuid"))
+            if tracked is None:
+                return False
+            if event == "OrderChanged" and data.get("Volume") is not None:
+                return self._update(tracked, tracked.volume - float(data["Volume"]))
+            if event == "OrderCanceled":
+                status = PARTIALLY_FILLED_AND_CANCELLED if tracked.filled else CANCELLED
+                return self._update(tracked, tracked.filled, status)
+            return False
+
+    def _apply_trade(self, tracked, data):
+        trade = data.get("TradeGuid")
+        if trade is not None:
+            if trade in tracked._trades:
+                return False
+            tracked._trades.add(trade)
+        tracked._traded += float(data.get("Volume") or 0)
+        return self._update(tracked, tracked._traded)
+
+    def sweep(self):
+        """
+        Polling fallback: refreshes every open or unconfirmed tracked order with one GetOpenOrders page walk per currency pair, then
+        GetClosedOrders for orders that are no longer open, and get_order_details only for orders found in neither.
+
+        :return: int number of signed requests sent
+        """
+        with self._lock:
+            pairs = {}
+            for order in self._orders.values():
+                if not (order.done and order.confirmed):
+                    pairs.setdefault(
+                        (order.primary_currency_code, order.secondary_currency_code),
+                        set(),
+                    ).add(order.order_guid)
+
+        requests = 0
+        for pair, guids in pairs.items():
+            missing, sent = self._sweep_pages("get_open_orders", pair, guids, None)
+            requests += sent
+            if missing:
+                missing, sent = self._sweep_pages(
+                    "get_closed_orders", pair, missing, CLOSED_PAGES_SEARCHED
+                )
+                requests += sent
+            for guid in missing:
+                self.track(self.client._raw("get_order_details", guid))
+                requests += 1
+        return requests
+
+    def _sweep_pages(self, name, pair, guids, max_pages):
+        """
+        Walks the pages of an order list endpoint, updating the tracked orders found in it.
+
+        :return: (set of guids not found, number of requests sent)
+        """
+        missing = set(guids)
+        closed = name != "get_open_orders"
+        page_index, total_pages = 1, 1
+        while missing and page_index <= total_pages:
+            if max_pages is not None and page_index > max_pages:
+                break
+            page = self.client._raw(name, pair[0], pair[1], page_index, 50)
+            total_pages = page.get("TotalPages") or 0
+            for summary in page["Data"]:
+                guid = summary["OrderGuid"]
+                if guid not in missing:
+                    continue
+                missing.discard(guid)
+                with self._lock:
+                    tracked = self._orders.get(guid)
+                    if tracked is not None:
+                        filled = float(summary["Volume"]) - float(
+                            summary.get("Outstanding") or 0
+                        )
+                        self._update(
+                            tracked,
+                            filled,
+                            summary.get("Status") if closed else None,
+                            confirmed=closed,
+                        )
+            page_index += 1
+        return missing, page_index - 1
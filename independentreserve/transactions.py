@@ -0,0 +1,191 @@
+"""
+Incremental sync of account transactions into a local SQLite store.
+
+Downloading an account's full GetTransactions history every time takes one signed request per 50 transactions.
+TransactionSync keeps a watermark per account, the creation time of the newest transaction stored, and each sync only
+requests transactions created since then, in a window fixed when the sync starts so that pages cannot shift while
+they are read. Transactions are stored under a key derived from their content, so those returned again (the window
+overlaps the watermark, and a lookback re-reads recent transactions whose status may still change) are updated rather
+than duplicated.
+
+    >>> sync = ir.TransactionSync(api, "transactions.db")
+    >>> sync.sync(account_guid)
+    >>> sync.transactions(account_guid, start=datetime(2019, 7, 1))
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from .columns import epoch_microseconds
+from .store import _microseconds
+
+"""
+Fields identifying a transaction when the exchange does not return a TransactionId. Balance is the running balance
+after the transaction, which makes transactions with otherwise identical fields distinct.
+"""
+TRANSACTION_KEY_FIELDS = (
+    "CreatedTimestampUtc",
+    "TransactionType",
+    "CurrencyCode",
+    "Credit",
+    "Debit",
+    "Balance",
+    "BitcoinTransactionId",
+    "BitcoinTransactionOutputIndex",
+    "EthereumTransactionId",
+)
+
+"""
+How far before the watermark each sync starts, to pick up status changes of recent transactions (e.g. deposits
+being confirmed).
+"""
+DEFAULT_LOOKBACK = timedelta(hours=1)
+
+_EPOCH = datetime(1970, 1, 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    account_guid TEXT NOT NULL,
+    transaction_key TEXT NOT NULL,
+    created INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (account_guid, transaction_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS transactions_created ON transactions (account_guid, created);
+CREATE TABLE IF NOT EXISTS watermarks (
+    account_guid TEXT PRIMARY KEY,
+    created INTEGER NOT NULL
+);
+"""
+
+
+def transaction_key(transaction):
+    """
+    :param transaction: Decoded GetTransactions item.
+    :return: str identifying the transaction
+    """
+    if transaction.get("TransactionId") is not None:
+        return str(transaction["TransactionId"])
+    return json.dumps([transaction.get(field) for field in TRANSACTION_KEY_FIELDS])
+
+
+class TransactionSync(object):
+    """
+    Local store of the transactions of any number of accounts. Safe to share between threads.
+
+    :param client: PrivateMethods used to read transactions.
+    :param path: Database file, created if missing. ":memory:" for a store that is not persisted.
+    :param transaction_types: Transaction types synced; None for all of them. Use the same types for the lifetime of
+                              a store, since the watermark does not depend on them.
+    :param lookback: timedelta re-read before the watermark on each sync.
+    """
+
+    def __init__(
+        self,
+        client,
+        path,
+        transaction_types=None,
+        lookback=DEFAULT_LOOKBACK,
+    ):
+        self.client = client
+        self.path = path
+        self.transaction_types = transaction_types
+        self.lookback = lookback
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def watermark(self, account_guid):
+        """
+        :return: naive UTC datetime of the newest stored transaction of the account, or None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT created FROM watermarks WHERE account_guid = ?",
+                (account_guid,),
+            ).fetchone()
+        if row is None:
+            return None
+        return _EPOCH + timedelta(microseconds=row[0])
+
+    def sync(self, account_guid, until=None):
+        """
+        Fetches and stores the transactions created since the watermark.
+
+        :param until: Optional naive UTC datetime ending the window; defaults to now.
+        :return: int number of transactions stored for the first time
+        """
+        until = datetime.utcnow() if until is None else until
+        watermark = self.watermark(account_guid)
+        since = _EPOCH if watermark is None else watermark - self.lookback
+
+        rows = []
+        newest = None
+        for transaction in self.client.iter_transactions(
+            account_guid, since, until, self.transaction_types
+        ):
+            created = epoch_microseconds(transaction["CreatedTimestampUtc"])
+            if newest is None or created > newest:
+                newest = created
+            rows.append(
+                (
+                    account_guid,
+                    transaction_key(transaction),
+                    created,
+                    json.dumps(transaction, sort_keys=True),
+                )
+            )
+
+        with self._lock, self._connection:
+            before = self._connection.execute(
+                "SELECT COUNT(*) FROM transactions WHERE account_guid = ?",
+                (account_guid,),
+            ).fetchone()[0]
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?)", rows
+            )
+            if newest is not None:
+                if watermark is not None:
+                    newest = max(newest, _microseconds(watermark))
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO watermarks VALUES (?, ?)",
+                    (account_guid, newest),
+                )
+            after = self._connection.execute(
+                "SELECT COUNT(*) FROM transactions WHERE account_guid = ?",
+                (account_guid,),
+            ).fetchone()[0]
+        return after - before
+
+    def transactions(self, account_guid, start=None, end=None):
+        """
+        :param start: Optional naive UTC datetime of the first creation time included.
+        :param end: Optional naive UTC datetime of the first creation time excluded.
+        :return: list of decoded GetTransactions items, oldest first
+        """
+        statement = "SELECT body FROM transactions WHERE account_guid = ?"
+        parameters = [account_guid]
+        if start is not None:
+            statement += " AND created >= ?"
+            parameters.append(_microseconds(start))
+        if end is not None:
+            statement += " AND created < ?"
+            parameters.append(_microseconds(end))
+        with self._lock:
+            rows = self._connection.execute(
+                statement + " ORDER BY created", parameters
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
@@ -0,0 +1,173 @@
+"""
+HTTP transport shared by PublicMethods and PrivateMethods.
+
+A single Transport owns a pooled, keep-alive requests.Session so that consecutive API calls reuse the same
+TCP/TLS connection to api.independentreserve.com instead of performing a new handshake on every call.
+"""
+
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from . import instrumentation
+from .deadline import check_deadline, effective_timeout
+from .exceptions import error_from_exception, error_from_response
+from .retry import RetryPolicy
+
+
+def retry_after(headers, default=1.0):
+    """
+    Seconds to back off for, from the Retry-After header of a HTTP 429 response.
+
+    :param headers: Response headers.
+    :param default: Seconds used when the header is missing or not a number of seconds.
+    :return: float
+    """
+    try:
+        return float(headers.get("Retry-After", default))
+    except (TypeError, ValueError):
+        return default
+
+
+class Transport(object):
+    """
+    Pooled keep-alive HTTP transport.
+
+    :param pool_connections: Number of per-host connection pools to cache.
+    :param pool_maxsize: Maximum number of connections kept alive per host. Should be at least the number of
+                         threads issuing requests concurrently.
+    :param pool_block: Block when the pool for a host is exhausted instead of opening throwaway connections.
+    :param connect_timeout: Default seconds to wait for a connection to be established.
+    :param read_timeout: Default seconds to wait for the server to send a response. Both can be overridden per call
+                         with `request_timeout` and are cut to the time left inside a `deadline` block.
+    :param session: Optional pre-configured requests.Session to use instead of creating one.
+    :param rate_limiter: Optional RateLimiter every request must obtain a token from before it is sent.
+    :param retry_policy: RetryPolicy applied to Public (GET) requests here and to Private requests by the client
+                         methods, which re-sign each attempt. True for the default RetryPolicy(), None to disable.
+    """
+
+    def __init__(
+        self,
+        pool_connections=4,
+        pool_maxsize=16,
+        pool_block=False,
+        connect_timeout=5.0,
+        read_timeout=30.0,
+        session=None,
+        rate_limiter=None,
+        retry_policy=True,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.rate_limiter = rate_limiter
+        self.retry_policy = RetryPolicy() if retry_policy is True else (retry_policy or None)
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request and returns the successful response.
+
+        Unsuccessful responses and connection failures raise an IndependentReserveError subclass. GET requests are
+        retried according to retry_policy; POST requests are signed per attempt and retried by the caller.
+        """
+        if method == "GET" and self.retry_policy is not None:
+            return self.retry_policy.call(
+                lambda: self._send(method, url, **kwargs), idempotent=True
+            )
+        return self._send(method, url, **kwargs)
+
+    def _send(self, method, url, **kwargs):
+        hooks = instrumentation._active
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire(url)
+            if hooks is not None and waited:
+                hooks.rate_limit_wait(instrumentation.endpoint_of(url), waited)
+        kwargs["timeout"] = effective_timeout(self.connect_timeout, self.read_timeout)
+        started = time.perf_counter() if hooks is not None else None
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except RequestException as error:
+            error = error_from_exception(error)
+            if hooks is not None:
+                self._record(hooks, method, url, started, None, kwargs, error)
+            check_deadline(sent=error.sent)
+            raise error
+        if response.status_code >= 400:
+            seconds = retry_after(response.headers)
+            if response.status_code == 429 and self.rate_limiter is not None:
+                self.rate_limiter.penalize(url, seconds)
+            error = error_from_response(response.status_code, response.text, seconds)
+            if hooks is not None:
+                self._record(hooks, method, url, started, response, kwargs, error)
+            raise error
+        if hooks is not None:
+            self._record(hooks, method, url, started, response, kwargs, None)
+        return response
+
+    @staticmethod
+    def _record(hooks, method, url, started, response, kwargs, error):
+        elapsed = time.perf_counter() - started
+        data = kwargs.get("data")
+        bytes_out = len(data) if data else 0
+        if response is None:
+            hooks.request(
+                instrumentation.endpoint_of(url),
+                method,
+                None,
+                elapsed,
+                {},
+                bytes_out,
+                0,
+                error,
+            )
+            return
+        # requests times from sending until the headers were parsed; the rest of elapsed is reading the body
+        server = min(response.elapsed.total_seconds(), elapsed)
+        hooks.request(
+            instrumentation.endpoint_of(url),
+            method,
+            response.status_code,
+            elapsed,
+            {"server": server, "transfer": elapsed - server},
+            bytes_out,
+            len(response.content),
+            error,
+        )
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, data=None, headers=None, **kwargs):
+        return self.request("POST", url, data=data, headers=headers, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+"""
+Transport used by clients that were not given one explicitly.
+Shared so that every client in the process draws from the same connection pool.
+"""
+default_transport = Transport()
@@ -1,20 +1,227 @@
 import websockets
 import asyncio
-import sys
-
-
-async def wss_subscribe(queue: asyncio.Queue, channel_name: list = ["ticker-xbt-aud"]):
-    try:
-        if len(channel_name) > 1:
-            channel = ",".join(channel_name)
-        else:
-            channel = channel_name[0]
-        WSS_URL = f"wss://websockets.independentreserve.com?subscribe={channel}"
-        async with websockets.connect(WSS_URL) as websocket:
-            while True:
-                data = await websocket.recv()
-                data = data.encode("utf-8")
-                await queue.put(data)
-    except Exception as error:
-        print(error)
-        sys.exit(1)
+import json
+import logging
+import random
+
+from . import instrumentation
+from .events import loads, parse_event
+from .feed import BLOCK, CONFLATE, OVERFLOW_POLICIES, ConflatingQueue, FeedMetrics, deliver
+
+WSS_URL = "wss://websockets.independentreserve.com"
+
+
+class WebsocketSubscriber(object):
+    """
+    Long lived websocket subscriber that survives network failures.
+
+    Messages from the subscribed channels are put on the queue in one of three forms, chosen by `mode`:
+
+    "bytes": utf-8 encoded bytes, as delivered by earlier releases (default).
+    "text": the str received from the socket, passed through without re-encoding.
+    "event": typed Event objects (TradeEvent, OrderBookEvent, ...), parsed once with the fastest available JSON
+             parser so consumers never decode the message again.
+
+    When the connection drops, or stops answering pings, the subscriber reconnects with jittered exponential backoff
+    and restores its current channel list. Channels can be added and removed at runtime without reconnecting.
+
+    When the consumer falls behind, `overflow` decides what happens to new messages (see feed.py): "block" waits for
+    space, "drop-oldest" and "drop-newest" discard messages, and "conflate" keeps only the latest pending ticker per
+    channel on a ConflatingQueue. Delivery counters and the deepest queue depth seen are kept in `metrics`.
+
+    Independent Reserve numbers the messages of each channel with an increasing Nonce; a skipped nonce is counted
+    in `gaps` so consumers can tell when they need to resynchronise.
+
+    :param queue: asyncio.Queue messages are delivered to.
+    :param channels: Initial channel names, e.g. ["ticker-xbt-aud", "orderbook-xbt"].
+    :param url: Websocket endpoint, can be overridden for testing purposes.
+    :param ping_interval: Seconds between keepalive pings.
+    :param ping_timeout: Seconds to wait for a pong before treating the connection as stale.
+    :param backoff_initial: Upper bound in seconds of the first reconnect delay.
+    :param backoff_max: Upper bound in seconds of any reconnect delay.
+    :param backoff_factor: Multiplier applied to the delay bound after each failed attempt.
+    :param mode: "bytes", "text" or "event".
+    :param track_gaps: Count nonce gaps. Defaults to on in "event" mode, where it is free, and off in the raw modes,
+                       where it costs an extra JSON decode per message.
+    :param overflow: "block", "drop-oldest", "drop-newest" or "conflate".
+    """
+
+    MODES = ("bytes", "text", "event")
+
+    def __init__(
+        self,
+        queue: asyncio.Queue,
+        channels: list = ["ticker-xbt-aud"],
+        url: str = WSS_URL,
+        ping_interval: float = 20,
+        ping_timeout: float = 20,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 30,
+        backoff_factor: float = 2,
+        mode: str = "bytes",
+        track_gaps: bool = None,
+        overflow: str = BLOCK,
+    ):
+        if mode not in self.MODES:
+            raise ValueError("mode must be one of {0}".format(", ".join(self.MODES)))
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                "overflow must be one of {0}".format(", ".join(OVERFLOW_POLICIES))
+            )
+        if overflow == CONFLATE and not isinstance(queue, ConflatingQueue):
+            raise ValueError("the conflate overflow policy requires a ConflatingQueue")
+        self.queue = queue
+        self.channels = list(channels)
+        self.url = url
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.backoff_factor = backoff_factor
+        self.mode = mode
+        self.track_gaps = mode == "event" if track_gaps is None else track_gaps
+        self.overflow = overflow
+        self.metrics = FeedMetrics()
+
+        self.connections = 0
+        self.reconnects = 0
+        self.gaps = 0
+        self.messages = 0
+
+        self._websocket = None
+        self._nonces = {}
+        self._stopped = False
+
+    @property
+    def connected(self):
+        return self._websocket is not None and self._websocket.open
+
+    def _connect_url(self):
+        if not self.channels:
+            return self.url
+        return "{0}?subscribe={1}".format(self.url, ",".join(self.channels))
+
+    async def run(self):
+        """
+        Connects and delivers messages until stop() is called.
+        """
+        delay = self.backoff_initial
+        while not self._stopped:
+            try:
+                async with websockets.connect(
+                    self._connect_url(),
+                    ping_interval=self.ping_interval,
+                    ping_timeout=self.ping_timeout,
+                ) as websocket:
+                    self._websocket = websocket
+                    self._nonces = {}
+                    self.connections += 1
+                    delay = self.backoff_initial
+                    async for data in websocket:
+                        item = self._process(data)
+                        if item is None:
+                            continue
+                        await deliver(self.queue, item, self.overflow, self.metrics)
+                        hooks = instrumentation._active
+                        if hooks is not None:
+                            hooks.message(
+                                getattr(item, "channel", None),
+                                len(data),
+                                self.queue.qsize(),
+                            )
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logging.warning("Websocket connection lost: {0}".format(error))
+            finally:
+                self._websocket = None
+
+            if self._stopped:
+                break
+            self.reconnects += 1
+            await asyncio.sleep(random.uniform(0, delay))
+            delay = min(self.backoff_max, delay * self.backoff_factor)
+
+    def _process(self, data):
+        """
+        Converts a received message into the item put on the queue, according to mode.
+        """
+        self.messages += 1
+        if self.mode == "event":
+            try:
+                event = parse_event(data)
+            except ValueError as error:
+                logging.warning("Discarding undecodable websocket message: {0}".format(error))
+                return None
+            if self.track_gaps and event.nonce is not None:
+                self._check_nonce(event.channel, event.nonce)
+            return event
+
+        if self.track_gaps:
+            try:
+                message = loads(data)
+                self._check_nonce(message["Channel"], message["Nonce"])
+            except (ValueError, KeyError, TypeError):
+                pass
+        if self.mode == "bytes" and isinstance(data, str):
+            return data.encode("utf-8")
+        return data
+
+    def _check_nonce(self, channel, nonce):
+        last = self._nonces.get(channel)
+        if last is not None and nonce != last + 1:
+            self.gaps += 1
+        self._nonces[channel] = nonce
+
+    async def subscribe(self, channels: list):
+        """
+        Adds channels, subscribing on the live connection when there is one.
+
+        :param channels: Channel names to add.
+        """
+        channels = [c for c in channels if c not in self.channels]
+        self.channels.extend(channels)
+        if channels and self.connected:
+            await self._websocket.send(
+                json.dumps({"Event": "Subscribe", "Data": channels})
+            )
+
+    async def unsubscribe(self, channels: list):
+        """
+        Removes channels, unsubscribing on the live connection when there is one.
+
+        :param channels: Channel names to remove.
+        """
+        channels = [c for c in channels if c in self.channels]
+        for channel in channels:
+            self.channels.remove(channel)
+            self._nonces.pop(channel, None)
+        if channels and self.connected:
+            await self._websocket.send(
+                json.dumps({"Event": "Unsubscribe", "Data": channels})
+            )
+
+    async def stop(self):
+        """
+        Stops reconnecting and closes the current connection.
+        """
+        self._stopped = True
+        if self._websocket is not None:
+            await self._websocket.close()
+
+
+async def wss_subscribe(
+    queue: asyncio.Queue,
+    channel_name: list = ["ticker-xbt-aud"],
+    mode: str = "bytes",
+    overflow: str = BLOCK,
+):
+    """
+    Puts every message from the given channels on the queue, reconnecting automatically.
+
+    :param queue: asyncio.Queue messages are delivered to.
+    :param channel_name: Channel names to subscribe to.
+    :param mode: "bytes" for utf-8 encoded bytes, "text" for the received str, "event" for parsed Event objects.
+    :param overflow: What to do when the queue is full: "block", "drop-oldest", "drop-newest" or "conflate".
+    """
+    await WebsocketSubscriber(queue, channel_name, mode=mode, overflow=overflow).run()
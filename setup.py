@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 
 setup(
     name="pyindependentreserve",
-    version="0.4.1",
+    version="0.5.0",
     description="Python client for Interacting with Independent Reserve API - The Bitcoin and Digital Currency Market",
     long_description=open("README.md", "r").read(),
     long_description_content_type="text/markdown",
@@ -11,14 +11,20 @@ setup(
     classifiers=[
         "Development Status :: 3 - Alpha",
         "License :: OSI Approved :: MIT License",
-        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.7",
     ],
     keywords="Bitcoin BlockChain Crypto-currency",
     author="Melchi Salins",
     author_email="melchisalins@gmail.com",
     license="MIT",
     packages=find_packages(),
-    install_requires=["requests>=2.22.0", "websockets==9.1"],
+    # deadlines are carried in context variables, which asyncio tasks copy since Python 3.7
+    python_requires=">=3.7",
+    install_requires=[
+        "requests>=2.22.0",
+        "websockets>=9.1,<14",
+    ],
+    extras_require={"async": ["aiohttp>=3.7"], "numpy": ["numpy"]},
     include_package_data=True,
     zip_safe=True,
 )
@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+import independentreserve as ir
+from simulator import Simulator
+
+
+@pytest.fixture
+def simulator(request):
+    """
+    Simulator of the exchange, requiring strictly increasing nonces. Parametrize indirectly with a dict of Simulator
+    keyword arguments to change its options.
+    """
+    options = dict(seed=0, history=20)
+    options.update(getattr(request, "param", {}))
+    with Simulator(**options) as simulator:
+        yield simulator
+
+
+@pytest.fixture
+def public(simulator):
+    """
+    PublicMethods pointed at the simulator. PublicMethods settings apply to the whole process, so they are restored
+    afterwards.
+    """
+    settings = dict(
+        (name, getattr(ir.PublicMethods, name))
+        for name in ("api_url", "transport", "cache", "models")
+    )
+    ir.PublicMethods(api_url=simulator.url)
+    yield ir.PublicMethods
+    for name, value in settings.items():
+        setattr(ir.PublicMethods, name, value)
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+import independentreserve as ir
+
+LATENCY = 0.2
+CALLS = 20
+
+
+@pytest.mark.parametrize("simulator", [{"latency": LATENCY}], indirect=True)
+def test_public_calls_complete_in_about_one_round_trip(simulator):
+    async def run():
+        async with ir.AsyncPublicMethods(api_url=simulator.url) as api:
+            started = time.perf_counter()
+            summaries = await asyncio.gather(
+                *[api.get_market_summary() for _ in range(CALLS)]
+            )
+            return time.perf_counter() - started, summaries
+
+    elapsed, summaries = asyncio.run(run())
+
+    assert [summary["PrimaryCurrencyCode"] for summary in summaries] == ["Xbt"] * CALLS
+    # one after another they would take CALLS * LATENCY
+    assert elapsed < 2 * LATENCY
+
+
+# the nonce window accepts requests overtaken by ones signed after them, which would otherwise be resent, so that only
+# the concurrency of the transport is timed; test_batch covers strictly increasing nonces
+@pytest.mark.parametrize(
+    "simulator", [{"latency": LATENCY, "nonce_window": CALLS}], indirect=True
+)
+def test_private_calls_complete_in_about_one_round_trip(simulator):
+    async def run():
+        async with ir.AsyncPrivateMethods(
+            simulator.api_key, simulator.api_secret, simulator.url
+        ) as api:
+            started = time.perf_counter()
+            details = await asyncio.gather(
+                *[api.get_order_details(guid) for guid in guids]
+            )
+            return time.perf_counter() - started, details
+
+    guids = simulator.exchange.order_guids[:CALLS]
+    elapsed, details = asyncio.run(run())
+
+    assert [order["OrderGuid"] for order in details] == guids
+    assert elapsed < 2 * LATENCY
+
+
+def test_methods_mirror_the_blocking_clients():
+    for blocking, asynchronous in (
+        (ir.PublicMethods, ir.AsyncPublicMethods),
+        (ir.PrivateMethods, ir.AsyncPrivateMethods),
+    ):
+        names = set(
+            name
+            for name in dir(blocking)
+            if not name.startswith("_") and callable(getattr(blocking, name))
+        )
+        assert names <= set(dir(asynchronous))
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+import independentreserve as ir
+from independentreserve.exceptions import error_from_response
+
+ORDERS = 20
+
+
+def _orders():
+    return [
+        {"price": 100 + i, "volume": 0.01, "order_type": "LimitBid"}
+        for i in range(ORDERS)
+    ]
+
+
+def test_batches_succeed_with_strictly_increasing_nonces(simulator):
+    api = ir.PrivateMethods(simulator.api_key, simulator.api_secret, simulator.url)
+
+    placed = api.place_orders(_orders())
+    assert [result.error for result in placed] == [None] * ORDERS
+    guids = [result.result["OrderGuid"] for result in placed]
+    assert len(set(guids)) == ORDERS
+
+    cancelled = api.cancel_orders(guids)
+    assert [result.error for result in cancelled] == [None] * ORDERS
+    assert api.get_open_orders()["TotalItems"] == 0
+
+
+def test_async_batches_succeed_with_strictly_increasing_nonces(simulator):
+    pytest.importorskip("aiohttp")
+
+    async def run():
+        async with ir.AsyncPrivateMethods(
+            simulator.api_key, simulator.api_secret, simulator.url
+        ) as api:
+            placed = await api.place_orders(_orders())
+            guids = [result.result["OrderGuid"] for result in placed if result.ok]
+            cancelled = await api.cancel_orders(guids)
+            return placed, cancelled, await api.get_open_orders()
+
+    placed, cancelled, open_orders = asyncio.run(run())
+
+    assert [result.error for result in placed] == [None] * ORDERS
+    assert [result.error for result in cancelled] == [None] * ORDERS
+    assert open_orders["TotalItems"] == 0
+
+
+def test_nonce_rejections_are_retried_outside_the_budget():
+    policy = ir.RetryPolicy(budget_max=0)
+    attempts = []
+
+    def attempt():
+        attempts.append(None)
+        if len(attempts) < 5:
+            raise ir.NonceRejectedError("HTTP 400: Invalid nonce", 400)
+        return "placed"
+
+    assert policy.call(attempt, "place_limit_order") == "placed"
+    assert len(attempts) == 5
+
+
+def test_nonce_rejections_are_classified():
+    error = error_from_response(400, '{"Message": "Invalid nonce"}')
+    assert isinstance(error, ir.NonceRejectedError)
+    assert isinstance(error, ir.AuthenticationError)
+    assert not isinstance(
+        error_from_response(400, '{"Message": "Invalid signature"}'),
+        ir.NonceRejectedError,
+    )
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import independentreserve as ir
+
+
+def test_a_new_response_cache_is_used(public):
+    cache = ir.ResponseCache()
+    ir.PublicMethods(public.api_url, cache=cache)
+
+    public.get_market_summary()
+    public.get_market_summary()
+
+    assert public.cache is cache
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_cache_false_disables_caching(public):
+    ir.PublicMethods(public.api_url, cache=True)
+    ir.PublicMethods(public.api_url, cache=False)
+    assert public.cache is None
+
+
+def test_clients_of_different_hosts_do_not_share_responses(public):
+    cache = ir.ResponseCache()
+    ir.PublicMethods(public.api_url, cache=cache)
+    public.get_market_summary()
+
+    # the same simulator under another host name
+    ir.PublicMethods(public.api_url.replace("127.0.0.1", "localhost"), cache=cache)
+    public.get_market_summary()
+
+    assert (cache.misses, cache.hits) == (2, 0)
+
+
+def _counting(value="response"):
+    calls = []
+
+    def call():
+        calls.append(None)
+        return value
+
+    return call, calls
+
+
+def test_entries_expire_after_their_ttl():
+    cache = ir.ResponseCache(ttls={"get_market_summary": 0.05})
+    call, calls = _counting()
+
+    cache.get_or_call("get_market_summary", ("xbt",), call)
+    cache.get_or_call("get_market_summary", ("xbt",), call)
+    time.sleep(0.1)
+    cache.get_or_call("get_market_summary", ("xbt",), call)
+
+    assert len(calls) == 2
+    assert (cache.misses, cache.hits) == (2, 1)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ir.ResponseCache(maxsize=2)
+    call, calls = _counting()
+
+    for key in ("xbt", "eth", "xbt", "ltc"):
+        cache.get_or_call("get_order_book", (key,), call)
+    assert len(cache) == 2
+
+    # eth was the least recently used when ltc was stored
+    cache.get_or_call("get_order_book", ("xbt",), call)
+    cache.get_or_call("get_order_book", ("eth",), call)
+    assert len(calls) == 4
+
+
+def test_concurrent_threads_share_one_call():
+    cache = ir.ResponseCache()
+    calls = []
+
+    def call():
+        calls.append(None)
+        time.sleep(0.1)
+        return "response"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(
+            pool.map(
+                lambda _: cache.get_or_call("get_order_book", ("xbt",), call),
+                range(8),
+            )
+        )
+
+    assert results == ["response"] * 8
+    assert len(calls) == 1
+
+
+def test_concurrent_tasks_share_one_call():
+    cache = ir.ResponseCache()
+    calls = []
+
+    async def call():
+        calls.append(None)
+        await asyncio.sleep(0.1)
+        return "response"
+
+    async def run():
+        return await asyncio.gather(
+            *[
+                cache.get_or_call_async("get_order_book", ("xbt",), call)
+                for _ in range(8)
+            ]
+        )
+
+    assert asyncio.run(run()) == ["response"] * 8
+    assert len(calls) == 1
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+import independentreserve as ir
+
+
+def test_deadline_applies_only_to_the_task_that_entered_it():
+    async def bounded(entered):
+        with ir.deadline(0.05):
+            entered.set()
+            await asyncio.sleep(0.1)
+            return ir.remaining()
+
+    async def unbounded(entered):
+        await entered.wait()
+        return ir.remaining()
+
+    async def run():
+        entered = asyncio.Event()
+        return await asyncio.gather(bounded(entered), unbounded(entered))
+
+    inside, outside = asyncio.run(run())
+
+    assert inside < 0
+    assert outside is None
+
+
+def test_deadline_follows_the_caller_into_tasks_it_creates():
+    async def child():
+        return ir.remaining()
+
+    async def run():
+        with ir.deadline(5):
+            task = asyncio.ensure_future(child())
+        # the task was created inside the block, so it keeps the deadline after the block exits
+        return await task
+
+    assert 0 < asyncio.run(run()) <= 5
+
+
+@pytest.mark.parametrize("simulator", [{"latency": 0.5}], indirect=True)
+def test_request_timeout_overrides_the_read_timeout(simulator):
+    api = ir.PrivateMethods(
+        simulator.api_key,
+        simulator.api_secret,
+        simulator.url,
+        transport=ir.Transport(retry_policy=None),
+    )
+
+    with pytest.raises(ir.TransportError):
+        with ir.request_timeout(read=0.1):
+            api.get_open_orders()
+    assert api.get_open_orders()["TotalItems"] == 0
+
+
+@pytest.mark.parametrize("simulator", [{"latency": 0.5}], indirect=True)
+def test_async_request_timeout_overrides_the_read_timeout(simulator):
+    pytest.importorskip("aiohttp")
+
+    async def run():
+        async with ir.AsyncPrivateMethods(
+            simulator.api_key,
+            simulator.api_secret,
+            simulator.url,
+            ir.AsyncTransport(retry_policy=None),
+        ) as api:
+            with pytest.raises(ir.TransportError):
+                with ir.request_timeout(read=0.1):
+                    await api.get_open_orders()
+            return await api.get_open_orders()
+
+    assert asyncio.run(run())["TotalItems"] == 0
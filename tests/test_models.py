@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+import independentreserve as ir
+
+
+def test_order_book_snapshots_raw_json_when_models_are_enabled(public):
+    ir.PublicMethods(public.api_url, models=True)
+    assert isinstance(public.get_all_orders(), ir.OrderBookSnapshot)
+
+    book = ir.OrderBook("Xbt", "Aud")
+    assert book.resnapshot()
+    assert book.best_bid() is not None and book.best_offer() is not None
+
+
+def test_cached_responses_are_shared_between_representations(public):
+    ir.PublicMethods(public.api_url, cache=True, models=False)
+    summary = public.get_market_summary()
+    ir.PublicMethods(public.api_url, models=True)
+
+    assert isinstance(public.get_market_summary(), ir.MarketSummary)
+    assert public.get_market_summary.raw() is summary
+    assert public.cache.hits == 2
+
+
+def test_async_clients_sharing_a_cache_get_their_own_representation(simulator):
+    pytest.importorskip("aiohttp")
+
+    cache = ir.ResponseCache()
+
+    async def run():
+        async with ir.AsyncPublicMethods(simulator.url, cache=cache) as plain:
+            async with ir.AsyncPublicMethods(
+                simulator.url, cache=cache, models=True
+            ) as typed:
+                return await plain.get_order_book(), await typed.get_order_book()
+
+    plain, typed = asyncio.run(run())
+    assert isinstance(plain, dict)
+    assert isinstance(typed, ir.OrderBookSnapshot)
+    assert (cache.misses, cache.hits) == (1, 1)
@@ -0,0 +1,39 @@
+import time
+
+import independentreserve as ir
+
+
+def test_nonces_strictly_increase_at_the_resolution():
+    generator = ir.NonceGenerator(resolution=1000)
+    before = int(time.time() * 1000)
+
+    nonces = [generator() for _ in range(1000)]
+
+    assert nonces == sorted(set(nonces))
+    assert before <= nonces[0] <= int(time.time() * 1000)
+
+
+def test_persisted_mark_is_written_once_per_reserved_block(tmp_path, monkeypatch):
+    path = str(tmp_path / "nonce")
+    generator = ir.NonceGenerator(path=path, reserve=10**9)
+    writes = []
+    persist = generator._persist
+    monkeypatch.setattr(
+        generator, "_persist", lambda mark: writes.append(persist(mark))
+    )
+
+    nonces = [generator() for _ in range(1000)]
+
+    assert len(writes) == 1
+    with open(path) as f:
+        assert int(f.read()) == nonces[0] + 10**9
+
+
+def test_nonces_resume_above_the_mark_after_a_restart(tmp_path):
+    path = str(tmp_path / "nonce")
+    generator = ir.NonceGenerator(path=path, reserve=100)
+    last = [generator() for _ in range(250)][-1]
+
+    # a stepped back clock must not yield a nonce already used
+    restarted = ir.NonceGenerator(resolution=1, path=path)
+    assert restarted() > last
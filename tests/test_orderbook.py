@@ -0,0 +1,164 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+import independentreserve as ir
+
+SNAPSHOT = {
+    "BuyOrders": [
+        {"Guid": "b1", "Price": 100.0, "Volume": 1.0},
+        {"Guid": "b2", "Price": 99.0, "Volume": 2.0},
+    ],
+    "SellOrders": [{"Guid": "s1", "Price": 101.0, "Volume": 1.5}],
+}
+
+
+def _message(nonce, event="NewOrder", guid="b3", order_type="LimitBid", price=100.5):
+    return {
+        "Channel": "orderbook-xbt",
+        "Nonce": nonce,
+        "Event": event,
+        "Data": {
+            "OrderGuid": guid,
+            "OrderType": order_type,
+            "Price": {"aud": price},
+            "Volume": 0.5,
+        },
+    }
+
+
+def test_apply_seeds_updates_and_resnapshots_after_a_gap():
+    book = ir.OrderBook("Xbt", "Aud", snapshot=lambda primary, secondary: SNAPSHOT)
+
+    assert book.apply(_message(1))
+    assert book.best_bid() == (100.5, 0.5)
+    assert book.apply(_message(2, "OrderCanceled", "b3"))
+    assert book.best_bid() == (100.0, 1.0)
+    assert book.apply(_message(5))
+    assert (book.gaps, book.snapshots) == (1, 2)
+    assert len(book) == 3
+
+
+def _book():
+    book = ir.OrderBook("Xbt", "Aud", snapshot=lambda primary, secondary: SNAPSHOT)
+    book.resnapshot()
+    return book
+
+
+def test_level_volumes_are_summed_exactly():
+    book = _book()
+    nonces = iter(range(1, 10000))
+
+    def change(event, guid, volume):
+        message = _message(next(nonces), event, guid, price=102.0)
+        message["Data"]["Volume"] = volume
+        assert book.apply(message)
+
+    change("NewOrder", "b3", 0.1)
+    change("NewOrder", "b4", 0.2)
+    for _ in range(1000):
+        change("OrderChanged", "b4", 0.7)
+        change("OrderChanged", "b4", 0.2)
+
+    # 0.1 + 0.2 is 0.30000000000000004 in floats
+    assert book.best_bid() == (102.0, 0.3)
+
+
+def test_order_changed_without_a_price_updates_the_resting_order():
+    book = _book()
+    message = _message(1, "OrderChanged", "b2")
+    del message["Data"]["Price"]
+    del message["Data"]["OrderType"]
+
+    assert book.apply(message)
+    assert book.depth(2)["Bids"] == [(100.0, 1.0), (99.0, 0.5)]
+
+
+def test_levels_stay_ordered_through_random_changes():
+    book = ir.OrderBook(
+        "Xbt",
+        "Aud",
+        snapshot=lambda primary, secondary: {"BuyOrders": [], "SellOrders": []},
+    )
+    book.resnapshot()
+    rng = random.Random(0)
+    resting = {}
+    for nonce in range(1, 5001):
+        guid = "o{0}".format(rng.randrange(300))
+        if guid in resting and rng.random() < 0.5:
+            book.apply(_message(nonce, "OrderCanceled", guid))
+            del resting[guid]
+        else:
+            side = rng.choice(("LimitBid", "LimitOffer"))
+            price = float(rng.randrange(1, 200)) + (0 if side == "LimitBid" else 200)
+            book.apply(_message(nonce, "NewOrder", guid, side, price))
+            resting[guid] = (side, price)
+
+        bids = sorted({p for s, p in resting.values() if s == "LimitBid"}, reverse=True)
+        offers = sorted({p for s, p in resting.values() if s == "LimitOffer"})
+        depth = book.depth(5)
+        assert [p for p, _ in depth["Bids"]] == bids[:5]
+        assert [p for p, _ in depth["Offers"]] == offers[:5]
+        assert (book.best_bid() or (None,))[0] == (bids[0] if bids else None)
+        assert (book.best_offer() or (None,))[0] == (offers[0] if offers else None)
+
+    # removed levels do not accumulate in the heaps
+    assert all(len(heap) <= 2 * 200 + 64 for heap in book._heaps.values())
+
+
+def test_consume_runs_a_blocking_snapshot_off_the_event_loop():
+    def snapshot(primary, secondary):
+        time.sleep(0.3)
+        return SNAPSHOT
+
+    book = ir.OrderBook("Xbt", "Aud", snapshot=snapshot)
+
+    async def run():
+        queue = asyncio.Queue()
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.ensure_future(ticker())
+        consumer = asyncio.ensure_future(book.consume(queue))
+        await queue.put(_message(1))
+        await queue.put(None)
+        await consumer
+        ticking.cancel()
+        return ticks
+
+    ticks = asyncio.run(run())
+
+    assert book.snapshots == 1 and book.best_bid() == (100.5, 0.5)
+    # the loop kept running while the snapshot was retrieved
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.15
+
+
+def test_apply_async_awaits_a_coroutine_snapshot():
+    async def snapshot(primary, secondary):
+        await asyncio.sleep(0)
+        return SNAPSHOT
+
+    book = ir.OrderBook("Xbt", "Aud", snapshot=snapshot)
+
+    assert asyncio.run(book.apply_async(_message(1)))
+    assert book.best_offer() == (101.0, 1.5)
+    with pytest.raises(TypeError):
+        book.resnapshot()
+
+
+def test_snapshot_from_the_async_client(simulator):
+    pytest.importorskip("aiohttp")
+
+    async def run():
+        async with ir.AsyncPublicMethods(simulator.url) as public:
+            book = ir.OrderBook("Xbt", "Aud", snapshot=public.get_all_orders)
+            return book, await book.resnapshot_async()
+
+    book, loaded = asyncio.run(run())
+    assert loaded and len(book) == 2 * simulator.exchange.depth
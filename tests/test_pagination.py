@@ -0,0 +1,111 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+
+import independentreserve as ir
+
+PAGE_SIZE = 10
+
+
+def _client(simulator):
+    return ir.PrivateMethods(simulator.api_key, simulator.api_secret, simulator.url)
+
+
+def _account_guid(api):
+    return next(
+        account["AccountGuid"]
+        for account in api.get_accounts()
+        if account["CurrencyCode"] == "Aud"
+    )
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_iterates_every_page_in_order(simulator, prefetch):
+    api = _client(simulator)
+    account_guid = _account_guid(api)
+    expected = api.get_transactions(
+        account_guid, transaction_types=None, page_size=ir.MAX_PAGE_SIZE
+    )
+    assert PAGE_SIZE < expected["TotalItems"] <= ir.MAX_PAGE_SIZE
+
+    transactions = list(
+        api.iter_transactions(
+            account_guid,
+            transaction_types=None,
+            page_size=PAGE_SIZE,
+            prefetch=prefetch,
+        )
+    )
+
+    assert transactions == expected["Data"]
+    assert simulator.exchange.rejected == 0
+
+
+def test_empty_endpoint_yields_nothing(simulator):
+    api = _client(simulator)
+    requests = simulator.exchange.requests
+
+    assert list(api.iter_open_orders()) == []
+    assert simulator.exchange.requests == requests + 1
+
+
+def test_early_exit_requests_at_most_the_next_page(simulator):
+    api = _client(simulator)
+    account_guid = _account_guid(api)
+    requests = simulator.exchange.requests
+
+    transactions = api.iter_transactions(
+        account_guid, transaction_types=None, page_size=PAGE_SIZE
+    )
+    first = list(itertools.islice(transactions, PAGE_SIZE + 1))
+    transactions.close()
+    # a prefetch still in flight is not followed by another
+    time.sleep(0.1)
+
+    assert len(first) == PAGE_SIZE + 1
+    assert simulator.exchange.requests - requests <= 3
+    assert simulator.exchange.rejected == 0
+
+
+def test_async_iterates_every_page_and_exits_early(simulator):
+    pytest.importorskip("aiohttp")
+
+    async def run():
+        async with ir.AsyncPrivateMethods(
+            simulator.api_key, simulator.api_secret, simulator.url
+        ) as api:
+            account_guid = next(
+                account["AccountGuid"]
+                for account in await api.get_accounts()
+                if account["CurrencyCode"] == "Aud"
+            )
+            expected = await api.get_transactions(
+                account_guid, transaction_types=None, page_size=ir.MAX_PAGE_SIZE
+            )
+            transactions = [
+                transaction
+                async for transaction in api.iter_transactions(
+                    account_guid, transaction_types=None, page_size=PAGE_SIZE
+                )
+            ]
+            open_orders = [order async for order in api.iter_open_orders()]
+
+            requests = simulator.exchange.requests
+            iterator = api.iter_transactions(
+                account_guid, transaction_types=None, page_size=PAGE_SIZE
+            )
+            async for _ in iterator:
+                break
+            await iterator.aclose()
+            await asyncio.sleep(0.1)
+            early = simulator.exchange.requests - requests
+            return expected, transactions, open_orders, early
+
+    expected, transactions, open_orders, early = asyncio.run(run())
+
+    assert transactions == expected["Data"]
+    assert open_orders == []
+    assert early <= 2
+    assert simulator.exchange.rejected == 0
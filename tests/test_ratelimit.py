@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import independentreserve as ir
+
+URL = "https://api.independentreserve.com/Private/GetOpenOrders"
+
+
+def _drained(timeout=None):
+    # one token every 10 seconds, already spent
+    limiter = ir.RateLimiter(private_rate=0.1, private_burst=1, timeout=timeout)
+    limiter.acquire(URL)
+    return limiter
+
+
+def test_wait_bounded_by_the_deadline_raises_deadline_exceeded():
+    limiter = _drained(timeout=5)
+
+    start = time.monotonic()
+    with pytest.raises(ir.DeadlineExceeded) as raised:
+        with ir.deadline(0.2):
+            limiter.acquire(URL)
+
+    assert raised.value.sent is False
+    assert time.monotonic() - start < 1
+    assert limiter.timeouts == 1
+
+
+def test_wait_bounded_by_the_timeout_raises_rate_limit_timeout():
+    limiter = _drained(timeout=0.1)
+
+    with pytest.raises(ir.RateLimitTimeout):
+        with ir.deadline(5):
+            limiter.acquire(URL)
+
+    with pytest.raises(ir.RateLimitTimeout):
+        limiter.acquire(URL)
+    assert limiter.timeouts == 2
+
+
+def test_async_wait_bounded_by_the_deadline_raises_deadline_exceeded():
+    limiter = _drained()
+
+    async def acquire():
+        with ir.deadline(0.2):
+            await limiter.acquire_async(URL)
+
+    with pytest.raises(ir.DeadlineExceeded) as raised:
+        asyncio.run(acquire())
+
+    assert raised.value.sent is False
+
+
+def test_burst_then_refill_rate():
+    limiter = ir.RateLimiter(private_rate=20, private_burst=5)
+
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire(URL)
+    burst = time.monotonic() - start
+    for _ in range(10):
+        limiter.acquire(URL)
+    refill = time.monotonic() - start - burst
+
+    assert burst < 0.05
+    # 10 tokens at 20 per second
+    assert 0.4 <= refill < 0.8
+
+
+def test_high_priority_lane_is_served_before_low():
+    limiter = ir.RateLimiter(private_rate=10, private_burst=1)
+    limiter.acquire(URL)
+    served = []
+
+    def acquire(path):
+        limiter.acquire("https://api.independentreserve.com" + path)
+        served.append(path)
+
+    low = threading.Thread(target=acquire, args=("/Private/GetTransactions",))
+    low.start()
+    while not limiter.buckets["Private"].waiters:
+        time.sleep(0.001)
+    high = threading.Thread(target=acquire, args=("/Private/CancelOrder",))
+    high.start()
+    low.join()
+    high.join()
+
+    assert served == ["/Private/CancelOrder", "/Private/GetTransactions"]
+
+
+def test_interrupted_wait_leaves_the_lane(monkeypatch):
+    limiter = _drained()
+
+    def interrupt(timeout=None):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(limiter._condition, "wait", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        limiter.acquire(URL)
+
+    assert limiter.buckets["Private"].waiters == []
+
+
+def test_cancelled_async_wait_leaves_the_lane():
+    limiter = _drained()
+
+    async def run():
+        task = asyncio.ensure_future(limiter.acquire_async(URL))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+
+    assert limiter.buckets["Private"].waiters == []
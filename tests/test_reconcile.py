@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+import independentreserve as ir
+
+ORDER = {"price": 100, "volume": 0.01, "order_type": "LimitBid"}
+
+
+class FailingTransport(ir.Transport):
+    """
+    Fails the next placement with a 502: after sending it when fail is "sent", without sending it when "unsent".
+    """
+
+    def __init__(self):
+        super(FailingTransport, self).__init__()
+        self.fail = None
+
+    def post(self, url, data=None, headers=None, **kwargs):
+        fail = self.fail if "PlaceLimitOrder" in url else None
+        if fail is None:
+            return super(FailingTransport, self).post(url, data, headers, **kwargs)
+        self.fail = None
+        if fail == "sent":
+            super(FailingTransport, self).post(url, data, headers, **kwargs)
+        raise ir.ServerError("HTTP 502: Bad Gateway", 502)
+
+
+def _client(simulator, transport=None):
+    return ir.PrivateMethods(
+        simulator.api_key, simulator.api_secret, simulator.url, transport=transport
+    )
+
+
+def _open_guids(api):
+    return [order["OrderGuid"] for order in api.get_open_orders()["Data"]]
+
+
+def test_placement_that_took_effect_is_reconciled(simulator):
+    transport = FailingTransport()
+    api = _client(simulator, transport)
+
+    transport.fail = "sent"
+    order = api.place_limit_order(**ORDER)
+
+    assert _open_guids(api) == [order["OrderGuid"]]
+    assert api.retry_policy.reconciled == 1
+
+
+def test_reconcile_does_not_claim_an_order_already_received(simulator):
+    transport = FailingTransport()
+    api = _client(simulator, transport)
+    sibling = api.place_limit_order(**ORDER)
+
+    transport.fail = "unsent"
+    order = api.place_limit_order(**ORDER)
+
+    assert order["OrderGuid"] != sibling["OrderGuid"]
+    assert sorted(_open_guids(api)) == sorted(
+        [sibling["OrderGuid"], order["OrderGuid"]]
+    )
+    assert api.retry_policy.reconciled == 0
+
+
+def test_reconcile_raises_the_original_error_when_ambiguous(simulator):
+    transport = FailingTransport()
+    api = _client(simulator, transport)
+    # placed by another client, so this one cannot tell it apart from its own
+    _client(simulator).place_limit_order(**ORDER)
+
+    transport.fail = "sent"
+    with pytest.raises(ir.ServerError):
+        api.place_limit_order(**ORDER)
+
+    assert len(_open_guids(api)) == 2
+    assert api.retry_policy.reconciled == 0
+
+
+def test_async_reconcile_does_not_claim_an_order_already_received(simulator):
+    pytest.importorskip("aiohttp")
+
+    class FailingAsyncTransport(ir.AsyncTransport):
+        fail = False
+
+        async def post(self, url, data=None, headers=None, **kwargs):
+            if self.fail and "PlaceLimitOrder" in url:
+                self.fail = False
+                raise ir.ServerError("HTTP 502: Bad Gateway", 502)
+            return await super(FailingAsyncTransport, self).post(
+                url, data, headers, **kwargs
+            )
+
+    async def run():
+        transport = FailingAsyncTransport()
+        async with ir.AsyncPrivateMethods(
+            simulator.api_key, simulator.api_secret, simulator.url, transport
+        ) as api:
+            sibling = await api.place_limit_order(**ORDER)
+            transport.fail = True
+            order = await api.place_limit_order(**ORDER)
+            return sibling, order, await api.get_open_orders()
+
+    sibling, order, open_orders = asyncio.run(run())
+
+    assert order["OrderGuid"] != sibling["OrderGuid"]
+    assert open_orders["TotalItems"] == 2
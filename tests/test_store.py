@@ -0,0 +1,99 @@
+from array import array
+
+import independentreserve as ir
+
+T = 1571028487000000
+
+
+def _tape(*trades):
+    return ir.TradeTape(
+        timestamp=array("q", [t for t, _, _ in trades]),
+        price=array("d", [p for _, p, _ in trades]),
+        amount=array("d", [a for _, _, a in trades]),
+    )
+
+
+def _rows(tape):
+    return list(zip(tape.timestamp, tape.price, tape.amount))
+
+
+def _trade_message(guid, timestamp="2019-10-14T04:48:07Z", price=100.0, volume=0.5):
+    return {
+        "Channel": "ticker-xbt-aud",
+        "Event": "Trade",
+        "Data": {
+            "Pair": "xbt-aud",
+            "TradeDate": timestamp,
+            "Price": price,
+            "Volume": volume,
+            "TradeGuid": guid,
+            "Side": "Buy",
+        },
+    }
+
+
+def test_candles_round_trip(public):
+    store = ir.MarketStore(":memory:")
+
+    assert store.sync_candles("Xbt", "Aud", max_hours=24) > 0
+    fetched = public.get_candles("Xbt", "Aud", 24)
+    stored = store.candles("xbt", "AUD")
+
+    assert list(stored.start) == list(fetched.start)
+    assert list(stored.close) == list(fetched.close)
+    assert store.last_candle_start("XBT", "aud") == fetched.start[-1]
+
+
+def test_trades_round_trip(public):
+    store = ir.MarketStore(":memory:")
+
+    assert store.sync_trades("Xbt", "Aud") == 50
+    assert store.sync_trades("Xbt", "Aud") == 0
+    assert sorted(_rows(store.trades("XBT", "aud"))) == sorted(
+        _rows(public.get_trade_tape("Xbt", "Aud", 50))
+    )
+
+
+def test_identical_fills_are_kept_and_overlapping_fetches_stored_once():
+    store = ir.MarketStore(":memory:")
+    fill = (T + 1, 100.0, 0.5)
+
+    # one order filled twice at the same price and time
+    assert store.add_trades("Xbt", "Aud", _tape((T, 99.0, 1.0), fill, fill)) == 3
+    # the next fetch overlaps the previous one, and includes a third identical fill
+    assert (
+        store.add_trades("Xbt", "Aud", _tape(fill, fill, fill, (T + 2, 101.0, 1.0)))
+        == 2
+    )
+
+    assert _rows(store.trades("Xbt", "Aud")) == [
+        (T, 99.0, 1.0),
+        fill,
+        fill,
+        fill,
+        (T + 2, 101.0, 1.0),
+    ]
+
+
+def test_websocket_trades_are_keyed_on_their_guid():
+    store = ir.MarketStore(":memory:")
+
+    assert store.apply(_trade_message("a"))
+    assert not store.apply(_trade_message("a"))
+    # an identical trade with another guid is another fill
+    assert store.apply(_trade_message("b"))
+    # a trade stored by REST first is taken over, not stored again
+    store.add_trades("Xbt", "Aud", _tape((T + 5000000, 100.0, 0.5)))
+    assert not store.apply(_trade_message("c", "2019-10-14T04:48:12Z"))
+
+    assert len(store.trades("Xbt", "Aud").timestamp) == 3
+
+
+def test_range_queries():
+    store = ir.MarketStore(":memory:")
+    store.add_trades("Xbt", "Aud", _tape(*[(T + i, 100.0 + i, 1.0) for i in range(10)]))
+
+    trades = store.trades("xbt", "aud", start=T + 2, end=T + 5)
+
+    assert list(trades.timestamp) == [T + 2, T + 3, T + 4]
+    assert len(store.trades("Eth", "Aud").timestamp) == 0
@@ -0,0 +1,25 @@
+import pytest
+
+import independentreserve as ir
+
+
+def _account_guid(api):
+    return next(
+        account["AccountGuid"]
+        for account in api.get_accounts()
+        if account["CurrencyCode"] == "Aud"
+    )
+
+
+@pytest.mark.parametrize("simulator", [{"history": 200}], indirect=True)
+def test_sync_with_strictly_increasing_nonces(simulator):
+    api = ir.PrivateMethods(simulator.api_key, simulator.api_secret, simulator.url)
+    account_guid = _account_guid(api)
+    expected = len(simulator.exchange.transactions[account_guid])
+    assert expected > 2 * ir.MAX_PAGE_SIZE
+
+    with ir.TransactionSync(api, ":memory:") as sync:
+        assert sync.sync(account_guid) == expected
+        assert sync.sync(account_guid) == 0
+        assert len(sync.transactions(account_guid)) == expected
+    assert simulator.exchange.rejected == 0
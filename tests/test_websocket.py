@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+import pytest
+import websockets
+
+import independentreserve as ir
+
+TICKER = "ticker-xbt-aud"
+ORDER_BOOK = "orderbook-xbt"
+
+# seconds a test may wait for the messages it expects before failing
+TIMEOUT = 10.0
+
+
+def _subscriber(url, channels):
+    return ir.WebsocketSubscriber(
+        asyncio.Queue(), channels, url=url, mode="event", backoff_initial=0.01
+    )
+
+
+async def _running(subscriber, receive):
+    """
+    Runs the subscriber while receive(subscriber) reads its queue.
+    """
+    task = asyncio.ensure_future(subscriber.run())
+    try:
+        return await asyncio.wait_for(receive(subscriber), TIMEOUT)
+    finally:
+        await subscriber.stop()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+@pytest.mark.parametrize("simulator", [{"limit": 5}], indirect=True)
+def test_reconnects_and_resubscribes_after_a_drop(simulator):
+    async def receive(subscriber):
+        return [await subscriber.queue.get() for _ in range(15)]
+
+    subscriber = _subscriber(simulator.ws_url, [TICKER, ORDER_BOOK])
+    events = asyncio.run(_running(subscriber, receive))
+
+    # the simulator closes every connection after 5 messages; each one restarts the nonces of its channels
+    assert subscriber.connections >= 3
+    assert subscriber.reconnects >= 2
+    assert simulator.connections >= 3
+    assert [(event.channel, event.nonce) for event in events[:5]] * 3 == [
+        (event.channel, event.nonce) for event in events
+    ]
+    assert {event.channel for event in events} == {TICKER, ORDER_BOOK}
+    assert subscriber.gaps == 0
+
+
+@pytest.mark.parametrize("simulator", [{"rate": 200}], indirect=True)
+def test_subscribes_and_unsubscribes_at_runtime(simulator):
+    async def receive(subscriber):
+        queue = subscriber.queue
+        assert (await queue.get()).channel == TICKER
+
+        await subscriber.subscribe([ORDER_BOOK])
+        while (await queue.get()).channel != ORDER_BOOK:
+            pass
+
+        await subscriber.unsubscribe([TICKER])
+        # messages sent before the server read the unsubscription may still arrive
+        await asyncio.sleep(0.2)
+        while not queue.empty():
+            queue.get_nowait()
+        return [await queue.get() for _ in range(10)]
+
+    subscriber = _subscriber(simulator.ws_url, [TICKER])
+    events = asyncio.run(_running(subscriber, receive))
+
+    assert {event.channel for event in events} == {ORDER_BOOK}
+    assert subscriber.channels == [ORDER_BOOK]
+    assert (subscriber.connections, subscriber.reconnects) == (1, 0)
+    assert subscriber.gaps == 0
+
+
+@pytest.mark.parametrize("simulator", [{"rate": 200, "limit": 10}], indirect=True)
+def test_channels_changed_at_runtime_are_restored_after_a_drop(simulator):
+    async def receive(subscriber):
+        queue = subscriber.queue
+        assert (await queue.get()).channel == TICKER
+        await subscriber.subscribe([ORDER_BOOK])
+        await subscriber.unsubscribe([TICKER])
+
+        # a new connection restarts each of its channels at nonce 1
+        started = {TICKER: 1, ORDER_BOOK: 0}
+        while started[ORDER_BOOK] < 2:
+            event = await queue.get()
+            if event.nonce == 1:
+                started[event.channel] += 1
+        return started
+
+    subscriber = _subscriber(simulator.ws_url, [TICKER])
+    started = asyncio.run(_running(subscriber, receive))
+
+    assert started[TICKER] == 1
+    assert subscriber.reconnects >= 1
+
+
+def test_counts_nonce_gaps():
+    async def serve(websocket, path):
+        for nonce in (1, 2, 4, 5, 6, 9):
+            await websocket.send(
+                json.dumps(
+                    {
+                        "Channel": TICKER,
+                        "Nonce": nonce,
+                        "Event": "Heartbeat",
+                        "Time": 0,
+                        "Data": {},
+                    }
+                )
+            )
+
+    async def run():
+        server = await websockets.serve(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        subscriber = _subscriber("ws://127.0.0.1:{0}".format(port), [TICKER])
+
+        async def receive(subscriber):
+            nonces = [(await subscriber.queue.get()).nonce for _ in range(12)]
+            # before the subscriber reconnects a third time
+            return nonces, subscriber.connections, subscriber.gaps
+
+        try:
+            return await _running(subscriber, receive)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    nonces, connections, gaps = asyncio.run(run())
+
+    # two gaps per connection; restarting at nonce 1 on the next connection is not a gap
+    assert nonces == [1, 2, 4, 5, 6, 9] * 2
+    assert (connections, gaps) == (2, 4)